@@ -5,6 +5,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from network_automation.fieldsets import SparseFieldsetMixin
 from .models import User, UserPreferences
 from .serializers import UserRegistrationSerializer, UserSerializer, UserPreferencesSerializer
 
@@ -50,7 +51,7 @@ def login_view(request):
 def profile_view(request):
     return Response(UserSerializer(request.user).data)
 
-class UserPreferencesView(generics.RetrieveUpdateAPIView):
+class UserPreferencesView(SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserPreferencesSerializer
     permission_classes = [IsAuthenticated]
     
@@ -2,10 +2,11 @@
 from rest_framework import generics
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from network_automation.fieldsets import SparseFieldsetMixin
 from .models import ActivityLog
 from .serializers import ActivityLogSerializer
 
-class ActivityLogListView(generics.ListAPIView):
+class ActivityLogListView(SparseFieldsetMixin, generics.ListAPIView):
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -14,6 +15,6 @@ class ActivityLogListView(generics.ListAPIView):
     ordering_fields = ['created_at']
     ordering = ['-created_at']
 
-class ActivityLogDetailView(generics.RetrieveAPIView):
+class ActivityLogDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
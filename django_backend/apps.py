@@ -28,3 +28,11 @@ class ActivityLogsConfig(AppConfig):
 class MergeRequestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'merge_requests'
+
+class DeploymentsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'deployments'
+
+class ComplianceConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'compliance'
@@ -0,0 +1,131 @@
+
+import json
+import re
+import signal
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def compile_pattern(pattern):
+    return re.compile(pattern, re.MULTILINE)
+
+
+class RuleTimeout(Exception):
+    pass
+
+
+def raise_timeout(signum, frame):
+    raise RuleTimeout
+
+
+@contextmanager
+def interrupt_after(seconds):
+    """Raise RuleTimeout in the block after ``seconds``; needs the SIGALRM handler, so main thread only."""
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def select(config, path):
+    """Values at a dotted ``path``; ``*`` fans out over every key or item, integers index lists."""
+    nodes = [config]
+    for part in path.split('.') if path else ():
+        selected = []
+        for node in nodes:
+            if isinstance(node, dict):
+                if part == '*':
+                    selected.extend(node.values())
+                elif part in node:
+                    selected.append(node[part])
+            elif isinstance(node, list):
+                if part == '*':
+                    selected.extend(node)
+                elif part.lstrip('-').isdigit() and -len(node) <= int(part) < len(node):
+                    selected.append(node[int(part)])
+        nodes = selected
+    return nodes
+
+
+def as_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return '\n'.join(value)
+    return json.dumps(value, sort_keys=True)
+
+
+def compare(operator, value, expected):
+    if operator == 'equals':
+        return value == expected
+    if operator == 'not_equals':
+        return value != expected
+    if isinstance(value, str):
+        contained = isinstance(expected, str) and expected in value
+    else:
+        contained = isinstance(value, (list, dict)) and expected in value
+    return contained if operator == 'contains' else not contained
+
+
+def check(config, rule):
+    """Violation message for ``rule`` against ``config``, or None when it passes."""
+    path = rule['path']
+    where = f' at {path}' if path else ''
+    values = select(config, path)
+
+    if rule['check_type'] == 'presence':
+        if rule['must_match'] and not values:
+            return f'{path} is missing'
+        if not rule['must_match'] and values:
+            return f'{path} is present'
+        return None
+
+    if rule['check_type'] == 'regex':
+        pattern = compile_pattern(rule['pattern'])
+        match = next((match for match in (pattern.search(as_text(value)) for value in values) if match), None)
+        if rule['must_match'] and not match:
+            return f"No match for /{rule['pattern']}/{where}"
+        if not rule['must_match'] and match:
+            return f"Forbidden match '{match.group(0)[:200]}'{where}"
+        return None
+
+    if not values:
+        return f'{path} is missing'
+    failing = [value for value in values if not compare(rule['operator'], value, rule['expected'])]
+    if failing:
+        return f"{path}: expected {rule['operator']} {json.dumps(rule['expected'])}, found {json.dumps(failing[0])[:200]}"
+    return None
+
+
+def evaluate_batch(rules, configs, regex_seconds=None):
+    """Evaluate every rule against each config, returning a [(rule id, message), ...] list per config.
+
+    With ``regex_seconds`` each regex check is interrupted once it runs that long, so a pattern
+    that backtracks catastrophically fails its rule instead of tying up the worker. Interrupting
+    relies on SIGALRM, so only pass it on a process's main thread, as in pool workers.
+    """
+    previous = signal.signal(signal.SIGALRM, raise_timeout) if regex_seconds else None
+    try:
+        results = []
+        for config in configs:
+            violations = []
+            for rule in rules:
+                try:
+                    if regex_seconds and rule['check_type'] == 'regex':
+                        with interrupt_after(regex_seconds):
+                            message = check(config, rule)
+                    else:
+                        message = check(config, rule)
+                except RuleTimeout:
+                    message = f'Rule could not be evaluated: no result within {regex_seconds}s'
+                except (re.error, TypeError, ValueError) as exc:
+                    message = f'Rule could not be evaluated: {exc}'
+                if message:
+                    violations.append((rule['id'], message))
+            results.append(violations)
+        return results
+    finally:
+        if regex_seconds:
+            signal.signal(signal.SIGALRM, previous)
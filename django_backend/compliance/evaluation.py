@@ -0,0 +1,123 @@
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from network_automation.pools import LazyProcessPool
+from network_devices.models import NetworkDevice
+from network_intents.models import ConfigurationSnapshot
+from .engine import evaluate_batch
+from .models import ComplianceRuleSet, ComplianceResult, ComplianceViolation, DeviceCompliance
+
+RULE_FIELDS = ['id', 'check_type', 'path', 'pattern', 'operator', 'expected', 'must_match']
+
+evaluation_pool = LazyProcessPool('COMPLIANCE_WORKERS')
+
+
+def latest_snapshots():
+    """(snapshot id, device id, configuration hash) of every device's most recent snapshot."""
+    latest = ConfigurationSnapshot.objects.filter(device=OuterRef('pk')).order_by('-created_at', '-pk').values('pk')[:1]
+    snapshot_ids = NetworkDevice.objects.annotate(snapshot_id=Subquery(latest)).exclude(snapshot_id=None).values('snapshot_id')
+    return list(ConfigurationSnapshot.objects.filter(pk__in=snapshot_ids).values_list('pk', 'device_id', 'configuration_hash'))
+
+
+def evaluate_configs(rules, snapshot_ids):
+    """Evaluate the given snapshots, in-process or across the pool depending on size; returns {hash: violations}.
+
+    Regex rules always run on the pool: patterns are user-supplied, and only a worker process
+    can interrupt one that runs past COMPLIANCE_REGEX_TIMEOUT_SECONDS.
+    """
+    chunk_size = settings.COMPLIANCE_CHUNK_SIZE
+    chunks = [snapshot_ids[offset:offset + chunk_size] for offset in range(0, len(snapshot_ids), chunk_size)]
+    parallel = (
+        len(snapshot_ids) >= settings.COMPLIANCE_PARALLEL_THRESHOLD
+        or any(rule['check_type'] == 'regex' for rule in rules)
+    )
+
+    jobs = []
+    for chunk in chunks:
+        rows = list(ConfigurationSnapshot.objects.filter(pk__in=chunk).values_list('configuration_hash', 'configuration_data'))
+        if not rows:
+            continue
+        hashes, configs = zip(*rows)
+        if parallel:
+            jobs.append((hashes, evaluation_pool.get().submit(evaluate_batch, rules, list(configs), settings.COMPLIANCE_REGEX_TIMEOUT_SECONDS)))
+        else:
+            jobs.append((hashes, evaluate_batch(rules, configs)))
+
+    violations = {}
+    for hashes, job in jobs:
+        violations.update(zip(hashes, job.result() if parallel else job))
+    return violations
+
+
+def evaluate_ruleset(ruleset):
+    """Bring every device's compliance against ``ruleset`` up to date.
+
+    Configurations are evaluated once per distinct configuration_hash and ruleset version;
+    devices whose latest snapshot has a hash already evaluated for this version reuse it.
+    """
+    with transaction.atomic():
+        # Locking the ruleset makes the version and the rules read here agree with each other.
+        ruleset = ComplianceRuleSet.objects.select_for_update().get(pk=ruleset.pk)
+        version = ruleset.version
+        rules = list(ruleset.rules.filter(is_active=True).values(*RULE_FIELDS))
+
+    snapshots = latest_snapshots()
+    cached = set(ComplianceResult.objects.filter(ruleset=ruleset, ruleset_version=version).values_list('configuration_hash', flat=True))
+    pending = {}
+    for snapshot_id, _, configuration_hash in snapshots:
+        if configuration_hash not in cached:
+            pending.setdefault(configuration_hash, snapshot_id)
+    violations = evaluate_configs(rules, list(pending.values())) if pending else {}
+
+    with transaction.atomic():
+        ComplianceRuleSet.objects.select_for_update().get(pk=ruleset.pk)
+        # Another evaluation may have stored some of these while this one was running.
+        results = {
+            configuration_hash: (pk, passed, violation_count)
+            for configuration_hash, pk, passed, violation_count in ComplianceResult.objects.filter(
+                ruleset=ruleset, ruleset_version=version,
+            ).values_list('configuration_hash', 'pk', 'passed', 'violation_count')
+        }
+        new_results = ComplianceResult.objects.bulk_create([
+            ComplianceResult(
+                ruleset=ruleset, ruleset_version=version, configuration_hash=configuration_hash,
+                passed=not found, violation_count=len(found),
+            )
+            for configuration_hash, found in violations.items() if configuration_hash not in results
+        ], batch_size=1000)
+        ComplianceViolation.objects.bulk_create([
+            ComplianceViolation(result=result, rule_id=rule_id, message=message)
+            for result in new_results
+            for rule_id, message in violations[result.configuration_hash]
+        ], batch_size=1000)
+        results.update((result.configuration_hash, (result.pk, result.passed, result.violation_count)) for result in new_results)
+
+        DeviceCompliance.objects.bulk_create(
+            [
+                DeviceCompliance(
+                    device_id=device_id, ruleset=ruleset, snapshot_id=snapshot_id, ruleset_version=version,
+                    result_id=results[configuration_hash][0],
+                    passed=results[configuration_hash][1],
+                    violation_count=results[configuration_hash][2],
+                )
+                for snapshot_id, device_id, configuration_hash in snapshots
+                if configuration_hash in results
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['device', 'ruleset'],
+            update_fields=['snapshot', 'result', 'ruleset_version', 'passed', 'violation_count', 'updated_at'],
+        )
+        # Results of earlier versions are no longer referenced by any current device status.
+        ComplianceResult.objects.filter(ruleset=ruleset, ruleset_version__lt=version).delete()
+        ComplianceRuleSet.objects.filter(pk=ruleset.pk).update(last_evaluated_at=timezone.now())
+
+    return {
+        'version': version,
+        'devices': len(snapshots),
+        'evaluated': len(pending),
+        'cached': len({configuration_hash for _, _, configuration_hash in snapshots}) - len(pending),
+    }
@@ -0,0 +1,28 @@
+
+import time
+from django.core.management.base import BaseCommand, CommandError
+from compliance.models import ComplianceRuleSet
+from compliance.evaluation import evaluate_ruleset
+
+class Command(BaseCommand):
+    help = "Evaluate compliance rule sets against every device's latest configuration snapshot"
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--ruleset', type=int, help='Evaluate only this rule set (default: every active one)')
+    
+    def handle(self, *args, **options):
+        if options['ruleset']:
+            rulesets = ComplianceRuleSet.objects.filter(pk=options['ruleset'])
+            if not rulesets.exists():
+                raise CommandError(f"Rule set {options['ruleset']} not found")
+        else:
+            rulesets = ComplianceRuleSet.objects.filter(is_active=True)
+        
+        for ruleset in rulesets:
+            started = time.monotonic()
+            summary = evaluate_ruleset(ruleset)
+            self.stdout.write(self.style.SUCCESS(
+                f"{ruleset.name} v{summary['version']}: {summary['devices']} devices, "
+                f"{summary['evaluated']} configurations evaluated, {summary['cached']} cached "
+                f"({time.monotonic() - started:.2f}s)"
+            ))
@@ -0,0 +1,101 @@
+
+from django.db import models
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+class ComplianceRuleSet(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    description = models.TextField(blank=True)
+    # Bumped whenever a rule changes; cached results are keyed by it
+    version = models.PositiveIntegerField(default=1)
+    is_active = models.BooleanField(default=True)
+    last_evaluated_at = models.DateTimeField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='compliance_rulesets')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+class ComplianceRule(models.Model):
+    SEVERITY_CHOICES = [
+        ('low', 'Low'),
+        ('medium', 'Medium'),
+        ('high', 'High'),
+        ('critical', 'Critical'),
+    ]
+    
+    CHECK_TYPES = [
+        ('regex', 'Regular Expression'),
+        ('path', 'Structured Path'),
+        ('presence', 'Presence'),
+    ]
+    
+    OPERATORS = [
+        ('equals', 'Equals'),
+        ('not_equals', 'Not Equals'),
+        ('contains', 'Contains'),
+        ('not_contains', 'Does Not Contain'),
+    ]
+    
+    ruleset = models.ForeignKey(ComplianceRuleSet, on_delete=models.CASCADE, related_name='rules')
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    severity = models.CharField(max_length=20, choices=SEVERITY_CHOICES, default='medium')
+    check_type = models.CharField(max_length=20, choices=CHECK_TYPES)
+    # Dotted path into the configuration ('*' matches every key or item); blank means the whole config
+    path = models.CharField(max_length=500, blank=True)
+    pattern = models.TextField(blank=True)
+    operator = models.CharField(max_length=20, choices=OPERATORS, blank=True)
+    expected = models.JSONField(null=True, blank=True)
+    # False turns the check around: the pattern must not match / the path must be absent
+    must_match = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True)
+    
+    class Meta:
+        ordering = ['ruleset', 'id']
+    
+    def __str__(self):
+        return f"{self.ruleset.name}: {self.name}"
+
+class ComplianceResult(models.Model):
+    """Evaluation of one distinct configuration against one ruleset version."""
+    ruleset = models.ForeignKey(ComplianceRuleSet, on_delete=models.CASCADE, related_name='results')
+    ruleset_version = models.PositiveIntegerField()
+    configuration_hash = models.CharField(max_length=255)
+    passed = models.BooleanField()
+    violation_count = models.PositiveIntegerField(default=0)
+    evaluated_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['ruleset', 'ruleset_version', 'configuration_hash']
+
+class ComplianceViolation(models.Model):
+    result = models.ForeignKey(ComplianceResult, on_delete=models.CASCADE, related_name='violations')
+    rule = models.ForeignKey(ComplianceRule, on_delete=models.CASCADE, related_name='violations')
+    message = models.TextField()
+    
+    class Meta:
+        ordering = ['rule']
+
+class DeviceCompliance(models.Model):
+    """Current compliance of each device's latest snapshot; reports aggregate over this table."""
+    device = models.ForeignKey('network_devices.NetworkDevice', on_delete=models.CASCADE, related_name='compliance')
+    ruleset = models.ForeignKey(ComplianceRuleSet, on_delete=models.CASCADE, related_name='device_statuses')
+    snapshot = models.ForeignKey('network_intents.ConfigurationSnapshot', on_delete=models.CASCADE, related_name='+')
+    result = models.ForeignKey(ComplianceResult, on_delete=models.CASCADE, related_name='device_statuses')
+    ruleset_version = models.PositiveIntegerField()
+    passed = models.BooleanField()
+    violation_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['device']
+        unique_together = ['device', 'ruleset']
+        indexes = [
+            models.Index(fields=['ruleset', 'passed']),
+        ]
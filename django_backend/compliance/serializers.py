@@ -0,0 +1,59 @@
+
+import re
+from rest_framework import serializers
+from .models import ComplianceRuleSet, ComplianceRule, ComplianceViolation, DeviceCompliance
+
+class ComplianceRuleSetSerializer(serializers.ModelSerializer):
+    created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
+    
+    class Meta:
+        model = ComplianceRuleSet
+        fields = '__all__'
+        read_only_fields = ['version', 'last_evaluated_at', 'created_by']
+
+class ComplianceRuleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ComplianceRule
+        fields = '__all__'
+        read_only_fields = ['ruleset']
+    
+    def validate(self, attrs):
+        get = lambda field: attrs.get(field, getattr(self.instance, field, None))
+        check_type = get('check_type')
+        if check_type == 'regex':
+            try:
+                re.compile(get('pattern') or '')
+            except re.error as exc:
+                raise serializers.ValidationError({'pattern': f'Invalid regular expression: {exc}'})
+            if not get('pattern'):
+                raise serializers.ValidationError({'pattern': 'Regex rules need a pattern'})
+        elif check_type == 'path':
+            if not get('path') or not get('operator'):
+                raise serializers.ValidationError('Path rules need a path and an operator')
+        elif check_type == 'presence' and not get('path'):
+            raise serializers.ValidationError({'path': 'Presence rules need a path'})
+        return attrs
+
+class ComplianceViolationSerializer(serializers.ModelSerializer):
+    rule_name = serializers.CharField(source='rule.name', read_only=True)
+    severity = serializers.CharField(source='rule.severity', read_only=True)
+    
+    class Meta:
+        model = ComplianceViolation
+        fields = ['rule', 'rule_name', 'severity', 'message']
+
+class DeviceComplianceSerializer(serializers.ModelSerializer):
+    device_name = serializers.CharField(source='device.name', read_only=True)
+    violations = ComplianceViolationSerializer(source='result.violations', many=True, read_only=True)
+    
+    class Meta:
+        model = DeviceCompliance
+        fields = '__all__'
+
+class RuleViolationSerializer(serializers.ModelSerializer):
+    device_name = serializers.CharField(source='device.name', read_only=True)
+    message = serializers.CharField(read_only=True)
+    
+    class Meta:
+        model = DeviceCompliance
+        fields = ['device', 'device_name', 'snapshot', 'message', 'updated_at']
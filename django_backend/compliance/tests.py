@@ -0,0 +1,107 @@
+from unittest import mock
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from network_devices.models import NetworkDevice
+from network_intents.models import ConfigurationSnapshot
+from . import engine, evaluation
+from .evaluation import evaluate_ruleset
+from .models import ComplianceRuleSet, ComplianceRule, ComplianceResult, DeviceCompliance
+from .views import bump_version
+
+CONFIG = {
+    'hostname': 'edge1',
+    'ntp': {'servers': ['10.0.0.1', '10.0.0.2']},
+    'interfaces': [{'name': 'eth0', 'mtu': 1500}, {'name': 'eth1', 'mtu': 9000}],
+    'banner': ['line one', 'line two'],
+}
+
+def rule(check_type, path='', rule_id=1, **fields):
+    return {'id': rule_id, 'check_type': check_type, 'path': path, 'pattern': '', 'operator': '', 'expected': None, 'must_match': True, **fields}
+
+class EngineTests(SimpleTestCase):
+    def test_select_walks_keys_wildcards_and_indexes(self):
+        self.assertEqual(engine.select(CONFIG, 'hostname'), ['edge1'])
+        self.assertEqual(engine.select(CONFIG, 'interfaces.*.mtu'), [1500, 9000])
+        self.assertEqual(engine.select(CONFIG, 'interfaces.-1.name'), ['eth1'])
+        self.assertEqual(engine.select(CONFIG, 'interfaces.5.name'), [])
+        self.assertEqual(engine.select(CONFIG, 'snmp.community'), [])
+        self.assertEqual(engine.select(CONFIG, ''), [CONFIG])
+    
+    def test_compare_operators(self):
+        self.assertTrue(engine.compare('equals', 1500, 1500))
+        self.assertTrue(engine.compare('not_equals', 1500, 9000))
+        self.assertTrue(engine.compare('contains', ['10.0.0.1'], '10.0.0.1'))
+        self.assertTrue(engine.compare('contains', 'ntp server 10.0.0.1', '10.0.0.1'))
+        self.assertFalse(engine.compare('contains', 'ntp server', 1))
+        self.assertTrue(engine.compare('not_contains', 1500, 'x'))
+    
+    def test_presence_checks(self):
+        self.assertIsNone(engine.check(CONFIG, rule('presence', 'ntp.servers')))
+        self.assertEqual(engine.check(CONFIG, rule('presence', 'snmp')), 'snmp is missing')
+        self.assertIsNone(engine.check(CONFIG, rule('presence', 'snmp', must_match=False)))
+        self.assertEqual(engine.check(CONFIG, rule('presence', 'hostname', must_match=False)), 'hostname is present')
+    
+    def test_regex_checks(self):
+        self.assertIsNone(engine.check(CONFIG, rule('regex', 'banner', pattern='^line two$')))
+        self.assertEqual(engine.check(CONFIG, rule('regex', 'hostname', pattern='^core')), 'No match for /^core/ at hostname')
+        self.assertIsNone(engine.check(CONFIG, rule('regex', 'hostname', pattern='^core', must_match=False)))
+        self.assertEqual(
+            engine.check(CONFIG, rule('regex', 'ntp', pattern=r'10\.0\.0\.\d', must_match=False)),
+            "Forbidden match '10.0.0.1' at ntp",
+        )
+    
+    def test_path_checks(self):
+        self.assertIsNone(engine.check(CONFIG, rule('path', 'hostname', operator='equals', expected='edge1')))
+        self.assertEqual(
+            engine.check(CONFIG, rule('path', 'interfaces.*.mtu', operator='equals', expected=9000)),
+            'interfaces.*.mtu: expected equals 9000, found 1500',
+        )
+        self.assertEqual(engine.check(CONFIG, rule('path', 'snmp', operator='equals', expected=1)), 'snmp is missing')
+    
+    def test_invalid_and_runaway_patterns_fail_only_their_rule(self):
+        rules = [
+            rule('regex', 'hostname', rule_id=1, pattern='('),
+            rule('regex', 'hostname', rule_id=2, pattern='(a+)+$'),
+            rule('presence', 'snmp', rule_id=3),
+        ]
+        [violations] = engine.evaluate_batch(rules, [{'hostname': 'a' * 40 + 'b'}], regex_seconds=0.2)
+        self.assertEqual([rule_id for rule_id, _ in violations], [1, 2, 3])
+        self.assertIn('Rule could not be evaluated', violations[0][1])
+        self.assertEqual(violations[1][1], 'Rule could not be evaluated: no result within 0.2s')
+
+class EvaluationTests(TransactionTestCase):
+    def setUp(self):
+        self.ruleset = ComplianceRuleSet.objects.create(name='baseline')
+        ComplianceRule.objects.create(ruleset=self.ruleset, name='ntp', check_type='presence', path='ntp.servers')
+        for name, configuration_hash, config in (('edge1', 'a', CONFIG), ('edge2', 'a', CONFIG), ('edge3', 'b', {'hostname': 'edge3'})):
+            device = NetworkDevice.objects.create(name=name, type='router')
+            ConfigurationSnapshot.objects.create(device=device, configuration_hash=configuration_hash, configuration_data=config)
+    
+    def test_results_are_reused_per_configuration_hash_and_version(self):
+        with mock.patch.object(evaluation, 'evaluate_batch', wraps=engine.evaluate_batch) as evaluate_batch:
+            self.assertEqual(evaluate_ruleset(self.ruleset), {'version': 1, 'devices': 3, 'evaluated': 2, 'cached': 0})
+            self.assertEqual(evaluate_ruleset(self.ruleset), {'version': 1, 'devices': 3, 'evaluated': 0, 'cached': 2})
+            self.assertEqual(evaluate_batch.call_count, 1)
+    
+            bump_version(self.ruleset.pk)
+            self.assertEqual(evaluate_ruleset(self.ruleset), {'version': 2, 'devices': 3, 'evaluated': 2, 'cached': 0})
+            self.assertEqual(evaluate_batch.call_count, 2)
+    
+        self.assertEqual(set(ComplianceResult.objects.values_list('ruleset_version', flat=True)), {2})
+        statuses = dict(DeviceCompliance.objects.values_list('device__name', 'passed'))
+        self.assertEqual(statuses, {'edge1': True, 'edge2': True, 'edge3': False})
+    
+    @override_settings(COMPLIANCE_REGEX_TIMEOUT_SECONDS=0.2)
+    def test_regex_rules_run_on_the_pool_with_a_time_limit(self):
+        self.addCleanup(setattr, evaluation.evaluation_pool, 'executor', None)
+        ComplianceRule.objects.create(ruleset=self.ruleset, name='runaway', check_type='regex', path='hostname', pattern='(e+)+$')
+        ConfigurationSnapshot.objects.create(
+            device=NetworkDevice.objects.get(name='edge3'), configuration_hash='c', configuration_data={'hostname': 'e' * 40 + 'x'},
+        )
+    
+        self.assertEqual(evaluate_ruleset(self.ruleset)['evaluated'], 2)
+        evaluation.evaluation_pool.executor.shutdown()
+        result = DeviceCompliance.objects.get(device__name='edge3').result
+        self.assertEqual(
+            sorted(result.violations.values_list('message', flat=True)),
+            ['Rule could not be evaluated: no result within 0.2s', 'ntp.servers is missing'],
+        )
@@ -0,0 +1,14 @@
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('rulesets/', views.ComplianceRuleSetListCreateView.as_view(), name='compliance-ruleset-list'),
+    path('rulesets/<int:pk>/', views.ComplianceRuleSetDetailView.as_view(), name='compliance-ruleset-detail'),
+    path('rulesets/<int:ruleset_pk>/rules/', views.ComplianceRuleListCreateView.as_view(), name='compliance-rule-list'),
+    path('rulesets/<int:pk>/evaluate/', views.evaluate_compliance, name='evaluate-compliance'),
+    path('rulesets/<int:pk>/report/', views.compliance_report, name='compliance-report'),
+    path('rulesets/<int:pk>/devices/', views.DeviceComplianceListView.as_view(), name='device-compliance-list'),
+    path('rulesets/<int:pk>/rules/<int:rule_pk>/violations/', views.RuleViolationListView.as_view(), name='rule-violation-list'),
+    path('rules/<int:pk>/', views.ComplianceRuleDetailView.as_view(), name='compliance-rule-detail'),
+]
@@ -0,0 +1,126 @@
+
+from rest_framework import generics, status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.shortcuts import get_object_or_404
+from network_automation.fieldsets import SparseFieldsetMixin
+from .models import ComplianceRuleSet, ComplianceRule, ComplianceViolation, DeviceCompliance
+from .serializers import ComplianceRuleSetSerializer, ComplianceRuleSerializer, DeviceComplianceSerializer, RuleViolationSerializer
+from .evaluation import evaluate_ruleset
+
+def bump_version(ruleset_id):
+    # Cached results belong to the previous version and are ignored from now on.
+    ComplianceRuleSet.objects.filter(pk=ruleset_id).update(version=F('version') + 1)
+
+class ComplianceRuleSetListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = ComplianceRuleSet.objects.all()
+    serializer_class = ComplianceRuleSetSerializer
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filterset_fields = ['is_active']
+    search_fields = ['name', 'description']
+    
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+class ComplianceRuleSetDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = ComplianceRuleSet.objects.all()
+    serializer_class = ComplianceRuleSetSerializer
+
+class ComplianceRuleListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    serializer_class = ComplianceRuleSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['severity', 'check_type', 'is_active']
+    
+    def get_queryset(self):
+        return ComplianceRule.objects.filter(ruleset_id=self.kwargs['ruleset_pk'])
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        ruleset = get_object_or_404(ComplianceRuleSet, pk=self.kwargs['ruleset_pk'])
+        serializer.save(ruleset=ruleset)
+        bump_version(ruleset.pk)
+
+class ComplianceRuleDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = ComplianceRule.objects.all()
+    serializer_class = ComplianceRuleSerializer
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        rule = serializer.save()
+        bump_version(rule.ruleset_id)
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        bump_version(instance.ruleset_id)
+
+@api_view(['POST'])
+def evaluate_compliance(request, pk):
+    try:
+        ruleset = ComplianceRuleSet.objects.get(pk=pk)
+    except ComplianceRuleSet.DoesNotExist:
+        return Response({'error': 'Rule set not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if not ruleset.is_active:
+        return Response({'error': 'Rule set is not active'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(evaluate_ruleset(ruleset))
+
+@api_view(['GET'])
+def compliance_report(request, pk):
+    try:
+        ruleset = ComplianceRuleSet.objects.get(pk=pk)
+    except ComplianceRuleSet.DoesNotExist:
+        return Response({'error': 'Rule set not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    # Everything below reads the stored per-device statuses; nothing is evaluated here.
+    statuses = DeviceCompliance.objects.filter(ruleset=ruleset)
+    totals = statuses.aggregate(
+        devices=Count('id'),
+        compliant=Count('id', filter=Q(passed=True)),
+        non_compliant=Count('id', filter=Q(passed=False)),
+        stale=Count('id', filter=~Q(ruleset_version=ruleset.version)),
+    )
+    rules = list(
+        ComplianceViolation.objects.filter(result__device_statuses__ruleset=ruleset)
+        .values('rule', name=F('rule__name'), severity=F('rule__severity'))
+        .annotate(devices=Count('result__device_statuses'))
+        .order_by('-devices', 'rule')
+    )
+    by_severity = {}
+    for rule in rules:
+        by_severity[rule['severity']] = by_severity.get(rule['severity'], 0) + rule['devices']
+    
+    return Response({
+        'ruleset': ruleset.pk,
+        'version': ruleset.version,
+        'last_evaluated_at': ruleset.last_evaluated_at,
+        **totals,
+        'compliance_percent': round(totals['compliant'] / totals['devices'] * 100, 2) if totals['devices'] else None,
+        'violations_by_severity': by_severity,
+        'rules': rules,
+    })
+
+class DeviceComplianceListView(SparseFieldsetMixin, generics.ListAPIView):
+    serializer_class = DeviceComplianceSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['device', 'passed', 'ruleset_version']
+    
+    def get_queryset(self):
+        return DeviceCompliance.objects.filter(ruleset_id=self.kwargs['pk']).select_related('device').prefetch_related('result__violations__rule')
+
+class RuleViolationListView(SparseFieldsetMixin, generics.ListAPIView):
+    serializer_class = RuleViolationSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['device']
+    
+    def get_queryset(self):
+        return (
+            DeviceCompliance.objects.filter(ruleset_id=self.kwargs['pk'], result__violations__rule_id=self.kwargs['rule_pk'])
+            .select_related('device')
+            .annotate(message=F('result__violations__message'))
+        )
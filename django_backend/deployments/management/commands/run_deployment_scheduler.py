@@ -0,0 +1,18 @@
+
+import signal
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from deployments.scheduler import DeploymentScheduler
+
+class Command(BaseCommand):
+    help = 'Dispatch queued intent deployments within their change windows and concurrency caps'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.DEPLOYMENT_WORKERS)
+    
+    def handle(self, *args, **options):
+        scheduler = DeploymentScheduler(workers=options['workers'])
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: scheduler.stop())
+        self.stdout.write(f"Deployment scheduler started with {scheduler.workers} workers")
+        scheduler.run()
@@ -0,0 +1,56 @@
+
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+User = get_user_model()
+
+class ScheduledDeployment(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+        ('expired', 'Expired'),
+    ]
+    
+    intent = models.ForeignKey('network_intents.NetworkIntent', on_delete=models.CASCADE, related_name='scheduled_deployments')
+    devices = models.ManyToManyField('network_devices.NetworkDevice', blank=True, related_name='scheduled_deployments')
+    priority = models.IntegerField(default=0)
+    window_start = models.DateTimeField(default=timezone.now)
+    window_end = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    scheduled_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='scheduled_deployments')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-priority', 'next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['status', 'lease_expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.intent} ({self.status})"
+
+class ConcurrencyLimit(models.Model):
+    """Cap on devices changed at once per (location, device type); blank fields match any value."""
+    location = models.CharField(max_length=255, null=True, blank=True)
+    device_type = models.CharField(max_length=20, null=True, blank=True)
+    max_concurrent = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['location', 'device_type']
+    
+    def __str__(self):
+        return f"{self.location or '*'} / {self.device_type or '*'}: {self.max_concurrent}"
@@ -0,0 +1,233 @@
+
+import logging
+import select
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import connection, close_old_connections, transaction
+from django.db.models import Min, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from network_devices.models import NetworkDevice
+from .models import ScheduledDeployment, ConcurrencyLimit
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'deployment_queue'
+
+
+def notify_scheduler():
+    """Wake sleeping schedulers once the current transaction commits (Postgres LISTEN/NOTIFY)."""
+    if connection.vendor != 'postgresql':
+        return
+
+    def send():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, ''])
+
+    transaction.on_commit(send)
+
+
+def deploy_to_nso(deployment):
+    if not settings.NSO_BASE_URL:
+        raise RuntimeError('NSO_BASE_URL is not configured')
+
+    response = requests.post(
+        f"{settings.NSO_BASE_URL.rstrip('/')}/restconf/data/",
+        data=deployment.intent.configuration or '',
+        auth=(settings.NSO_USERNAME, settings.NSO_PASSWORD),
+        headers={'Content-Type': 'application/json', 'Accept': 'application/json'},
+        timeout=settings.DEPLOYMENT_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+
+
+def retry_delay(attempts):
+    return min(settings.DEPLOYMENT_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.DEPLOYMENT_RETRY_MAX_SECONDS)
+
+
+class ConcurrencyBudget:
+    """Tracks devices currently being changed per (location, device type) against the configured caps."""
+
+    def __init__(self, limits, in_use, default_limit):
+        self.limits = {(limit.location or None, limit.device_type or None): limit.max_concurrent for limit in limits}
+        self.in_use = Counter(in_use)
+        self.default_limit = default_limit
+
+    @classmethod
+    def load(cls):
+        in_use = NetworkDevice.objects.filter(scheduled_deployments__status='running').values_list('location', 'type')
+        return cls(ConcurrencyLimit.objects.all(), in_use, settings.DEPLOYMENT_DEFAULT_CONCURRENCY)
+
+    def cap(self, location, device_type):
+        for key in ((location, device_type), (location, None), (None, device_type), (None, None)):
+            if key in self.limits:
+                return self.limits[key]
+        return self.default_limit
+
+    def try_acquire(self, devices):
+        wanted = Counter((device.location, device.type) for device in devices)
+        if any(self.in_use[key] + count > self.cap(*key) for key, count in wanted.items()):
+            return False
+        self.in_use.update(wanted)
+        return True
+
+
+class DeploymentScheduler:
+    """Dispatches queued deployments to a worker pool.
+
+    The scheduler sleeps until the next retry or window opens, a worker finishes, or a
+    NOTIFY arrives for newly queued work, so an idle queue costs no database polling.
+    """
+
+    def __init__(self, workers=None, executor=deploy_to_nso):
+        self.workers = workers or settings.DEPLOYMENT_WORKERS
+        self.executor = executor
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='deployment')
+        self.in_flight = set()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+
+    def run(self):
+        listener = threading.Thread(target=self.listen, daemon=True)
+        listener.start()
+        try:
+            while not self.stopped.is_set():
+                self.wakeup.clear()
+                self.dispatch()
+                self.wakeup.wait(self.seconds_until_next_run())
+        finally:
+            self.pool.shutdown(wait=True)
+
+    def stop(self):
+        self.stopped.set()
+        self.wakeup.set()
+
+    def listen(self):
+        if connection.vendor != 'postgresql':
+            return
+        connection.ensure_connection()
+        conn = connection.connection
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+        while not self.stopped.is_set():
+            if select.select([conn], [], [], settings.DEPLOYMENT_IDLE_SECONDS)[0]:
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    self.wakeup.set()
+
+    def recover_expired_leases(self):
+        """Requeue deployments whose worker died mid-run (e.g. the scheduler was restarted)."""
+        now = timezone.now()
+        for deployment in ScheduledDeployment.objects.filter(status='running', lease_expires_at__lt=now):
+            self.fail(deployment, 'Lease expired before the deployment finished')
+
+    def seconds_until_next_run(self):
+        if len(self.in_flight) >= self.workers:
+            return settings.DEPLOYMENT_IDLE_SECONDS
+
+        now = timezone.now()
+        # Work that is eligible now but blocked by caps or maintenance is retried when a worker
+        # finishes or after the idle timeout, so only future eligibility times are considered here.
+        upcoming = ScheduledDeployment.objects.aggregate(
+            next_eligible=Min(
+                Greatest('next_attempt_at', 'window_start'),
+                filter=Q(status='queued') & (Q(next_attempt_at__gt=now) | Q(window_start__gt=now)),
+            ),
+            next_lease=Min('lease_expires_at', filter=Q(status='running')),
+        )
+        candidates = [value for value in upcoming.values() if value]
+        if not candidates:
+            return settings.DEPLOYMENT_IDLE_SECONDS
+        return min(max((min(candidates) - now).total_seconds(), 0.1), settings.DEPLOYMENT_IDLE_SECONDS)
+
+    def dispatch(self):
+        now = timezone.now()
+        ScheduledDeployment.objects.filter(status='queued', window_end__lte=now).update(
+            status='expired', finished_at=now,
+        )
+        self.recover_expired_leases()
+
+        free = self.workers - len(self.in_flight)
+        if free <= 0:
+            return
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # Serialise dispatch across scheduler processes so concurrency caps are not over-committed.
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [NOTIFY_CHANNEL])
+            candidates = (
+                ScheduledDeployment.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(status='queued', next_attempt_at__lte=now, window_start__lte=now)
+                .filter(Q(window_end__isnull=True) | Q(window_end__gt=now))
+                .select_related('intent')
+                .prefetch_related('devices')
+                .order_by('-priority', 'next_attempt_at')[:free * settings.DEPLOYMENT_CANDIDATE_FACTOR]
+            )
+            budget = ConcurrencyBudget.load()
+            claimed = []
+            for deployment in candidates:
+                devices = list(deployment.devices.all())
+                # Devices under maintenance are being worked on by someone else; wait until they return.
+                if any(device.status == 'maintenance' for device in devices):
+                    continue
+                if not budget.try_acquire(devices):
+                    continue
+                deployment.status = 'running'
+                deployment.attempts += 1
+                deployment.started_at = now
+                deployment.lease_expires_at = now + timedelta(seconds=settings.DEPLOYMENT_LEASE_SECONDS)
+                deployment.save(update_fields=['status', 'attempts', 'started_at', 'lease_expires_at', 'updated_at'])
+                claimed.append(deployment)
+                if len(claimed) == free:
+                    break
+
+        for deployment in claimed:
+            self.in_flight.add(deployment.pk)
+            self.pool.submit(self.execute, deployment)
+
+    def execute(self, deployment):
+        close_old_connections()
+        try:
+            self.executor(deployment)
+        except Exception as exc:
+            logger.exception('Deployment %s failed', deployment.pk)
+            self.fail(deployment, str(exc))
+        else:
+            self.succeed(deployment)
+        finally:
+            self.in_flight.discard(deployment.pk)
+            connection.close()
+            self.wakeup.set()
+
+    def succeed(self, deployment):
+        now = timezone.now()
+        with transaction.atomic():
+            ScheduledDeployment.objects.filter(pk=deployment.pk).update(
+                status='succeeded', finished_at=now, lease_expires_at=None, last_error='', updated_at=now,
+            )
+            deployment.intent.status = 'deployed'
+            deployment.intent.deployed_at = now
+            deployment.intent.save(update_fields=['status', 'deployed_at', 'updated_at'])
+
+    def fail(self, deployment, error):
+        now = timezone.now()
+        with transaction.atomic():
+            if deployment.attempts < deployment.max_attempts:
+                ScheduledDeployment.objects.filter(pk=deployment.pk).update(
+                    status='queued', lease_expires_at=None, last_error=error, updated_at=now,
+                    next_attempt_at=now + timedelta(seconds=retry_delay(deployment.attempts)),
+                )
+                return
+            ScheduledDeployment.objects.filter(pk=deployment.pk).update(
+                status='failed', finished_at=now, lease_expires_at=None, last_error=error, updated_at=now,
+            )
+            deployment.intent.status = 'failed'
+            deployment.intent.save(update_fields=['status', 'updated_at'])
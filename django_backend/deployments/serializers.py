@@ -0,0 +1,53 @@
+
+from rest_framework import serializers
+from .models import ScheduledDeployment, ConcurrencyLimit
+
+class ScheduledDeploymentSerializer(serializers.ModelSerializer):
+    # What gets deployed, and where and when, is fixed once the scheduler has picked the deployment up
+    QUEUED_ONLY_FIELDS = ['intent', 'devices', 'window_start', 'window_end']
+    
+    intent_title = serializers.CharField(source='intent.title', read_only=True)
+    scheduled_by_email = serializers.EmailField(source='scheduled_by.email', read_only=True)
+    
+    class Meta:
+        model = ScheduledDeployment
+        fields = '__all__'
+        read_only_fields = [
+            'status', 'attempts', 'next_attempt_at', 'lease_expires_at', 'last_error',
+            'scheduled_by', 'started_at', 'finished_at',
+        ]
+    
+    def validate_intent(self, intent):
+        if self.instance is not None and intent == self.instance.intent:
+            return intent
+        if intent.status != 'approved':
+            raise serializers.ValidationError('Only approved intents can be scheduled')
+        return intent
+    
+    def check_editable(self, attrs):
+        if self.instance is None or self.instance.status == 'queued':
+            return
+        current_devices = {device.pk for device in self.instance.devices.all()}
+        changed = [
+            field for field in self.QUEUED_ONLY_FIELDS if field in attrs and (
+                {device.pk for device in attrs[field]} != current_devices if field == 'devices'
+                else attrs[field] != getattr(self.instance, field)
+            )
+        ]
+        if changed:
+            raise serializers.ValidationError({
+                field: f'Cannot be changed once the deployment is {self.instance.status}' for field in changed
+            })
+    
+    def validate(self, attrs):
+        self.check_editable(attrs)
+        window_start = attrs.get('window_start', getattr(self.instance, 'window_start', None))
+        window_end = attrs.get('window_end', getattr(self.instance, 'window_end', None))
+        if window_start and window_end and window_end <= window_start:
+            raise serializers.ValidationError("window_end must be after window_start")
+        return attrs
+
+class ConcurrencyLimitSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ConcurrencyLimit
+        fields = '__all__'
@@ -0,0 +1,155 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from network_devices.models import NetworkDevice
+from network_intents.models import NetworkIntent
+from .models import ScheduledDeployment, ConcurrencyLimit
+from .scheduler import ConcurrencyBudget, DeploymentScheduler
+
+def limit(location, device_type, max_concurrent):
+    return SimpleNamespace(location=location, device_type=device_type, max_concurrent=max_concurrent)
+
+class ConcurrencyBudgetTests(SimpleTestCase):
+    def test_cap_falls_back_from_exact_to_location_to_type_to_global(self):
+        budget = ConcurrencyBudget(
+            [limit('dc1', 'core', 1), limit('dc1', '', 2), limit(None, 'core', 3), limit('', '', 4)], [], default_limit=5,
+        )
+        self.assertEqual(budget.cap('dc1', 'core'), 1)
+        self.assertEqual(budget.cap('dc1', 'access'), 2)
+        self.assertEqual(budget.cap('dc2', 'core'), 3)
+        self.assertEqual(budget.cap('dc2', 'access'), 4)
+        self.assertEqual(ConcurrencyBudget([], [], default_limit=5).cap('dc2', 'access'), 5)
+    
+    def test_try_acquire_counts_in_use_devices_and_takes_all_or_nothing(self):
+        budget = ConcurrencyBudget([limit('dc1', 'core', 2)], [('dc1', 'core')], default_limit=1)
+        core = SimpleNamespace(location='dc1', type='core')
+        access = SimpleNamespace(location='dc1', type='access')
+        self.assertFalse(budget.try_acquire([core, core]))
+        self.assertFalse(budget.try_acquire([core, access, access]))
+        self.assertEqual(budget.in_use[('dc1', 'access')], 0)
+        self.assertTrue(budget.try_acquire([core, access]))
+        self.assertFalse(budget.try_acquire([core]))
+        self.assertFalse(budget.try_acquire([access]))
+
+@override_settings(DEPLOYMENT_RETRY_BASE_SECONDS=60, DEPLOYMENT_RETRY_MAX_SECONDS=3600, DEPLOYMENT_DEFAULT_CONCURRENCY=5)
+class DeploymentSchedulerTests(TransactionTestCase):
+    def setUp(self):
+        self.intent = NetworkIntent.objects.create(title='VLAN 10', intent_type='vlan_configuration', status='approved')
+        self.deployed = []
+        self.error = None
+    
+    def execute(self, deployment):
+        self.deployed.append(deployment.pk)
+        if self.error:
+            raise RuntimeError(self.error)
+    
+    def run_dispatch(self):
+        scheduler = DeploymentScheduler(workers=4, executor=self.execute)
+        scheduler.dispatch()
+        scheduler.pool.shutdown(wait=True)
+    
+    def schedule(self, *devices, **fields):
+        deployment = ScheduledDeployment.objects.create(intent=self.intent, **fields)
+        deployment.devices.set(devices)
+        return deployment
+    
+    def device(self, name, status='online'):
+        return NetworkDevice.objects.create(name=name, type='access', location='dc1', status=status)
+    
+    def test_dispatch_skips_maintenance_devices_and_deployments_over_the_cap(self):
+        ConcurrencyLimit.objects.create(location='dc1', device_type='access', max_concurrent=1)
+        maintenance = self.schedule(self.device('sw1', status='maintenance'), priority=10)
+        first = self.schedule(self.device('sw2'), priority=5)
+        over_cap = self.schedule(self.device('sw3'))
+        elsewhere = self.schedule(NetworkDevice.objects.create(name='sw4', type='access', location='dc2'))
+        
+        self.run_dispatch()
+        
+        self.assertEqual(sorted(self.deployed), sorted([first.pk, elsewhere.pk]))
+        statuses = dict(ScheduledDeployment.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[maintenance.pk], 'queued')
+        self.assertEqual(statuses[over_cap.pk], 'queued')
+        self.assertEqual(statuses[first.pk], 'succeeded')
+        self.intent.refresh_from_db()
+        self.assertEqual(self.intent.status, 'deployed')
+        
+        self.run_dispatch()
+        self.assertEqual(ScheduledDeployment.objects.get(pk=over_cap.pk).status, 'succeeded')
+        self.assertEqual(ScheduledDeployment.objects.get(pk=maintenance.pk).status, 'queued')
+    
+    def test_failures_are_retried_with_backoff_then_fail_the_intent(self):
+        deployment = self.schedule(self.device('sw1'), max_attempts=2)
+        self.error = 'NSO unreachable'
+        
+        before = timezone.now()
+        self.run_dispatch()
+        deployment.refresh_from_db()
+        self.assertEqual((deployment.status, deployment.attempts, deployment.last_error), ('queued', 1, 'NSO unreachable'))
+        self.assertGreaterEqual(deployment.next_attempt_at, before + timedelta(seconds=60))
+        self.assertLess(deployment.next_attempt_at, timezone.now() + timedelta(seconds=61))
+        
+        self.run_dispatch()
+        self.assertEqual(len(self.deployed), 1)
+        
+        ScheduledDeployment.objects.filter(pk=deployment.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.run_dispatch()
+        deployment.refresh_from_db()
+        self.assertEqual((deployment.status, deployment.attempts), ('failed', 2))
+        self.assertIsNotNone(deployment.finished_at)
+        self.intent.refresh_from_db()
+        self.assertEqual(self.intent.status, 'failed')
+    
+    def test_expired_leases_are_requeued_or_failed(self):
+        expired = timezone.now() - timedelta(seconds=1)
+        retried = self.schedule(status='running', attempts=1, lease_expires_at=expired)
+        exhausted = self.schedule(status='running', attempts=3, lease_expires_at=expired)
+        healthy = self.schedule(status='running', attempts=1, lease_expires_at=timezone.now() + timedelta(minutes=5))
+        
+        DeploymentScheduler(workers=1, executor=self.execute).recover_expired_leases()
+        
+        statuses = {
+            pk: (status, last_error)
+            for pk, status, last_error in ScheduledDeployment.objects.values_list('pk', 'status', 'last_error')
+        }
+        self.assertEqual(statuses[retried.pk], ('queued', 'Lease expired before the deployment finished'))
+        self.assertEqual(statuses[exhausted.pk], ('failed', 'Lease expired before the deployment finished'))
+        self.assertEqual(statuses[healthy.pk], ('running', ''))
+        self.assertEqual(self.deployed, [])
+
+class ScheduledDeploymentEditTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='ops', email='ops@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.intent = NetworkIntent.objects.create(title='VLAN 10', intent_type='vlan_configuration', status='approved')
+        self.other_intent = NetworkIntent.objects.create(title='VLAN 20', intent_type='vlan_configuration', status='approved')
+        self.device = NetworkDevice.objects.create(name='sw1', type='access')
+        self.other_device = NetworkDevice.objects.create(name='sw2', type='access')
+        self.deployment = ScheduledDeployment.objects.create(intent=self.intent)
+        self.deployment.devices.set([self.device])
+        self.url = f'/api/deployments/{self.deployment.pk}/'
+    
+    def test_queued_deployment_can_be_retargeted(self):
+        response = self.client.patch(self.url, {'intent': self.other_intent.pk, 'devices': [self.other_device.pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.deployment.devices.values_list('pk', flat=True)), [self.other_device.pk])
+    
+    def test_started_deployment_keeps_intent_devices_and_window(self):
+        ScheduledDeployment.objects.filter(pk=self.deployment.pk).update(status='running', attempts=1)
+        for change in (
+            {'intent': self.other_intent.pk},
+            {'devices': [self.other_device.pk]},
+            {'window_end': (timezone.now() + timedelta(hours=1)).isoformat()},
+        ):
+            response = self.client.patch(self.url, change, format='json')
+            self.assertEqual(response.status_code, 400, change)
+            self.assertIn(next(iter(change)), response.json())
+        
+        response = self.client.patch(self.url, {'priority': 7, 'devices': [self.device.pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.deployment.refresh_from_db()
+        self.assertEqual((self.deployment.status, self.deployment.attempts, self.deployment.priority), ('running', 1, 7))
+        self.assertEqual(self.deployment.intent_id, self.intent.pk)
@@ -0,0 +1,11 @@
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.ScheduledDeploymentListCreateView.as_view(), name='deployment-list'),
+    path('<int:pk>/', views.ScheduledDeploymentDetailView.as_view(), name='deployment-detail'),
+    path('<int:pk>/cancel/', views.cancel_deployment, name='cancel-deployment'),
+    path('limits/', views.ConcurrencyLimitListCreateView.as_view(), name='concurrency-limit-list'),
+    path('limits/<int:pk>/', views.ConcurrencyLimitDetailView.as_view(), name='concurrency-limit-detail'),
+]
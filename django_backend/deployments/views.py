@@ -0,0 +1,60 @@
+
+from rest_framework import generics, status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
+from django.db import transaction
+from django.utils import timezone
+from network_automation.fieldsets import SparseFieldsetMixin
+from .models import ScheduledDeployment, ConcurrencyLimit
+from .scheduler import notify_scheduler
+from .serializers import ScheduledDeploymentSerializer, ConcurrencyLimitSerializer
+
+class ScheduledDeploymentListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = ScheduledDeployment.objects.select_related('intent', 'scheduled_by')
+    serializer_class = ScheduledDeploymentSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status', 'intent', 'devices']
+    ordering_fields = ['priority', 'window_start', 'next_attempt_at', 'created_at']
+    
+    def perform_create(self, serializer):
+        serializer.save(scheduled_by=self.request.user)
+        notify_scheduler()
+
+class ScheduledDeploymentDetailView(SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
+    queryset = ScheduledDeployment.objects.select_related('intent', 'scheduled_by')
+    serializer_class = ScheduledDeploymentSerializer
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # The scheduler may have claimed or retried the deployment since it was read. Reload the
+        # fields it owns under the row lock so saving neither overwrites them nor skips the check.
+        deployment = serializer.instance
+        locked = ScheduledDeployment.objects.select_for_update().get(pk=deployment.pk)
+        for field in ScheduledDeploymentSerializer.Meta.read_only_fields:
+            setattr(deployment, field, getattr(locked, field))
+        serializer.check_editable(serializer.validated_data)
+        serializer.save()
+        notify_scheduler()
+
+@api_view(['POST'])
+def cancel_deployment(request, pk):
+    updated = ScheduledDeployment.objects.filter(pk=pk, status='queued').update(
+        status='cancelled', finished_at=timezone.now(), updated_at=timezone.now(),
+    )
+    if updated:
+        return Response({'status': 'cancelled'})
+    if ScheduledDeployment.objects.filter(pk=pk).exists():
+        return Response({'error': 'Only queued deployments can be cancelled'}, status=status.HTTP_409_CONFLICT)
+    return Response({'error': 'Deployment not found'}, status=status.HTTP_404_NOT_FOUND)
+
+class ConcurrencyLimitListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = ConcurrencyLimit.objects.all()
+    serializer_class = ConcurrencyLimitSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['location', 'device_type']
+
+class ConcurrencyLimitDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = ConcurrencyLimit.objects.all()
+    serializer_class = ConcurrencyLimitSerializer
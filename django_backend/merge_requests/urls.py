@@ -5,4 +5,5 @@ from . import views
 urlpatterns = [
     path('', views.MergeRequestListCreateView.as_view(), name='merge-request-list'),
     path('<int:pk>/', views.MergeRequestDetailView.as_view(), name='merge-request-detail'),
+    path('bulk/<str:action>/', views.bulk_merge_request_action, name='bulk-merge-request-action'),
 ]
@@ -1,11 +1,24 @@
 
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.db import transaction
+from network_automation.fieldsets import SparseFieldsetMixin
+from network_automation.transitions import Transition, TransitionEvents, bulk_action_response
 from .models import MergeRequest
 from .serializers import MergeRequestSerializer
 
-class MergeRequestListCreateView(generics.ListCreateAPIView):
+MERGE_REQUEST_TRANSITIONS = {
+    'submit': Transition('review', ('draft',)),
+    'approve': Transition('approved', ('review',)),
+    'reject': Transition('rejected', ('draft', 'review', 'approved')),
+    'merge': Transition('merged', ('approved',)),
+}
+MERGE_REQUEST_EVENTS = TransitionEvents('merge_request', MergeRequestSerializer, ('intent',))
+
+class MergeRequestListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = MergeRequest.objects.all()
     serializer_class = MergeRequestSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -13,7 +26,21 @@ class MergeRequestListCreateView(generics.ListCreateAPIView):
     search_fields = ['title', 'description', 'change_number']
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        serializer.save()
 
-class MergeRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MergeRequestDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = MergeRequest.objects.all()
     serializer_class = MergeRequestSerializer
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+@api_view(['POST'])
+def bulk_merge_request_action(request, action):
+    if action not in MERGE_REQUEST_TRANSITIONS:
+        return Response({'error': f'Unknown action {action}'}, status=status.HTTP_404_NOT_FOUND)
+    return bulk_action_response(request, MergeRequest, MERGE_REQUEST_TRANSITIONS[action], MergeRequestListCreateView.filterset_fields, MERGE_REQUEST_EVENTS)
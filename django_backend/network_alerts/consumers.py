@@ -1,10 +1,15 @@
 
 import json
+import logging
+from channels.consumer import SyncConsumer
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from .correlation import get_engine
 from .models import NetworkAlert
 from .serializers import NetworkAlertSerializer
 
+logger = logging.getLogger(__name__)
+
 class AlertConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         await self.channel_layer.group_add('alerts', self.channel_name)
@@ -15,3 +20,29 @@ class AlertConsumer(AsyncWebsocketConsumer):
     
     async def alert_message(self, event):
         await self.send(text_data=json.dumps(event['message']))
+
+class IncidentConsumer(AsyncWebsocketConsumer):
+    async def connect(self):
+        await self.channel_layer.group_add('incidents', self.channel_name)
+        await self.accept()
+    
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard('incidents', self.channel_name)
+    
+    async def incident_message(self, event):
+        await self.send(text_data=json.dumps(event['message']))
+
+class CorrelationConsumer(SyncConsumer):
+    """Correlates alerts for every web and telemetry process, so there is one window to keep consistent."""
+    
+    def alert_correlate(self, event):
+        alert = NetworkAlert.objects.select_related('device').filter(pk=event['alert_id'], incident__isnull=True).first()
+        if alert is None:
+            return
+        try:
+            get_engine().correlate(alert)
+        except Exception:
+            logger.exception('Correlating alert %s failed', alert.pk)
+    
+    def incident_forget(self, event):
+        get_engine().forget(event['incident_id'])
@@ -0,0 +1,195 @@
+
+import threading
+from collections import deque
+from dataclasses import dataclass, replace
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from network_devices.topology import loaded_topology
+from .models import NetworkAlert, Incident
+from .serializers import IncidentSerializer
+
+SEVERITY_RANK = {severity: rank for rank, (severity, _) in enumerate(NetworkAlert.SEVERITY_CHOICES)}
+# Served by a single `manage.py runworker alert-correlation` process, which owns the window.
+CORRELATION_CHANNEL = 'alert-correlation'
+
+
+@dataclass
+class IncidentState:
+    incident_id: int
+    severity: str
+    root_alert_id: int
+    root_device_id: int
+    root_rank: int
+    last_seen: object
+
+
+def correlation_keys(alert):
+    keys = []
+    if alert.device_id:
+        keys.append(('device', alert.device_id))
+        if alert.device.location:
+            keys.append(('location', alert.device.location))
+    if alert.intent_id:
+        keys.append(('intent', alert.intent_id))
+    return keys
+
+
+class CorrelationEngine:
+    """Groups alerts into incidents over a sliding time window held in memory.
+
+    Each alert is keyed by its device, the device's location and its intent. A key seen
+    within the window maps straight to its incident, and expired keys are evicted from the
+    front of a time-ordered queue, so correlating an alert is O(1) amortised.
+
+    The window is per process, so only one process may correlate: with
+    INCIDENT_CORRELATION_WORKER every alert is sent to CORRELATION_CHANNEL instead.
+    """
+
+    def __init__(self, window_seconds=None):
+        self.window = timedelta(seconds=window_seconds or settings.INCIDENT_WINDOW_SECONDS)
+        self.lock = threading.Lock()
+        self.keys = {}
+        self.incidents = {}
+        self.expiry = deque()
+
+    def warm_up(self):
+        """Rebuild the window from recent alerts so a restart does not split ongoing incidents."""
+        since = timezone.now() - self.window
+        alerts = (
+            NetworkAlert.objects.filter(created_at__gte=since, incident__status='open')
+            .select_related('device', 'incident', 'incident__root_alert')
+            .order_by('created_at')
+        )
+        with self.lock:
+            for alert in alerts:
+                incident = alert.incident
+                if incident.pk not in self.incidents:
+                    root = incident.root_alert or alert
+                    self.incidents[incident.pk] = IncidentState(
+                        incident.pk, incident.severity, root.pk, root.device_id,
+                        SEVERITY_RANK[root.severity], incident.last_seen,
+                    )
+                self._touch(correlation_keys(alert), incident.pk, alert.created_at)
+
+    def _touch(self, keys, incident_id, seen):
+        for key in keys:
+            self.keys[key] = (incident_id, seen)
+            self.expiry.append((seen, key))
+
+    def _evict(self, now):
+        horizon = now - self.window
+        while self.expiry and self.expiry[0][0] < horizon:
+            seen, key = self.expiry.popleft()
+            entry = self.keys.get(key)
+            if entry and entry[1] == seen:
+                del self.keys[key]
+                state = self.incidents.get(entry[0])
+                if state and state.last_seen < horizon:
+                    del self.incidents[entry[0]]
+
+    def forget(self, incident_id):
+        """Stop correlating into an incident, e.g. once it has been resolved."""
+        with self.lock:
+            self.incidents.pop(incident_id, None)
+
+    def _is_better_root(self, alert, state):
+        topology = loaded_topology()
+        if topology and alert.device_id and state.root_device_id:
+            # An alert on the device the current root sits behind explains the root's alert too.
+            if topology.dominates(alert.device_id, state.root_device_id):
+                return True
+            if topology.dominates(state.root_device_id, alert.device_id):
+                return False
+        return SEVERITY_RANK[alert.severity] > state.root_rank
+
+    def correlate(self, alert):
+        """Attach a committed alert to an incident.
+
+        The window only changes once the incident rows are written, so a failed write cannot
+        leave keys pointing at an incident that does not exist.
+        """
+        keys = correlation_keys(alert)
+        seen = alert.created_at
+        with self.lock:
+            self._evict(seen)
+            matches = [self.keys[key] for key in keys if key in self.keys]
+            current = self.incidents.get(max(matches, key=lambda entry: entry[1])[0]) if matches else None
+
+            with transaction.atomic():
+                state = None
+                if current is not None:
+                    state = replace(current, last_seen=seen)
+                    updates = {'alert_count': F('alert_count') + 1, 'last_seen': seen, 'updated_at': timezone.now()}
+                    if SEVERITY_RANK[alert.severity] > SEVERITY_RANK[state.severity]:
+                        state.severity = updates['severity'] = alert.severity
+                    if self._is_better_root(alert, state):
+                        state.root_alert_id, state.root_device_id, state.root_rank = alert.pk, alert.device_id, SEVERITY_RANK[alert.severity]
+                        updates['root_alert'] = alert
+                        updates['title'] = alert.title
+                    if not Incident.objects.filter(pk=state.incident_id, status='open').update(**updates):
+                        # Resolved (or deleted) since this window last saw it; the alert starts a new incident.
+                        self.incidents.pop(current.incident_id, None)
+                        state = None
+                if state is None:
+                    incident = Incident.objects.create(
+                        title=alert.title,
+                        severity=alert.severity,
+                        location=alert.device.location if alert.device_id else None,
+                        root_alert=alert,
+                        alert_count=1,
+                        first_seen=seen,
+                        last_seen=seen,
+                    )
+                    state = IncidentState(incident.pk, alert.severity, alert.pk, alert.device_id, SEVERITY_RANK[alert.severity], seen)
+                NetworkAlert.objects.filter(pk=alert.pk).update(incident_id=state.incident_id)
+
+            self.incidents[state.incident_id] = state
+            self._touch(keys, state.incident_id, seen)
+
+        alert.incident_id = state.incident_id
+        transaction.on_commit(lambda: broadcast_incident(state.incident_id))
+        return state.incident_id
+
+def broadcast_incident(incident_id):
+    incident = Incident.objects.select_related('root_alert').filter(pk=incident_id).first()
+    channel_layer = get_channel_layer()
+    if incident and channel_layer:
+        async_to_sync(channel_layer.group_send)('incidents', {
+            'type': 'incident_message',
+            'message': IncidentSerializer(incident).data,
+        })
+
+
+def submit_alert(alert):
+    """Correlate a committed alert in the correlation worker, or inline when there is none."""
+    if settings.INCIDENT_CORRELATION_WORKER:
+        async_to_sync(get_channel_layer().send)(CORRELATION_CHANNEL, {'type': 'alert.correlate', 'alert_id': alert.pk})
+    else:
+        get_engine().correlate(alert)
+
+
+def forget_incident(incident_id):
+    if settings.INCIDENT_CORRELATION_WORKER:
+        async_to_sync(get_channel_layer().send)(CORRELATION_CHANNEL, {'type': 'incident.forget', 'incident_id': incident_id})
+    else:
+        get_engine().forget(incident_id)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = CorrelationEngine()
+            _engine.warm_up()
+        return _engine
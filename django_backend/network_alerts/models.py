@@ -24,6 +24,7 @@ class NetworkAlert(models.Model):
     description = models.TextField(blank=True)
     device = models.ForeignKey('network_devices.NetworkDevice', on_delete=models.CASCADE, null=True, blank=True)
     intent = models.ForeignKey('network_intents.NetworkIntent', on_delete=models.CASCADE, null=True, blank=True)
+    incident = models.ForeignKey('Incident', on_delete=models.SET_NULL, null=True, blank=True, related_name='alerts')
     metric_value = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
     threshold_value = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
@@ -38,3 +39,30 @@ class NetworkAlert(models.Model):
     
     def __str__(self):
         return f"{self.title} - {self.severity}"
+
+class Incident(models.Model):
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('resolved', 'Resolved'),
+    ]
+    
+    title = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='open')
+    severity = models.CharField(max_length=20, choices=NetworkAlert.SEVERITY_CHOICES)
+    location = models.CharField(max_length=255, null=True, blank=True)
+    root_alert = models.ForeignKey(NetworkAlert, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    alert_count = models.PositiveIntegerField(default=0)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-last_seen']
+        indexes = [
+            models.Index(fields=['status', '-last_seen']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} ({self.alert_count} alerts)"
@@ -4,4 +4,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r'ws/alerts/$', consumers.AlertConsumer.as_asgi()),
+    re_path(r'ws/incidents/$', consumers.IncidentConsumer.as_asgi()),
 ]
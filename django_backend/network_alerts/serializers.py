@@ -1,6 +1,6 @@
 
 from rest_framework import serializers
-from .models import NetworkAlert
+from .models import NetworkAlert, Incident
 
 class NetworkAlertSerializer(serializers.ModelSerializer):
     device_name = serializers.CharField(source='device.name', read_only=True)
@@ -10,3 +10,14 @@ class NetworkAlertSerializer(serializers.ModelSerializer):
     class Meta:
         model = NetworkAlert
         fields = '__all__'
+        read_only_fields = ['incident']
+
+class IncidentSerializer(serializers.ModelSerializer):
+    root_alert_title = serializers.CharField(source='root_alert.title', read_only=True)
+    
+    class Meta:
+        model = Incident
+        fields = '__all__'
+
+class IncidentDetailSerializer(IncidentSerializer):
+    alerts = NetworkAlertSerializer(many=True, read_only=True)
@@ -0,0 +1,13 @@
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from .correlation import submit_alert
+from .models import NetworkAlert
+
+def correlate_alert(sender, instance, created, **kwargs):
+    # Correlating after commit keeps the in-memory window from referencing rolled-back rows.
+    if created:
+        transaction.on_commit(lambda: submit_alert(instance), robust=True)
+
+def connect():
+    post_save.connect(correlate_alert, sender=NetworkAlert, dispatch_uid='correlate_alert')
@@ -0,0 +1,107 @@
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import IntegrityError, transaction
+from django.test import TransactionTestCase, override_settings
+from network_devices.models import NetworkDevice, DeviceLink
+from network_devices import topology
+from . import correlation
+from .consumers import CorrelationConsumer
+from .models import NetworkAlert, Incident
+
+@override_settings(INCIDENT_CORRELATION_WORKER=False)
+class CorrelationTests(TransactionTestCase):
+    def setUp(self):
+        correlation._engine = None
+        topology._index = None
+        self.addCleanup(setattr, correlation, '_engine', None)
+        self.addCleanup(setattr, topology, '_index', None)
+        self.core = NetworkDevice.objects.create(name='core1', type='core', location='dc1')
+        self.dist = NetworkDevice.objects.create(name='dist1', type='distribution', location='dc1')
+        self.access = NetworkDevice.objects.create(name='access1', type='access', location='dc1')
+        DeviceLink.objects.create(a_device=self.core, a_interface='eth1', b_device=self.dist, b_interface='eth1')
+        DeviceLink.objects.create(a_device=self.dist, a_interface='eth2', b_device=self.access, b_interface='eth1')
+    
+    def create_alert(self, device, severity='high'):
+        return NetworkAlert.objects.create(alert_type='link', severity=severity, title=f'{device.name} down', device=device)
+    
+    def test_rolled_back_alert_does_not_poison_window(self):
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                self.create_alert(self.access)
+                raise IntegrityError('rolled back')
+        self.assertFalse(Incident.objects.exists())
+        
+        alert = self.create_alert(self.access)
+        alert.refresh_from_db()
+        self.assertIsNotNone(alert.incident_id)
+        self.assertEqual(Incident.objects.get().root_alert_id, alert.pk)
+    
+    def test_alert_after_resolve_opens_new_incident(self):
+        first = self.create_alert(self.access)
+        first.refresh_from_db()
+        # Resolved elsewhere (e.g. another process), so this engine was never told to forget it.
+        Incident.objects.filter(pk=first.incident_id).update(status='resolved')
+        
+        second = self.create_alert(self.access)
+        second.refresh_from_db()
+        self.assertNotEqual(second.incident_id, first.incident_id)
+        self.assertEqual(Incident.objects.get(pk=first.incident_id).alert_count, 1)
+        self.assertEqual(Incident.objects.get(pk=second.incident_id).root_alert_id, second.pk)
+        
+        third = self.create_alert(self.access)
+        third.refresh_from_db()
+        self.assertEqual(third.incident_id, second.incident_id)
+    
+    def test_upstream_alert_becomes_root(self):
+        topology.get_topology()
+        self.create_alert(self.access, severity='critical')
+        upstream = self.create_alert(self.dist, severity='low')
+        incident = Incident.objects.get()
+        self.assertEqual(incident.root_alert_id, upstream.pk)
+        self.assertEqual(incident.alert_count, 2)
+        self.assertEqual(incident.severity, 'critical')
+    
+    def test_dominates_builds_tree_on_demand(self):
+        index = topology.get_topology()
+        index.invalidate()
+        self.assertTrue(index.dominates(self.dist.pk, self.access.pk))
+        self.assertFalse(index.dominates(self.access.pk, self.dist.pk))
+
+@override_settings(INCIDENT_CORRELATION_WORKER=True, CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class CorrelationWorkerTests(TransactionTestCase):
+    def setUp(self):
+        correlation._engine = None
+        self.addCleanup(setattr, correlation, '_engine', None)
+        self.device = NetworkDevice.objects.create(name='access1', type='access', location='dc1')
+    
+    def receive(self):
+        return async_to_sync(get_channel_layer().receive)(correlation.CORRELATION_CHANNEL)
+    
+    def test_alerts_are_correlated_by_the_worker_only(self):
+        alerts = [NetworkAlert.objects.create(alert_type='link', severity='high', title='down', device=self.device) for _ in range(2)]
+        self.assertFalse(Incident.objects.exists())
+        
+        consumer = CorrelationConsumer()
+        for alert in alerts:
+            event = self.receive()
+            self.assertEqual(event, {'type': 'alert.correlate', 'alert_id': alert.pk})
+            consumer.alert_correlate(event)
+        # A redelivered message must not count the alert twice.
+        consumer.alert_correlate({'type': 'alert.correlate', 'alert_id': alerts[0].pk})
+        
+        incident = Incident.objects.get()
+        self.assertEqual(incident.alert_count, 2)
+        self.assertEqual(set(incident.alerts.values_list('pk', flat=True)), {alert.pk for alert in alerts})
+    
+    def test_resolving_an_incident_forgets_it_in_the_worker(self):
+        consumer = CorrelationConsumer()
+        NetworkAlert.objects.create(alert_type='link', severity='high', title='down', device=self.device)
+        consumer.alert_correlate(self.receive())
+        incident = Incident.objects.get()
+        
+        correlation.forget_incident(incident.pk)
+        event = self.receive()
+        self.assertEqual(event, {'type': 'incident.forget', 'incident_id': incident.pk})
+        consumer.incident_forget(event)
+        self.assertNotIn(incident.pk, correlation.get_engine().incidents)
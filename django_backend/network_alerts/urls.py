@@ -7,4 +7,8 @@ urlpatterns = [
     path('<int:pk>/', views.NetworkAlertDetailView.as_view(), name='alert-detail'),
     path('<int:pk>/acknowledge/', views.acknowledge_alert, name='acknowledge-alert'),
     path('<int:pk>/resolve/', views.resolve_alert, name='resolve-alert'),
+    path('bulk/<str:action>/', views.bulk_alert_action, name='bulk-alert-action'),
+    path('incidents/', views.IncidentListView.as_view(), name='incident-list'),
+    path('incidents/<int:pk>/', views.IncidentDetailView.as_view(), name='incident-detail'),
+    path('incidents/<int:pk>/resolve/', views.resolve_incident, name='resolve-incident'),
 ]
@@ -4,41 +4,70 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.db import transaction
 from django.utils import timezone
-from .models import NetworkAlert
-from .serializers import NetworkAlertSerializer
+from network_automation.fieldsets import SparseFieldsetMixin
+from network_automation.transitions import Transition, TransitionEvents, bulk_action_response, single_action_response
+from .correlation import forget_incident
+from .models import NetworkAlert, Incident
+from .serializers import NetworkAlertSerializer, IncidentSerializer, IncidentDetailSerializer
 
-class NetworkAlertListCreateView(generics.ListCreateAPIView):
+ALERT_TRANSITIONS = {
+    'acknowledge': Transition('acknowledged', ('active',), lambda user, now: {'acknowledged_by': user, 'acknowledged_at': now}),
+    'resolve': Transition('resolved', ('active', 'acknowledged'), lambda user, now: {'resolved_at': now}),
+}
+ALERT_EVENTS = TransitionEvents('alert', NetworkAlertSerializer, ('device', 'intent', 'acknowledged_by'))
+
+class NetworkAlertListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = NetworkAlert.objects.all()
     serializer_class = NetworkAlertSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['severity', 'status', 'alert_type', 'device']
     ordering_fields = ['created_at', 'severity']
     ordering = ['-created_at']
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        serializer.save()
 
-class NetworkAlertDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NetworkAlertDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = NetworkAlert.objects.all()
     serializer_class = NetworkAlertSerializer
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
 
 @api_view(['POST'])
 def acknowledge_alert(request, pk):
-    try:
-        alert = NetworkAlert.objects.get(pk=pk)
-        alert.status = 'acknowledged'
-        alert.acknowledged_by = request.user
-        alert.acknowledged_at = timezone.now()
-        alert.save()
-        return Response({'status': 'acknowledged'})
-    except NetworkAlert.DoesNotExist:
-        return Response({'error': 'Alert not found'}, status=status.HTTP_404_NOT_FOUND)
+    return single_action_response(NetworkAlert, pk, ALERT_TRANSITIONS['acknowledge'], request.user, 'Alert not found', ALERT_EVENTS)
 
 @api_view(['POST'])
 def resolve_alert(request, pk):
-    try:
-        alert = NetworkAlert.objects.get(pk=pk)
-        alert.status = 'resolved'
-        alert.resolved_at = timezone.now()
-        alert.save()
-        return Response({'status': 'resolved'})
-    except NetworkAlert.DoesNotExist:
-        return Response({'error': 'Alert not found'}, status=status.HTTP_404_NOT_FOUND)
+    return single_action_response(NetworkAlert, pk, ALERT_TRANSITIONS['resolve'], request.user, 'Alert not found', ALERT_EVENTS)
+
+@api_view(['POST'])
+def bulk_alert_action(request, action):
+    if action not in ALERT_TRANSITIONS:
+        return Response({'error': f'Unknown action {action}'}, status=status.HTTP_404_NOT_FOUND)
+    return bulk_action_response(request, NetworkAlert, ALERT_TRANSITIONS[action], NetworkAlertListCreateView.filterset_fields, ALERT_EVENTS)
+
+class IncidentListView(SparseFieldsetMixin, generics.ListAPIView):
+    queryset = Incident.objects.select_related('root_alert')
+    serializer_class = IncidentSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status', 'severity', 'location']
+    ordering_fields = ['last_seen', 'first_seen', 'alert_count']
+    ordering = ['-last_seen']
+
+class IncidentDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
+    queryset = Incident.objects.select_related('root_alert').prefetch_related('alerts__device', 'alerts__intent', 'alerts__acknowledged_by')
+    serializer_class = IncidentDetailSerializer
+
+@api_view(['POST'])
+def resolve_incident(request, pk):
+    updated = Incident.objects.filter(pk=pk).update(status='resolved', resolved_at=timezone.now())
+    if not updated:
+        return Response({'error': 'Incident not found'}, status=status.HTTP_404_NOT_FOUND)
+    forget_incident(pk)
+    return Response({'status': 'resolved'})
@@ -1,9 +1,12 @@
 
 import os
 from django.core.asgi import get_asgi_application
-from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.routing import ChannelNameRouter, ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 import network_alerts.routing
+from network_alerts.consumers import CorrelationConsumer
+from network_alerts.correlation import CORRELATION_CHANNEL
+import network_metrics.routing
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'network_automation.settings')
 
@@ -11,7 +14,11 @@ application = ProtocolTypeRouter({
     'http': get_asgi_application(),
     'websocket': AuthMiddlewareStack(
         URLRouter(
-            network_alerts.routing.websocket_urlpatterns
+            network_alerts.routing.websocket_urlpatterns +
+            network_metrics.routing.websocket_urlpatterns
         )
     ),
+    'channel': ChannelNameRouter({
+        CORRELATION_CHANNEL: CorrelationConsumer.as_asgi(),
+    }),
 })
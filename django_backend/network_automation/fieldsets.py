@@ -0,0 +1,76 @@
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def split_param(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def unused_columns(model, serializer_fields):
+    """Plain model columns none of ``serializer_fields`` read, or [] when that cannot be known.
+
+    Fields sourced from the whole object or from properties and methods may read any column,
+    so their presence disables deferral. Relations are never deferred, which keeps the result
+    compatible with any ``select_related`` the view applies.
+    """
+    needed = set()
+    for field in serializer_fields:
+        if not field.source_attrs:
+            return []
+        try:
+            needed.add(model._meta.get_field(field.source_attrs[0]).name)
+        except FieldDoesNotExist:
+            return []
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation and field.name not in needed
+    ]
+
+
+class SparseFieldsetMixin:
+    """Lets GET requests pick response fields with ``?fields=a,b`` or drop them with ``?exclude=c``.
+
+    The queryset defers the columns no remaining field reads, so large text columns are not
+    fetched for list pages that do not show them.
+    """
+
+    def get_sparse_fields(self):
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+        params = self.request.query_params
+        fields, exclude = split_param(params.get(FIELDS_PARAM)), split_param(params.get(EXCLUDE_PARAM))
+        if not fields and not exclude:
+            return None
+
+        if not hasattr(self, '_sparse_fields'):
+            available = self.get_serializer_class()(context=self.get_serializer_context()).fields
+            unknown = (fields | exclude) - set(available)
+            if unknown:
+                raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+            self._sparse_fields = {
+                name: field for name, field in available.items()
+                if (not fields or name in fields) and name not in exclude
+            }
+        return self._sparse_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is None:
+            return queryset
+        deferred = unused_columns(queryset.model, sparse_fields.values())
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in sparse_fields:
+                    target.fields.pop(name)
+        return serializer
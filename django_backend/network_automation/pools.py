@@ -0,0 +1,20 @@
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+
+class LazyProcessPool:
+    """A process pool sized by the ``workers_setting`` setting, started on first use."""
+
+    def __init__(self, workers_setting):
+        self.workers_setting = workers_setting
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def get(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=getattr(settings, self.workers_setting))
+            return self.executor
@@ -0,0 +1,187 @@
+
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'default'
+PIN_KEY_PREFIX = 'db_pin:'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Zero when the server is not a standby or has replayed everything it received; measuring
+# only the replay timestamp would report an idle primary as replica lag. A standby whose WAL
+# receiver is not streaming has also replayed everything it received, so it reports NULL
+# (treated as unbounded lag) instead. Reading the receiver status needs pg_monitor or
+# pg_read_all_stats; without it the status reads as NULL and the replica is never used.
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class RoutingState:
+    """Per request (or per ``replica_reads`` block) routing decision."""
+
+    def __init__(self, pinned=False, pin_key=None):
+        self.pinned = pinned
+        self.pin_key = pin_key
+        self.wrote = False
+        self.alias = None
+
+
+_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+def client_pin_key(request):
+    """Cache key for the client behind ``request``, from credentials it sends anyway (bearer token or session)."""
+    credential = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return PIN_KEY_PREFIX + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def client_pinned(pin_key):
+    try:
+        return cache.get(pin_key) is not None
+    except Exception:
+        logger.warning('Replica pin lookup failed; reading from the primary', exc_info=True)
+        return True
+
+
+def pin_client(pin_key):
+    try:
+        cache.set(pin_key, 1, settings.REPLICA_PIN_SECONDS)
+    except Exception:
+        logger.warning('Storing the replica pin failed; the next read may be stale', exc_info=True)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != PRIMARY]
+
+
+class ReplicaLagMonitor:
+    """Caches each replica's replication lag for REPLICA_LAG_CHECK_SECONDS so routing a read
+    costs at most one lag query per replica per interval."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = {}
+
+    def measure(self, alias):
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            return 0.0
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            lag = cursor.fetchone()[0]
+        return float('inf') if lag is None else float(lag)
+
+    def lag(self, alias):
+        now = time.monotonic()
+        with self.lock:
+            checked = self.checked.get(alias)
+            if checked and now - checked[0] < settings.REPLICA_LAG_CHECK_SECONDS:
+                return checked[1]
+            # Claim this interval so concurrent requests reuse the last value instead of all measuring.
+            self.checked[alias] = (now, checked[1] if checked else 0.0)
+        try:
+            lag = self.measure(alias)
+        except DatabaseError:
+            logger.warning('Replica %s is unreachable; routing reads to the primary', alias, exc_info=True)
+            lag = float('inf')
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.info('Replica %s is %.1fs behind; routing reads to the primary', alias, lag)
+        with self.lock:
+            self.checked[alias] = (now, lag)
+        return lag
+
+    def healthy(self):
+        return [alias for alias in replica_aliases() if self.lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS]
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+class ReplicaRouter:
+    """Sends reads to a replica within the lag limit when the current request allows it.
+
+    Writes, and every read after the first write in the same request, go to the primary.
+    Code running outside a request or ``replica_reads`` block (workers, management commands)
+    always uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.pinned:
+            return PRIMARY
+        if state.alias is None:
+            if state.pin_key and client_pinned(state.pin_key):
+                state.pinned = True
+                return PRIMARY
+            # One replica per request keeps counts and pages consistent with each other.
+            healthy = lag_monitor.healthy()
+            state.alias = random.choice(healthy) if healthy else PRIMARY
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in this block to replicas, e.g. for exports; writes still pin it to the primary.
+
+    Also usable as a decorator, which starts a fresh routing decision on every call.
+    """
+    token = _routing.set(RoutingState())
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+class ReplicaRoutingMiddleware:
+    """Lets safe requests read from replicas.
+
+    After a write the client, identified by its Authorization header or session cookie, is pinned
+    to the primary for REPLICA_PIN_SECONDS in the cache, so it reads its own writes despite
+    replication lag. The pin is only looked up when a request first reads.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pin_key = client_pin_key(request)
+        state = RoutingState(pinned=request.method not in SAFE_METHODS, pin_key=pin_key)
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if pin_key and (state.wrote or request.method not in SAFE_METHODS):
+            pin_client(pin_key)
+        return response
+
@@ -37,6 +37,9 @@ LOCAL_APPS = [
     'network_alerts',
     'activity_logs',
     'merge_requests',
+    'deployments',
+    'webhooks',
+    'compliance',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -44,6 +47,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'network_automation.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -84,6 +88,19 @@ DATABASES = {
     }
 }
 
+# Read replicas (host or host:port, comma separated) share the primary's credentials
+for index, replica in enumerate(filter(None, config('DB_REPLICA_HOSTS', default='').split(',')), 1):
+    replica_host, _, replica_port = replica.strip().partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'OPTIONS': {'connect_timeout': 3},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['network_automation.routers.ReplicaRouter']
+
 # ... keep existing code (AUTH_PASSWORD_VALIDATORS through USE_TZ)
 
 STATIC_URL = '/static/'
@@ -104,6 +121,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'network_automation.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
@@ -127,10 +148,20 @@ CHANNEL_LAYERS = {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
             'hosts': [(config('REDIS_HOST', default='127.0.0.1'), config('REDIS_PORT', default=6379, cast=int))],
+            # Alert storms queue up for the single correlation worker instead of being dropped.
+            'channel_capacities': {'alert-correlation': 10000},
         },
     },
 }
 
+# Cache (also holds read-after-write replica pins)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': f"redis://{config('REDIS_HOST', default='127.0.0.1')}:{config('REDIS_PORT', default=6379, cast=int)}/1",
+    },
+}
+
 # External Service URLs
 NETBOX_API_URL = config('NETBOX_API_URL', default='')
 NETBOX_API_TOKEN = config('NETBOX_API_TOKEN', default='')
@@ -138,3 +169,75 @@ OLLAMA_BASE_URL = config('OLLAMA_BASE_URL', default='http://localhost:11434')
 NSO_BASE_URL = config('NSO_BASE_URL', default='')
 NSO_USERNAME = config('NSO_USERNAME', default='')
 NSO_PASSWORD = config('NSO_PASSWORD', default='')
+
+# Metric archive: samples older than this are compacted into compressed chunks
+METRIC_ARCHIVE_AFTER_DAYS = config('METRIC_ARCHIVE_AFTER_DAYS', default=30, cast=int)
+
+# Deployment scheduler
+DEPLOYMENT_WORKERS = config('DEPLOYMENT_WORKERS', default=4, cast=int)
+DEPLOYMENT_DEFAULT_CONCURRENCY = config('DEPLOYMENT_DEFAULT_CONCURRENCY', default=2, cast=int)
+DEPLOYMENT_CANDIDATE_FACTOR = 10
+DEPLOYMENT_RETRY_BASE_SECONDS = config('DEPLOYMENT_RETRY_BASE_SECONDS', default=60, cast=int)
+DEPLOYMENT_RETRY_MAX_SECONDS = config('DEPLOYMENT_RETRY_MAX_SECONDS', default=3600, cast=int)
+DEPLOYMENT_LEASE_SECONDS = config('DEPLOYMENT_LEASE_SECONDS', default=900, cast=int)
+DEPLOYMENT_TIMEOUT_SECONDS = config('DEPLOYMENT_TIMEOUT_SECONDS', default=60, cast=int)
+DEPLOYMENT_IDLE_SECONDS = 60
+
+# Webhook delivery
+WEBHOOK_CONCURRENCY = config('WEBHOOK_CONCURRENCY', default=20, cast=int)
+WEBHOOK_MAX_CONNECTIONS = config('WEBHOOK_MAX_CONNECTIONS', default=100, cast=int)
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=50, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=8, cast=int)
+WEBHOOK_RETRY_BASE_SECONDS = config('WEBHOOK_RETRY_BASE_SECONDS', default=10, cast=int)
+WEBHOOK_RETRY_MAX_SECONDS = config('WEBHOOK_RETRY_MAX_SECONDS', default=3600, cast=int)
+WEBHOOK_TIMEOUT_SECONDS = config('WEBHOOK_TIMEOUT_SECONDS', default=10, cast=int)
+WEBHOOK_LEASE_SECONDS = 300
+WEBHOOK_POLL_SECONDS = 2
+
+# Device topology
+TOPOLOGY_ROOT_TYPES = config('TOPOLOGY_ROOT_TYPES', default='core,router').split(',')
+TOPOLOGY_REFRESH_SECONDS = config('TOPOLOGY_REFRESH_SECONDS', default=60, cast=int)
+TOPOLOGY_MAX_HOPS = 10
+
+# Alert correlation
+INCIDENT_WINDOW_SECONDS = config('INCIDENT_WINDOW_SECONDS', default=300, cast=int)
+# Correlate in one `manage.py runworker alert-correlation` process; disable only for single-process deployments.
+INCIDENT_CORRELATION_WORKER = config('INCIDENT_CORRELATION_WORKER', default=True, cast=bool)
+
+# Bulk lifecycle actions
+BULK_ACTION_MAX_ITEMS = config('BULK_ACTION_MAX_ITEMS', default=5000, cast=int)
+
+# Config template rendering
+RENDER_WORKERS = config('RENDER_WORKERS', default=4, cast=int)
+RENDER_CHUNK_SIZE = config('RENDER_CHUNK_SIZE', default=250, cast=int)
+RENDER_PARALLEL_THRESHOLD = config('RENDER_PARALLEL_THRESHOLD', default=200, cast=int)
+
+# Telemetry listener
+TELEMETRY_BIND = config('TELEMETRY_BIND', default='0.0.0.0:5514').split(',')
+TELEMETRY_QUEUE_SIZE = config('TELEMETRY_QUEUE_SIZE', default=200000, cast=int)
+TELEMETRY_BATCH_SIZE = config('TELEMETRY_BATCH_SIZE', default=5000, cast=int)
+TELEMETRY_FLUSH_SECONDS = config('TELEMETRY_FLUSH_SECONDS', default=1.0, cast=float)
+TELEMETRY_SYSLOG_ALERT_SEVERITY = config('TELEMETRY_SYSLOG_ALERT_SEVERITY', default=3, cast=int)
+TELEMETRY_RECEIVE_BUFFER = 8 * 1024 * 1024
+TELEMETRY_DEVICE_REFRESH_SECONDS = 60
+TELEMETRY_STATS_SECONDS = 30
+
+# Read replica routing
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=5, cast=float)
+REPLICA_LAG_CHECK_SECONDS = config('REPLICA_LAG_CHECK_SECONDS', default=5, cast=int)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+# Live metric streaming
+METRIC_STREAM_FLUSH_SECONDS = config('METRIC_STREAM_FLUSH_SECONDS', default=1.0, cast=float)
+METRIC_STREAM_BACKFILL_SECONDS = config('METRIC_STREAM_BACKFILL_SECONDS', default=900, cast=int)
+METRIC_STREAM_MAX_BACKFILL_SECONDS = 86400
+METRIC_STREAM_BACKFILL_MAX_POINTS = 5000
+METRIC_STREAM_MAX_SUBSCRIPTIONS = config('METRIC_STREAM_MAX_SUBSCRIPTIONS', default=200, cast=int)
+METRIC_STREAM_MAX_PENDING = 5000
+
+# Compliance evaluation
+COMPLIANCE_WORKERS = config('COMPLIANCE_WORKERS', default=4, cast=int)
+COMPLIANCE_CHUNK_SIZE = config('COMPLIANCE_CHUNK_SIZE', default=250, cast=int)
+COMPLIANCE_PARALLEL_THRESHOLD = config('COMPLIANCE_PARALLEL_THRESHOLD', default=200, cast=int)
+# Per regex check and configuration; a check that runs longer is reported as not evaluable.
+COMPLIANCE_REGEX_TIMEOUT_SECONDS = config('COMPLIANCE_REGEX_TIMEOUT_SECONDS', default=1.0, cast=float)
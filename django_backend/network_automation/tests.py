@@ -0,0 +1,130 @@
+
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from merge_requests.models import MergeRequest
+from network_alerts.models import NetworkAlert
+from network_devices.models import NetworkDevice
+from network_intents.models import NetworkIntent
+from .transitions import TransitionError, select_targets
+from .routers import ReplicaRouter, ReplicaRoutingMiddleware, lag_monitor, replica_reads
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+@skipUnless('replica_1' in settings.DATABASES, 'set DB_REPLICA_HOSTS to configure a replica_1 alias')
+@override_settings(CACHES=LOCAL_CACHE, REPLICA_MAX_LAG_SECONDS=5)
+class ReplicaRoutingTests(TestCase):
+    # Test database setup needs every listed alias to exist, even for a skipped class.
+    databases = {'default', 'replica_1'} & set(settings.DATABASES)
+    
+    def setUp(self):
+        lag_monitor.checked.clear()
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+    
+    def route(self, method='get', token='Bearer first', during=None):
+        """Read routing decisions made before and after ``during`` inside one request."""
+        decisions = []
+        
+        def view(request):
+            decisions.append(self.router.db_for_read(NetworkDevice))
+            if during:
+                during()
+            decisions.append(self.router.db_for_read(NetworkDevice))
+            return HttpResponse()
+        
+        ReplicaRoutingMiddleware(view)(getattr(self.factory, method)('/api/devices/', HTTP_AUTHORIZATION=token))
+        return decisions
+    
+    def test_safe_reads_go_to_replica(self):
+        self.assertEqual(self.route(), ['replica_1', 'replica_1'])
+        self.assertEqual(self.router.db_for_read(NetworkDevice), 'default')
+    
+    def test_get_request_queries_replica(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model()(username='ops', email='ops@example.com'))
+        with CaptureQueriesContext(connections['replica_1']) as replica, CaptureQueriesContext(connections['default']) as primary:
+            response = client.get('/api/devices/', HTTP_AUTHORIZATION='Bearer first')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica.captured_queries)
+        self.assertFalse(primary.captured_queries)
+    
+    def test_write_pins_rest_of_request(self):
+        self.assertEqual(self.route(during=lambda: self.router.db_for_write(NetworkDevice)), ['replica_1', 'default'])
+    
+    def test_write_pins_same_client_for_following_requests(self):
+        self.route(method='post')
+        self.assertEqual(self.route(), ['default', 'default'])
+        self.assertEqual(self.route(token='Bearer second'), ['replica_1', 'replica_1'])
+    
+    def test_pin_expires(self):
+        self.route(method='post')
+        cache.clear()
+        self.assertEqual(self.route(), ['replica_1', 'replica_1'])
+    
+    def test_lagging_replica_falls_back_to_primary(self):
+        with mock.patch.object(lag_monitor, 'measure', return_value=60.0):
+            self.assertEqual(self.route(), ['default', 'default'])
+    
+    def test_unreachable_replica_falls_back_to_primary(self):
+        with mock.patch.object(lag_monitor, 'measure', side_effect=DatabaseError('down')):
+            self.assertEqual(self.route(), ['default', 'default'])
+    
+    def test_replica_reads_decorator_rechecks_lag_per_call(self):
+        read = replica_reads()(lambda: self.router.db_for_read(NetworkDevice))
+        self.assertEqual(read(), 'replica_1')
+        lag_monitor.checked.clear()
+        with mock.patch.object(lag_monitor, 'measure', return_value=60.0):
+            self.assertEqual(read(), 'default')
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='ops', email='ops@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.active = NetworkAlert.objects.create(alert_type='cpu', severity='high', title='CPU high')
+        self.resolved = NetworkAlert.objects.create(alert_type='cpu', severity='low', title='CPU ok', status='resolved')
+    
+    def test_bulk_action_reports_per_id_results(self):
+        response = self.client.post('/api/alerts/bulk/resolve/', {'ids': [self.active.pk, self.resolved.pk, 999999]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(response.json()['results'], [
+            {'id': self.active.pk, 'success': True, 'status': 'resolved'},
+            {'id': self.resolved.pk, 'success': False, 'error': "Cannot change status from 'resolved' to 'resolved'"},
+            {'id': 999999, 'success': False, 'error': 'Not found'},
+        ])
+        self.active.refresh_from_db()
+        self.assertEqual(self.active.status, 'resolved')
+        self.assertIsNotNone(self.active.resolved_at)
+    
+    def test_bulk_action_by_filter(self):
+        response = self.client.post('/api/alerts/bulk/acknowledge/', {'filter': {'severity': 'high'}}, format='json')
+        self.assertEqual(response.json()['updated'], 1)
+        self.active.refresh_from_db()
+        self.assertEqual((self.active.status, self.active.acknowledged_by), ('acknowledged', self.user))
+    
+    def test_single_action_conflict_and_not_found(self):
+        response = self.client.post(f'/api/alerts/{self.resolved.pk}/resolve/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.post('/api/alerts/999999/resolve/').status_code, 404)
+    
+    def test_blank_filters_are_rejected(self):
+        for body in ({'severity': ''}, {'severity': '  ', 'status': None}, {'status': 'active', 'severity': ''}, {'device': []}):
+            response = self.client.post('/api/alerts/bulk/resolve/', {'filter': body}, format='json')
+            self.assertEqual(response.status_code, 400, body)
+        self.assertEqual(self.client.post('/api/alerts/bulk/resolve/', {'filter': {}}, format='json').status_code, 400)
+        self.assertEqual(NetworkAlert.objects.filter(status='resolved').count(), 1)
+    
+    def test_blank_filters_are_rejected_for_every_model(self):
+        for model, fields in ((NetworkIntent, ['status']), (MergeRequest, ['status', 'author_email'])):
+            with self.assertRaises(TransitionError):
+                select_targets(model, filters={name: '' for name in fields}, filterset_fields=fields)
+        self.assertEqual(self.client.post('/api/merge-requests/bulk/submit/', {'filter': {'author_email': ''}}, format='json').status_code, 400)
@@ -0,0 +1,114 @@
+
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_filters.filterset import filterset_factory
+from rest_framework import status
+from rest_framework.response import Response
+
+from webhooks.outbox import record_events
+
+
+class TransitionError(Exception):
+    pass
+
+
+@dataclass
+class Transition:
+    target: str
+    sources: tuple
+    # Extra columns to set, given the acting user and the transition time
+    fields: Callable = field(default=lambda user, now: {})
+
+
+@dataclass
+class TransitionEvents:
+    """How to describe changed rows in webhook events: event type prefix, serializer and its joins."""
+    prefix: str
+    serializer_class: type
+    related: tuple = ()
+
+
+def is_blank(value):
+    return value is None or value == [] or (isinstance(value, str) and not value.strip())
+
+
+def select_targets(model, ids=None, filters=None, filterset_fields=()):
+    """Resolve a bulk request body (``ids`` list or ``filter`` mapping) into a queryset."""
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+            raise TransitionError('ids must be a list of integers')
+        if len(ids) > settings.BULK_ACTION_MAX_ITEMS:
+            raise TransitionError(f'At most {settings.BULK_ACTION_MAX_ITEMS} ids can be processed at once')
+        return model.objects.filter(pk__in=ids)
+
+    if not isinstance(filters, dict) or not filters:
+        raise TransitionError('Provide either ids or a non-empty filter')
+    unknown = set(filters) - set(filterset_fields)
+    if unknown:
+        raise TransitionError(f"Unsupported filter fields: {', '.join(sorted(unknown))}")
+    # django-filter skips blank values, so {"severity": ""} would otherwise select every row.
+    blank = [name for name, value in filters.items() if is_blank(value)]
+    if blank:
+        raise TransitionError(f"Filter values must not be blank: {', '.join(sorted(blank))}")
+    filterset = filterset_factory(model, fields=list(filterset_fields))(filters, queryset=model.objects.all())
+    if not filterset.is_valid():
+        raise TransitionError(filterset.errors)
+    return filterset.qs
+
+
+def apply_transition(queryset, transition, user, ids=None, events=None):
+    """Apply ``transition`` to every row in ``queryset`` with one locked SELECT and one UPDATE.
+
+    Returns per-id results; rows whose current status is not an allowed source are reported
+    and left untouched. Status-change webhook events are written in the same transaction.
+    """
+    model = queryset.model
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = dict(queryset.select_for_update().order_by('pk').values_list('pk', 'status')[:settings.BULK_ACTION_MAX_ITEMS])
+        eligible = [pk for pk, row_status in rows.items() if row_status in transition.sources]
+
+        if eligible:
+            updates = {'status': transition.target, **transition.fields(user, now)}
+            if any(model_field.name == 'updated_at' for model_field in model._meta.fields):
+                updates['updated_at'] = now
+            model.objects.filter(pk__in=eligible).update(**updates)
+
+            if events:
+                updated = model.objects.select_related(*events.related).filter(pk__in=eligible)
+                record_events(f'{events.prefix}.status_changed', (
+                    (events.serializer_class(instance).data, rows[instance.pk]) for instance in updated
+                ))
+
+    results = []
+    for pk in (ids if ids is not None else rows):
+        if pk not in rows:
+            results.append({'id': pk, 'success': False, 'error': 'Not found'})
+        elif rows[pk] not in transition.sources:
+            results.append({'id': pk, 'success': False, 'error': f"Cannot change status from '{rows[pk]}' to '{transition.target}'"})
+        else:
+            results.append({'id': pk, 'success': True, 'status': transition.target})
+    return {'updated': len(eligible), 'results': results}
+
+
+def bulk_action_response(request, model, transition, filterset_fields, events=None):
+    ids = request.data.get('ids')
+    try:
+        queryset = select_targets(model, ids, request.data.get('filter'), filterset_fields)
+    except TransitionError as exc:
+        return Response({'error': exc.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(apply_transition(queryset, transition, request.user, ids, events))
+
+
+def single_action_response(model, pk, transition, user, not_found, events=None):
+    result = apply_transition(model.objects.filter(pk=pk), transition, user, [pk], events)['results'][0]
+    if result['success']:
+        return Response({'status': transition.target})
+    if result['error'] == 'Not found':
+        return Response({'error': not_found}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'error': result['error']}, status=status.HTTP_409_CONFLICT)
@@ -11,4 +11,7 @@ urlpatterns = [
     path('api/alerts/', include('network_alerts.urls')),
     path('api/activity/', include('activity_logs.urls')),
     path('api/merge-requests/', include('merge_requests.urls')),
+    path('api/deployments/', include('deployments.urls')),
+    path('api/webhooks/', include('webhooks.urls')),
+    path('api/compliance/', include('compliance.urls')),
 ]
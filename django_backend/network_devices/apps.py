@@ -0,0 +1,10 @@
+
+from django.apps import AppConfig
+
+class NetworkDevicesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'network_devices'
+    
+    def ready(self):
+        from . import signals
+        signals.connect()
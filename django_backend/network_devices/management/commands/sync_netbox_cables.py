@@ -0,0 +1,72 @@
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from network_devices.models import NetworkDevice, DeviceLink
+
+def cable_end(cable, side):
+    """Return (netbox device id, interface name) for one end of an interface-to-interface cable."""
+    terminations = cable.get(f'{side}_terminations')
+    if terminations is not None:
+        if len(terminations) != 1 or terminations[0].get('object_type') != 'dcim.interface':
+            return None
+        termination = terminations[0]['object']
+    else:
+        # NetBox < 3.3 exposes a single termination per side
+        if cable.get(f'termination_{side}_type') != 'dcim.interface':
+            return None
+        termination = cable.get(f'termination_{side}')
+    if not termination or not termination.get('device'):
+        return None
+    return termination['device']['id'], termination['name']
+
+class Command(BaseCommand):
+    help = 'Create or update DeviceLink rows from NetBox interface cables'
+    
+    def handle(self, *args, **options):
+        if not settings.NETBOX_API_URL:
+            raise CommandError('NETBOX_API_URL is not configured')
+        
+        devices = dict(NetworkDevice.objects.filter(netbox_id__isnull=False).values_list('netbox_id', 'pk'))
+        session = requests.Session()
+        session.headers.update({'Authorization': f'Token {settings.NETBOX_API_TOKEN}', 'Accept': 'application/json'})
+        
+        url = f"{settings.NETBOX_API_URL.rstrip('/')}/dcim/cables/?limit=1000"
+        seen, synced, conflicts = set(), 0, []
+        while url:
+            response = session.get(url, timeout=30)
+            response.raise_for_status()
+            page = response.json()
+            with transaction.atomic():
+                for cable in page['results']:
+                    a_end, b_end = cable_end(cable, 'a'), cable_end(cable, 'b')
+                    if not a_end or not b_end or a_end[0] not in devices or b_end[0] not in devices:
+                        continue
+                    # Kept either way, so a conflicting cable does not delete the link synced for it earlier.
+                    seen.add(cable['id'])
+                    try:
+                        with transaction.atomic():
+                            DeviceLink.objects.update_or_create(
+                                netbox_cable_id=cable['id'],
+                                defaults={
+                                    'a_device_id': devices[a_end[0]], 'a_interface': a_end[1],
+                                    'b_device_id': devices[b_end[0]], 'b_interface': b_end[1],
+                                },
+                            )
+                    except IntegrityError:
+                        # Another link (typically one entered by hand) already uses one of these interfaces.
+                        conflicts.append(cable)
+                        continue
+                    synced += 1
+            url = page.get('next')
+        
+        removed, _ = DeviceLink.objects.filter(netbox_cable_id__isnull=False).exclude(netbox_cable_id__in=seen).delete()
+        for cable in conflicts:
+            self.stderr.write(self.style.WARNING(
+                f"Skipped cable {cable['id']} ({cable.get('label') or 'unlabelled'}): "
+                'one of its interfaces is already linked by another DeviceLink'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Synced {synced} cables from NetBox, skipped {len(conflicts)} conflicting, removed {removed} stale links'
+        ))
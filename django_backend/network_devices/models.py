@@ -54,3 +54,22 @@ class PerformanceThreshold(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+class DeviceLink(models.Model):
+    a_device = models.ForeignKey(NetworkDevice, on_delete=models.CASCADE, related_name='links_a')
+    a_interface = models.CharField(max_length=100)
+    b_device = models.ForeignKey(NetworkDevice, on_delete=models.CASCADE, related_name='links_b')
+    b_interface = models.CharField(max_length=100)
+    netbox_cable_id = models.IntegerField(null=True, blank=True, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['a_device', 'a_interface']
+        unique_together = [['a_device', 'a_interface'], ['b_device', 'b_interface']]
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.a_device}:{self.a_interface} <-> {self.b_device}:{self.b_interface}"
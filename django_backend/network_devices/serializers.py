@@ -1,6 +1,6 @@
 
 from rest_framework import serializers
-from .models import NetworkDevice, PerformanceThreshold
+from .models import NetworkDevice, PerformanceThreshold, DeviceLink
 
 class NetworkDeviceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,3 +11,18 @@ class PerformanceThresholdSerializer(serializers.ModelSerializer):
     class Meta:
         model = PerformanceThreshold
         fields = '__all__'
+
+class DeviceLinkSerializer(serializers.ModelSerializer):
+    a_device_name = serializers.CharField(source='a_device.name', read_only=True)
+    b_device_name = serializers.CharField(source='b_device.name', read_only=True)
+    
+    class Meta:
+        model = DeviceLink
+        fields = '__all__'
+    
+    def validate(self, attrs):
+        a_device = attrs.get('a_device', getattr(self.instance, 'a_device', None))
+        b_device = attrs.get('b_device', getattr(self.instance, 'b_device', None))
+        if a_device == b_device:
+            raise serializers.ValidationError('A link must connect two different devices')
+        return attrs
@@ -0,0 +1,31 @@
+
+from django.db.models.signals import post_save, post_delete
+from .models import NetworkDevice, DeviceLink
+from .topology import loaded_topology
+
+def device_saved(sender, instance, **kwargs):
+    if loaded_topology():
+        loaded_topology().add_device(instance.pk, instance.type)
+
+def device_deleted(sender, instance, **kwargs):
+    if loaded_topology():
+        loaded_topology().remove_device(instance.pk)
+
+def link_saved(sender, instance, created, **kwargs):
+    if not loaded_topology():
+        return
+    if created:
+        loaded_topology().add_link(instance.a_device_id, instance.b_device_id)
+    else:
+        # Endpoints may have moved; rebuild on the next query rather than diffing.
+        loaded_topology().invalidate()
+
+def link_deleted(sender, instance, **kwargs):
+    if loaded_topology():
+        loaded_topology().remove_link(instance.a_device_id, instance.b_device_id)
+
+def connect():
+    post_save.connect(device_saved, sender=NetworkDevice, dispatch_uid='topology_device_saved')
+    post_delete.connect(device_deleted, sender=NetworkDevice, dispatch_uid='topology_device_deleted')
+    post_save.connect(link_saved, sender=DeviceLink, dispatch_uid='topology_link_saved')
+    post_delete.connect(link_deleted, sender=DeviceLink, dispatch_uid='topology_link_deleted')
@@ -0,0 +1,92 @@
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from .models import NetworkDevice, DeviceLink
+from . import topology
+
+class TopologyTests(TestCase):
+    def setUp(self):
+        topology._index = None
+        self.addCleanup(setattr, topology, '_index', None)
+        self.devices = {}
+        for name, device_type in (('core1', 'core'), ('dist1', 'distribution'), ('dist2', 'distribution'),
+                                  ('access1', 'access'), ('access2', 'access'), ('access3', 'access'), ('lab1', 'access')):
+            self.devices[name] = NetworkDevice.objects.create(name=name, type=device_type).pk
+        # access1 is dual-homed; access3 hangs off access2, which only reaches dist1; lab1 is unlinked.
+        for a_device, b_device in (('core1', 'dist1'), ('core1', 'dist2'), ('dist1', 'access1'), ('dist2', 'access1'),
+                                   ('dist1', 'access2'), ('access2', 'access3')):
+            DeviceLink.objects.create(
+                a_device_id=self.devices[a_device], a_interface=f'to-{b_device}',
+                b_device_id=self.devices[b_device], b_interface=f'to-{a_device}',
+            )
+        self.index = topology.get_topology()
+    
+    def names(self, device_ids):
+        lookup = {pk: name for name, pk in self.devices.items()}
+        return sorted(lookup[pk] for pk in device_ids)
+    
+    def test_single_device_impact_is_its_dominated_subtree(self):
+        self.assertEqual(self.names(self.index.impact([self.devices['dist1']])), ['access2', 'access3'])
+        self.assertEqual(self.names(self.index.impact([self.devices['core1']])), ['access1', 'access2', 'access3', 'dist1', 'dist2'])
+        self.assertEqual(self.index.impact([self.devices['dist2']]), [])
+        self.assertEqual(self.index.impact([self.devices['access3']]), [])
+    
+    def test_multi_device_impact_includes_devices_losing_every_path(self):
+        impacted = self.index.impact([self.devices['dist1'], self.devices['dist2']])
+        self.assertEqual(self.names(impacted), ['access1', 'access2', 'access3'])
+    
+    def test_impact_reflects_new_links(self):
+        DeviceLink.objects.create(a_device_id=self.devices['dist2'], a_interface='to-access2', b_device_id=self.devices['access2'], b_interface='to-dist2')
+        self.assertEqual(topology.get_topology().impact([self.devices['dist1']]), [])
+    
+    def test_shortest_path(self):
+        path = self.index.shortest_path(self.devices['access3'], self.devices['core1'])
+        self.assertEqual([self.names([pk])[0] for pk in path], ['access3', 'access2', 'dist1', 'core1'])
+        self.assertEqual(self.index.shortest_path(self.devices['dist2'], self.devices['dist2']), [self.devices['dist2']])
+        self.assertIsNone(self.index.shortest_path(self.devices['access3'], self.devices['lab1']))
+        self.assertIsNone(self.index.shortest_path(self.devices['access3'], 0))
+    
+    def test_neighborhood(self):
+        self.assertEqual(
+            self.index.neighborhood(self.devices['dist1'], 1),
+            {self.devices[name]: hops for name, hops in (('dist1', 0), ('core1', 1), ('access1', 1), ('access2', 1))},
+        )
+        self.assertEqual(self.index.neighborhood(self.devices['dist1'], 2)[self.devices['dist2']], 2)
+        self.assertEqual(self.index.neighborhood(self.devices['lab1'], 3), {self.devices['lab1']: 0})
+
+def cable(cable_id, a_device, a_interface, b_device, b_interface):
+    end = lambda device, interface: [{'object_type': 'dcim.interface', 'object': {'device': {'id': device}, 'name': interface}}]
+    return {'id': cable_id, 'label': f'cable-{cable_id}', 'a_terminations': end(a_device, a_interface), 'b_terminations': end(b_device, b_interface)}
+
+@override_settings(NETBOX_API_URL='http://netbox.test/api', NETBOX_API_TOKEN='token')
+class SyncNetboxCablesTests(TestCase):
+    def setUp(self):
+        self.sw1 = NetworkDevice.objects.create(name='sw1', type='access', netbox_id=101)
+        self.sw2 = NetworkDevice.objects.create(name='sw2', type='access', netbox_id=102)
+        self.sw3 = NetworkDevice.objects.create(name='sw3', type='access', netbox_id=103)
+    
+    def sync(self, cables):
+        response = mock.Mock(**{'json.return_value': {'results': cables, 'next': None}})
+        stdout, stderr = StringIO(), StringIO()
+        with mock.patch('requests.Session.get', return_value=response):
+            call_command('sync_netbox_cables', stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+    
+    def test_cable_conflicting_with_a_manual_link_is_skipped_and_reported(self):
+        DeviceLink.objects.create(a_device=self.sw1, a_interface='eth1', b_device=self.sw3, b_interface='eth9')
+        out, err = self.sync([cable(1, 101, 'eth1', 102, 'eth1'), cable(2, 102, 'eth2', 103, 'eth2')])
+        
+        self.assertIn('Synced 1 cables from NetBox, skipped 1 conflicting', out)
+        self.assertIn('Skipped cable 1 (cable-1)', err)
+        self.assertEqual(DeviceLink.objects.get(netbox_cable_id=2).a_device, self.sw2)
+        self.assertFalse(DeviceLink.objects.filter(netbox_cable_id=1).exists())
+        self.assertTrue(DeviceLink.objects.filter(netbox_cable_id=None, a_device=self.sw1, a_interface='eth1').exists())
+    
+    def test_conflicting_cable_keeps_its_previously_synced_link(self):
+        self.sync([cable(1, 101, 'eth1', 102, 'eth1')])
+        DeviceLink.objects.create(a_device=self.sw1, a_interface='eth5', b_device=self.sw3, b_interface='eth9')
+        out, _ = self.sync([cable(1, 101, 'eth5', 102, 'eth1')])
+        
+        self.assertIn('skipped 1 conflicting, removed 0 stale links', out)
+        self.assertEqual(DeviceLink.objects.get(netbox_cable_id=1).a_interface, 'eth1')
@@ -0,0 +1,265 @@
+
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import NetworkDevice, DeviceLink
+
+ROOT = -1
+
+
+class TopologyIndex:
+    """In-memory adjacency index over DeviceLink with a dominator tree for impact queries.
+
+    A device's impact set is every device whose every path to an uplink root (core/router
+    by default) passes through it, i.e. its subtree in the dominator tree rooted at a
+    virtual node joined to all roots. The tree is recomputed lazily after link changes,
+    after which single-device impact lookups are a slice of a pre-ordered list.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.adjacency = {}
+        self.device_types = {}
+        self.version = None
+        self.loaded_at = 0
+        self._order = None
+        self._span = None
+
+    def load(self):
+        adjacency = {pk: set() for pk in NetworkDevice.objects.values_list('pk', flat=True)}
+        device_types = dict(NetworkDevice.objects.values_list('pk', 'type'))
+        for a_device, b_device in DeviceLink.objects.values_list('a_device_id', 'b_device_id'):
+            adjacency[a_device].add(b_device)
+            adjacency[b_device].add(a_device)
+        with self.lock:
+            self.adjacency = adjacency
+            self.device_types = device_types
+            self.version = self.current_version()
+            self.loaded_at = time.monotonic()
+            self._order = None
+
+    @staticmethod
+    def current_version():
+        links = DeviceLink.objects.aggregate(count=Count('pk'), changed=Max('updated_at'))
+        return links['count'], links['changed'], NetworkDevice.objects.count()
+
+    def refresh(self):
+        stale = time.monotonic() - self.loaded_at > settings.TOPOLOGY_REFRESH_SECONDS
+        if stale or self.version != self.current_version():
+            self.load()
+
+    def invalidate(self):
+        with self.lock:
+            self.version = None
+
+    def add_device(self, pk, device_type):
+        with self.lock:
+            if pk in self.adjacency and self.device_types.get(pk) == device_type:
+                return
+            self.adjacency.setdefault(pk, set())
+            self.device_types[pk] = device_type
+            self._order = None
+            self.version = self.current_version()
+
+    def remove_device(self, pk):
+        with self.lock:
+            for neighbor in self.adjacency.pop(pk, set()):
+                self.adjacency[neighbor].discard(pk)
+            self.device_types.pop(pk, None)
+            self._order = None
+            self.version = self.current_version()
+
+    def add_link(self, a_device, b_device):
+        with self.lock:
+            self.adjacency.setdefault(a_device, set()).add(b_device)
+            self.adjacency.setdefault(b_device, set()).add(a_device)
+            self._order = None
+            self.version = self.current_version()
+
+    def remove_link(self, a_device, b_device):
+        with self.lock:
+            # Parallel links keep the adjacency alive; only drop it when the last one is gone.
+            if not DeviceLink.objects.filter(a_device_id=a_device, b_device_id=b_device).exists() and \
+                    not DeviceLink.objects.filter(a_device_id=b_device, b_device_id=a_device).exists():
+                self.adjacency.get(a_device, set()).discard(b_device)
+                self.adjacency.get(b_device, set()).discard(a_device)
+                self._order = None
+            self.version = self.current_version()
+
+    def roots(self):
+        return [pk for pk, device_type in self.device_types.items() if device_type in settings.TOPOLOGY_ROOT_TYPES]
+
+    def _build_dominators(self):
+        # Cooper, Harvey & Kennedy, "A Simple, Fast Dominance Algorithm".
+        roots = self.roots()
+        root_set = set(roots)
+        neighbors = lambda node: roots if node == ROOT else self.adjacency[node]
+        predecessors = lambda node: self.adjacency[node] | ({ROOT} if node in root_set else set())
+
+        postorder, seen, stack = [], {ROOT}, [(ROOT, iter(neighbors(ROOT)))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append((child, iter(neighbors(child))))
+                    break
+            else:
+                stack.pop()
+                postorder.append(node)
+        rank = {node: index for index, node in enumerate(postorder)}
+        reverse_postorder = postorder[::-1][1:]
+
+        idom = {ROOT: ROOT}
+
+        def intersect(a, b):
+            while a != b:
+                while rank[a] < rank[b]:
+                    a = idom[a]
+                while rank[b] < rank[a]:
+                    b = idom[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for node in reverse_postorder:
+                new_idom = None
+                for pred in predecessors(node):
+                    if pred in idom:
+                        new_idom = pred if new_idom is None else intersect(pred, new_idom)
+                if idom.get(node) != new_idom:
+                    idom[node] = new_idom
+                    changed = True
+
+        children = {}
+        for node, parent in idom.items():
+            if node != ROOT:
+                children.setdefault(parent, []).append(node)
+
+        order, span, stack = [], {}, [(ROOT, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                span[node] = (span[node], len(order))
+                continue
+            span[node] = len(order)
+            order.append(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in children.get(node, ()))
+        self._order, self._span = order, span
+
+    def impact(self, device_ids):
+        """Devices that lose every path to an uplink root if ``device_ids`` fail."""
+        with self.lock:
+            device_ids = [pk for pk in device_ids if pk in self.adjacency]
+            if len(device_ids) == 1:
+                if self._order is None:
+                    self._build_dominators()
+                if device_ids[0] not in self._span:
+                    return []
+                start, end = self._span[device_ids[0]]
+                return self._order[start + 1:end]
+
+            failed = set(device_ids)
+            before = self._reachable(self.roots(), set())
+            after = self._reachable([pk for pk in self.roots() if pk not in failed], failed)
+            return [pk for pk in before if pk not in after and pk not in failed]
+
+    def dominates(self, upstream, downstream):
+        """O(1) check that ``downstream`` loses its uplink when ``upstream`` fails, once the tree is built."""
+        with self.lock:
+            if self._order is None:
+                self._build_dominators()
+            span = self._span
+            if upstream not in span or downstream not in span or upstream == downstream:
+                return False
+            return span[upstream][0] < span[downstream][0] < span[upstream][1]
+
+    def _reachable(self, sources, excluded):
+        seen = set(sources)
+        queue = deque(sources)
+        while queue:
+            for neighbor in self.adjacency[queue.popleft()]:
+                if neighbor not in seen and neighbor not in excluded:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        return seen
+
+    def shortest_path(self, source, target):
+        """Bidirectional BFS; returns the device ids along the path or None."""
+        with self.lock:
+            if source not in self.adjacency or target not in self.adjacency:
+                return None
+            from_source, from_target = {source: None}, {target: None}
+            source_frontier, target_frontier = [source], [target]
+            meeting = source if source == target else None
+            while meeting is None and source_frontier and target_frontier:
+                if len(source_frontier) <= len(target_frontier):
+                    source_frontier, meeting = self._expand(source_frontier, from_source, from_target)
+                else:
+                    target_frontier, meeting = self._expand(target_frontier, from_target, from_source)
+            if meeting is None:
+                return None
+            return self._walk(from_source, meeting)[::-1] + self._walk(from_target, from_target[meeting])
+
+    def _expand(self, frontier, own, other):
+        next_frontier = []
+        for node in frontier:
+            for neighbor in self.adjacency[node]:
+                if neighbor in own:
+                    continue
+                own[neighbor] = node
+                if neighbor in other:
+                    return next_frontier, neighbor
+                next_frontier.append(neighbor)
+        return next_frontier, None
+
+    @staticmethod
+    def _walk(parents, node):
+        path = []
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        return path
+
+    def neighborhood(self, device_id, hops):
+        """Devices within ``hops`` links of ``device_id`` mapped to their distance."""
+        with self.lock:
+            if device_id not in self.adjacency:
+                return {}
+            distances = {device_id: 0}
+            frontier = [device_id]
+            for distance in range(1, hops + 1):
+                next_frontier = []
+                for node in frontier:
+                    for neighbor in self.adjacency[node]:
+                        if neighbor not in distances:
+                            distances[neighbor] = distance
+                            next_frontier.append(neighbor)
+                frontier = next_frontier
+            return distances
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_topology():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TopologyIndex()
+            _index.load()
+        else:
+            _index.refresh()
+        return _index
+
+
+def loaded_topology():
+    """The index if this process has built one; signal handlers only patch an existing index."""
+    return _index
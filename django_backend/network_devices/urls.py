@@ -7,4 +7,10 @@ urlpatterns = [
     path('<int:pk>/', views.NetworkDeviceDetailView.as_view(), name='device-detail'),
     path('thresholds/', views.PerformanceThresholdListCreateView.as_view(), name='threshold-list'),
     path('thresholds/<int:pk>/', views.PerformanceThresholdDetailView.as_view(), name='threshold-detail'),
+    path('links/', views.DeviceLinkListCreateView.as_view(), name='link-list'),
+    path('links/<int:pk>/', views.DeviceLinkDetailView.as_view(), name='link-detail'),
+    path('topology/impact/', views.topology_impact, name='topology-impact'),
+    path('topology/path/', views.topology_path, name='topology-path'),
+    path('<int:pk>/impact/', views.topology_impact, name='device-impact'),
+    path('<int:pk>/neighbors/', views.topology_neighbors, name='device-neighbors'),
 ]
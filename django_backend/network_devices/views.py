@@ -1,10 +1,15 @@
 
-from rest_framework import generics, filters
+from rest_framework import generics, filters, status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import NetworkDevice, PerformanceThreshold
-from .serializers import NetworkDeviceSerializer, PerformanceThresholdSerializer
+from network_automation.fieldsets import SparseFieldsetMixin
+from .models import NetworkDevice, PerformanceThreshold, DeviceLink
+from .serializers import NetworkDeviceSerializer, PerformanceThresholdSerializer, DeviceLinkSerializer
+from .topology import get_topology
 
-class NetworkDeviceListCreateView(generics.ListCreateAPIView):
+class NetworkDeviceListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = NetworkDevice.objects.all()
     serializer_class = NetworkDeviceSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -12,16 +17,70 @@ class NetworkDeviceListCreateView(generics.ListCreateAPIView):
     search_fields = ['name', 'ip_address', 'location', 'model']
     ordering_fields = ['name', 'created_at', 'last_updated']
 
-class NetworkDeviceDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NetworkDeviceDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = NetworkDevice.objects.all()
     serializer_class = NetworkDeviceSerializer
 
-class PerformanceThresholdListCreateView(generics.ListCreateAPIView):
+class PerformanceThresholdListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = PerformanceThreshold.objects.all()
     serializer_class = PerformanceThresholdSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['device', 'metric_type', 'enabled']
 
-class PerformanceThresholdDetailView(generics.RetrieveUpdateDestroyAPIView):
+class PerformanceThresholdDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = PerformanceThreshold.objects.all()
     serializer_class = PerformanceThresholdSerializer
+
+class DeviceLinkListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = DeviceLink.objects.select_related('a_device', 'b_device')
+    serializer_class = DeviceLinkSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['a_device', 'b_device', 'netbox_cable_id']
+
+class DeviceLinkDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = DeviceLink.objects.select_related('a_device', 'b_device')
+    serializer_class = DeviceLinkSerializer
+
+def device_summaries(device_ids, **extra):
+    devices = NetworkDevice.objects.in_bulk(device_ids)
+    return [
+        {'id': pk, 'name': devices[pk].name, 'type': devices[pk].type, 'location': devices[pk].location,
+         **{key: values[pk] for key, values in extra.items()}}
+        for pk in device_ids if pk in devices
+    ]
+
+def parse_ids(value):
+    try:
+        return [int(item) for item in value.split(',') if item]
+    except ValueError:
+        return None
+
+@api_view(['GET'])
+def topology_impact(request, pk=None):
+    device_ids = [pk] if pk is not None else parse_ids(request.query_params.get('devices', ''))
+    if not device_ids:
+        return Response({'error': 'devices must be a comma separated list of ids'}, status=status.HTTP_400_BAD_REQUEST)
+    impacted = get_topology().impact(device_ids)
+    return Response({'devices': device_ids, 'count': len(impacted), 'impacted': device_summaries(impacted)})
+
+@api_view(['GET'])
+def topology_path(request):
+    ids = parse_ids(f"{request.query_params.get('source', '')},{request.query_params.get('target', '')}")
+    if not ids or len(ids) != 2:
+        return Response({'error': 'source and target are required'}, status=status.HTTP_400_BAD_REQUEST)
+    path = get_topology().shortest_path(*ids)
+    if path is None:
+        return Response({'error': 'No path between devices'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'hops': len(path) - 1, 'path': device_summaries(path)})
+
+@api_view(['GET'])
+def topology_neighbors(request, pk):
+    try:
+        hops = min(int(request.query_params.get('hops', 1)), settings.TOPOLOGY_MAX_HOPS)
+    except ValueError:
+        return Response({'error': 'hops must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    distances = get_topology().neighborhood(pk, hops)
+    if not distances:
+        return Response({'error': 'Device not found'}, status=status.HTTP_404_NOT_FOUND)
+    neighbors = sorted((node for node in distances if node != pk), key=distances.get)
+    return Response({'device': pk, 'hops': hops, 'neighbors': device_summaries(neighbors, distance=distances)})
@@ -28,6 +28,7 @@ class NetworkIntent(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     natural_language_input = models.TextField(null=True, blank=True)
     configuration = models.TextField(null=True, blank=True)
+    variables = models.JSONField(default=dict, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='created_intents')
     approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='approved_intents')
     deployed_at = models.DateTimeField(null=True, blank=True)
@@ -56,3 +57,38 @@ class ConfigurationSnapshot(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['device', '-created_at']),
+        ]
+
+class ConfigTemplate(models.Model):
+    """Immutable, versioned config template per intent type and vendor (blank vendor is the fallback)."""
+    intent_type = models.CharField(max_length=50, choices=NetworkIntent.INTENT_TYPES)
+    vendor = models.CharField(max_length=255, blank=True, default='')
+    version = models.PositiveIntegerField()
+    body = models.TextField()
+    is_active = models.BooleanField(default=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='config_templates')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['intent_type', 'vendor', '-version']
+        unique_together = ['intent_type', 'vendor', 'version']
+    
+    def __str__(self):
+        return f"{self.intent_type}/{self.vendor or 'default'} v{self.version}"
+
+class RenderedConfiguration(models.Model):
+    intent = models.ForeignKey(NetworkIntent, on_delete=models.CASCADE, related_name='rendered_configurations')
+    device = models.ForeignKey('network_devices.NetworkDevice', on_delete=models.CASCADE, related_name='rendered_configurations')
+    template = models.ForeignKey(ConfigTemplate, on_delete=models.CASCADE, related_name='rendered_configurations')
+    variables_hash = models.CharField(max_length=64)
+    output = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['device']
+        unique_together = ['intent', 'device']
+        indexes = [
+            models.Index(fields=['template', 'variables_hash']),
+        ]
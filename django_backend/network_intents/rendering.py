@@ -0,0 +1,132 @@
+
+import hashlib
+import json
+import logging
+
+import requests
+from django.conf import settings
+from django.db import transaction
+
+from network_automation.pools import LazyProcessPool
+from .models import ConfigTemplate, RenderedConfiguration
+from .template_engine import render_batch
+
+logger = logging.getLogger(__name__)
+
+DEVICE_FIELDS = ['id', 'name', 'type', 'status', 'ip_address', 'location', 'model', 'vendor', 'netbox_id', 'nso_device_name']
+NETBOX_BATCH_SIZE = 100
+
+render_pool = LazyProcessPool('RENDER_WORKERS')
+
+
+def variables_hash(variables):
+    return hashlib.sha256(json.dumps(variables, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def resolve_templates(intent_type):
+    """Latest active template version per vendor for an intent type; '' is the vendor fallback."""
+    templates = {}
+    for template in ConfigTemplate.objects.filter(intent_type=intent_type, is_active=True).order_by('vendor', '-version'):
+        templates.setdefault(template.vendor.lower(), template)
+    return templates
+
+
+def fetch_netbox_devices(netbox_ids):
+    if not settings.NETBOX_API_URL or not netbox_ids:
+        return {}
+
+    session = requests.Session()
+    session.headers.update({'Authorization': f'Token {settings.NETBOX_API_TOKEN}', 'Accept': 'application/json'})
+    url = f"{settings.NETBOX_API_URL.rstrip('/')}/dcim/devices/"
+    devices = {}
+    netbox_ids = sorted(netbox_ids)
+    for offset in range(0, len(netbox_ids), NETBOX_BATCH_SIZE):
+        batch = netbox_ids[offset:offset + NETBOX_BATCH_SIZE]
+        try:
+            response = session.get(url, params={'id': batch, 'limit': len(batch)}, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException:
+            logger.exception('Fetching NetBox devices failed; rendering without NetBox data')
+            return {}
+        devices.update((device['id'], device) for device in response.json()['results'])
+    return devices
+
+
+def build_variables(intent, device, netbox_device):
+    return {
+        'intent': {
+            'id': intent.pk,
+            'title': intent.title,
+            'intent_type': intent.intent_type,
+            **intent.variables,
+        },
+        'device': {field: getattr(device, field) for field in DEVICE_FIELDS},
+        'netbox': netbox_device or {},
+    }
+
+
+def render_intent(intent, devices):
+    """Render ``intent`` for every device and store the outputs.
+
+    Outputs are reused from any earlier render with the same template version and variables
+    hash, and the remainder is rendered in-process or across the process pool by size.
+    """
+    templates = resolve_templates(intent.intent_type)
+    netbox_devices = fetch_netbox_devices({device.netbox_id for device in devices if device.netbox_id})
+
+    jobs, errors = {}, []
+    for device in devices:
+        template = templates.get((device.vendor or '').lower()) or templates.get('')
+        if template is None:
+            errors.append({'device': device.pk, 'error': f"No active template for {intent.intent_type} / {device.vendor or 'any vendor'}"})
+            continue
+        variables = build_variables(intent, device, netbox_devices.get(device.netbox_id))
+        jobs.setdefault(template, []).append((device, variables, variables_hash(variables)))
+
+    rendered, cached_count = [], 0
+    pending = []
+    for template, items in jobs.items():
+        cached = dict(
+            RenderedConfiguration.objects.filter(template=template, variables_hash__in={item[2] for item in items})
+            .order_by()
+            .values_list('variables_hash', 'output')
+        )
+        missing = []
+        for device, variables, digest in items:
+            if digest in cached:
+                rendered.append(RenderedConfiguration(intent=intent, device=device, template=template, variables_hash=digest, output=cached[digest]))
+                cached_count += 1
+            else:
+                missing.append((device, variables, digest))
+        chunk_size = settings.RENDER_CHUNK_SIZE
+        pending.extend((template, missing[offset:offset + chunk_size]) for offset in range(0, len(missing), chunk_size))
+
+    total = sum(len(chunk) for _, chunk in pending)
+    if total >= settings.RENDER_PARALLEL_THRESHOLD:
+        pool = render_pool.get()
+        futures = [
+            pool.submit(render_batch, template.pk, template.body, [variables for _, variables, _ in chunk])
+            for template, chunk in pending
+        ]
+        outputs = [future.result() for future in futures]
+    else:
+        outputs = [render_batch(template.pk, template.body, [variables for _, variables, _ in chunk]) for template, chunk in pending]
+
+    for (template, chunk), results in zip(pending, outputs):
+        for (device, _, digest), (output, error) in zip(chunk, results):
+            if error:
+                errors.append({'device': device.pk, 'error': error})
+            else:
+                rendered.append(RenderedConfiguration(intent=intent, device=device, template=template, variables_hash=digest, output=output))
+
+    with transaction.atomic():
+        # A device that no longer renders must not keep serving its previous output.
+        RenderedConfiguration.objects.filter(intent=intent, device_id__in=[error['device'] for error in errors]).delete()
+        RenderedConfiguration.objects.bulk_create(
+            rendered,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['intent', 'device'],
+            update_fields=['template', 'variables_hash', 'output'],
+        )
+    return {'rendered': len(rendered) - cached_count, 'cached': cached_count, 'errors': errors}
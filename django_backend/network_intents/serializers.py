@@ -1,6 +1,7 @@
 
+from django.db.models import Max
 from rest_framework import serializers
-from .models import NetworkIntent, ConfigurationSnapshot
+from .models import NetworkIntent, ConfigurationSnapshot, ConfigTemplate, RenderedConfiguration
 
 class NetworkIntentSerializer(serializers.ModelSerializer):
     created_by_email = serializers.EmailField(source='created_by.email', read_only=True)
@@ -17,3 +18,34 @@ class ConfigurationSnapshotSerializer(serializers.ModelSerializer):
     class Meta:
         model = ConfigurationSnapshot
         fields = '__all__'
+
+class ConfigTemplateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ConfigTemplate
+        fields = '__all__'
+        read_only_fields = ['version', 'created_by']
+        extra_kwargs = {'body': {'trim_whitespace': False}}
+    
+    def validate_body(self, value):
+        from jinja2 import TemplateSyntaxError
+        from .template_engine import ENVIRONMENT
+        try:
+            ENVIRONMENT.parse(value)
+        except TemplateSyntaxError as exc:
+            raise serializers.ValidationError(f'Line {exc.lineno}: {exc.message}')
+        return value
+    
+    def create(self, validated_data):
+        latest = ConfigTemplate.objects.filter(
+            intent_type=validated_data['intent_type'], vendor=validated_data.get('vendor', ''),
+        ).aggregate(latest=Max('version'))['latest']
+        validated_data['version'] = (latest or 0) + 1
+        return super().create(validated_data)
+
+class RenderedConfigurationSerializer(serializers.ModelSerializer):
+    device_name = serializers.CharField(source='device.name', read_only=True)
+    template_version = serializers.IntegerField(source='template.version', read_only=True)
+    
+    class Meta:
+        model = RenderedConfiguration
+        fields = '__all__'
@@ -0,0 +1,28 @@
+
+# Kept free of Django imports so process-pool workers can import it cheaply under any start method.
+from functools import lru_cache
+
+from jinja2 import StrictUndefined
+from jinja2.sandbox import ImmutableSandboxedEnvironment
+
+# Template bodies are user supplied; the sandbox refuses access to private attributes and mutating calls.
+ENVIRONMENT = ImmutableSandboxedEnvironment(undefined=StrictUndefined, trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+
+
+@lru_cache(maxsize=256)
+def compile_template(template_id, body):
+    """Compile each template version once per process; versions are immutable so the id is a safe key."""
+    return ENVIRONMENT.from_string(body)
+
+
+def render_batch(template_id, body, variable_sets):
+    """Render one template against many variable sets, returning (output, error) pairs."""
+    template = compile_template(template_id, body)
+    results = []
+    for variables in variable_sets:
+        try:
+            results.append((template.render(variables), None))
+        except Exception as exc:
+            # Expressions can raise anything (ZeroDivisionError, TypeError on bad data); only this device fails.
+            results.append((None, f'{exc.__class__.__name__}: {exc}'))
+    return results
@@ -0,0 +1,39 @@
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from .serializers import ConfigTemplateSerializer
+from .template_engine import render_batch
+
+class TemplateSandboxTests(SimpleTestCase):
+    def test_renders_plain_template(self):
+        self.assertEqual(render_batch(1, 'hostname {{ name }}', [{'name': 'sw1'}]), [('hostname sw1', None)])
+    
+    def test_globals_access_fails_to_render(self):
+        body = '{{ cycler.__init__.__globals__.os.getpid() }}'
+        [(output, error)] = render_batch(2, body, [{}])
+        self.assertIsNone(output)
+        self.assertIn('SecurityError', error)
+    
+    def test_subclasses_access_fails_to_render(self):
+        body = "{{ ''.__class__.__mro__[1].__subclasses__() }}"
+        [(output, error)] = render_batch(3, body, [{}])
+        self.assertIsNone(output)
+        self.assertIn('SecurityError', error)
+    
+    def test_mutating_calls_fail_to_render(self):
+        [(output, error)] = render_batch(4, '{% set items = [] %}{{ items.append(1) }}', [{}])
+        self.assertIsNone(output)
+        self.assertIn('SecurityError', error)
+    
+    def test_runtime_errors_fail_only_their_variable_set(self):
+        results = render_batch(5, 'mtu {{ 9000 // device.mtu + 1 }}', [{'device': {'mtu': 1500}}, {'device': {'mtu': 0}}, {'device': {'mtu': 'jumbo'}}])
+        self.assertEqual(results[0], ('mtu 7', None))
+        self.assertIsNone(results[1][0])
+        self.assertIn('ZeroDivisionError', results[1][1])
+        self.assertIsNone(results[2][0])
+        self.assertIn('TypeError', results[2][1])
+    
+    def test_serializer_rejects_syntax_errors(self):
+        serializer = ConfigTemplateSerializer()
+        with self.assertRaises(ValidationError):
+            serializer.validate_body('{% if %}')
@@ -6,5 +6,10 @@ urlpatterns = [
     path('', views.NetworkIntentListCreateView.as_view(), name='intent-list'),
     path('<int:pk>/', views.NetworkIntentDetailView.as_view(), name='intent-detail'),
     path('<int:pk>/approve/', views.approve_intent, name='approve-intent'),
+    path('bulk/<str:action>/', views.bulk_intent_action, name='bulk-intent-action'),
+    path('<int:pk>/render/', views.render_intent_configuration, name='render-intent'),
+    path('<int:pk>/rendered/', views.RenderedConfigurationListView.as_view(), name='rendered-configuration-list'),
+    path('templates/', views.ConfigTemplateListCreateView.as_view(), name='config-template-list'),
+    path('templates/<int:pk>/', views.ConfigTemplateDetailView.as_view(), name='config-template-detail'),
     path('snapshots/', views.ConfigurationSnapshotListView.as_view(), name='snapshot-list'),
 ]
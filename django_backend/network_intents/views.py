@@ -4,10 +4,21 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from .models import NetworkIntent, ConfigurationSnapshot
-from .serializers import NetworkIntentSerializer, ConfigurationSnapshotSerializer
+from django.db import transaction
+from network_automation.fieldsets import SparseFieldsetMixin
+from network_automation.transitions import Transition, TransitionEvents, TransitionError, bulk_action_response, single_action_response, select_targets
+from network_devices.models import NetworkDevice
+from network_devices.views import NetworkDeviceListCreateView
+from .models import NetworkIntent, ConfigurationSnapshot, ConfigTemplate, RenderedConfiguration
+from .serializers import NetworkIntentSerializer, ConfigurationSnapshotSerializer, ConfigTemplateSerializer, RenderedConfigurationSerializer
+from .rendering import render_intent
 
-class NetworkIntentListCreateView(generics.ListCreateAPIView):
+INTENT_TRANSITIONS = {
+    'approve': Transition('approved', ('draft', 'pending'), lambda user, now: {'approved_by': user}),
+}
+INTENT_EVENTS = TransitionEvents('intent', NetworkIntentSerializer, ('created_by', 'approved_by'))
+
+class NetworkIntentListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = NetworkIntent.objects.all()
     serializer_class = NetworkIntentSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -15,26 +26,76 @@ class NetworkIntentListCreateView(generics.ListCreateAPIView):
     search_fields = ['title', 'description', 'natural_language_input']
     ordering_fields = ['created_at', 'updated_at', 'title']
     
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class NetworkIntentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NetworkIntentDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = NetworkIntent.objects.all()
     serializer_class = NetworkIntentSerializer
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
 
 @api_view(['POST'])
 def approve_intent(request, pk):
+    return single_action_response(NetworkIntent, pk, INTENT_TRANSITIONS['approve'], request.user, 'Intent not found', INTENT_EVENTS)
+
+@api_view(['POST'])
+def bulk_intent_action(request, action):
+    if action not in INTENT_TRANSITIONS:
+        return Response({'error': f'Unknown action {action}'}, status=status.HTTP_404_NOT_FOUND)
+    return bulk_action_response(request, NetworkIntent, INTENT_TRANSITIONS[action], NetworkIntentListCreateView.filterset_fields, INTENT_EVENTS)
+
+class ConfigurationSnapshotListView(SparseFieldsetMixin, generics.ListAPIView):
+    queryset = ConfigurationSnapshot.objects.all()
+    serializer_class = ConfigurationSnapshotSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['device', 'intent', 'snapshot_type']
+
+class ConfigTemplateListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = ConfigTemplate.objects.all()
+    serializer_class = ConfigTemplateSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['intent_type', 'vendor', 'is_active']
+    ordering_fields = ['created_at', 'version']
+    
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+class ConfigTemplateDetailView(SparseFieldsetMixin, generics.RetrieveDestroyAPIView):
+    # Versions are immutable so rendered outputs stay reproducible; publish a new version instead.
+    queryset = ConfigTemplate.objects.all()
+    serializer_class = ConfigTemplateSerializer
+    
+    def patch(self, request, *args, **kwargs):
+        template = self.get_object()
+        is_active = request.data.get('is_active')
+        if set(request.data) != {'is_active'} or not isinstance(is_active, bool):
+            return Response({'error': 'Only is_active can be changed; publish a new version instead'}, status=status.HTTP_400_BAD_REQUEST)
+        template.is_active = is_active
+        template.save(update_fields=['is_active'])
+        return Response(self.get_serializer(template).data)
+
+@api_view(['POST'])
+def render_intent_configuration(request, pk):
     try:
         intent = NetworkIntent.objects.get(pk=pk)
-        intent.status = 'approved'
-        intent.approved_by = request.user
-        intent.save()
-        return Response({'status': 'approved'})
     except NetworkIntent.DoesNotExist:
         return Response({'error': 'Intent not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    try:
+        devices = select_targets(NetworkDevice, request.data.get('devices'), request.data.get('filter'), NetworkDeviceListCreateView.filterset_fields)
+    except TransitionError as exc:
+        return Response({'error': exc.args[0]}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(render_intent(intent, list(devices)))
 
-class ConfigurationSnapshotListView(generics.ListAPIView):
-    queryset = ConfigurationSnapshot.objects.all()
-    serializer_class = ConfigurationSnapshotSerializer
+class RenderedConfigurationListView(SparseFieldsetMixin, generics.ListAPIView):
+    serializer_class = RenderedConfigurationSerializer
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['device', 'intent', 'snapshot_type']
+    filterset_fields = ['device', 'template']
+    
+    def get_queryset(self):
+        return RenderedConfiguration.objects.filter(intent_id=self.kwargs['pk']).select_related('device', 'template')
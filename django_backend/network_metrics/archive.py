@@ -0,0 +1,207 @@
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from .compression import encode, decode
+from .models import NetworkMetric, MetricChunk
+
+VALUE_PLACES = NetworkMetric._meta.get_field('value').decimal_places
+DELETE_BATCH_SIZE = 1000
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(dt):
+    if timezone.is_aware(dt):
+        dt = timezone.make_naive(dt, dt_timezone.utc)
+    delta = dt - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_micros(us):
+    dt = EPOCH + timedelta(microseconds=us)
+    return timezone.make_aware(dt, dt_timezone.utc) if settings.USE_TZ else dt
+
+
+def day_bucket(dt):
+    if timezone.is_aware(dt):
+        dt = dt.astimezone(dt_timezone.utc)
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def encode_points(points):
+    """Encode (datetime, Decimal) pairs; values are stored scaled to integers so XOR deltas stay small."""
+    return encode([
+        (to_micros(ts), None if value is None else float(value.scaleb(VALUE_PLACES)))
+        for ts, value in points
+    ])
+
+
+def decode_points(chunk):
+    return [
+        (from_micros(us), None if value is None else Decimal(int(value)).scaleb(-VALUE_PLACES))
+        for us, value in decode(chunk.data, chunk.count)
+    ]
+
+
+def decode_metrics(chunk):
+    """Expand a chunk into unsaved NetworkMetric instances so serializers can treat them like rows."""
+    return [
+        NetworkMetric(device=chunk.device, metric_type=chunk.metric_type, unit=chunk.unit, value=value, timestamp=ts)
+        for ts, value in decode_points(chunk)
+    ]
+
+
+def compact_series(device_id, metric_type, unit, cutoff):
+    rows = NetworkMetric.objects.filter(
+        device_id=device_id, metric_type=metric_type, unit=unit, timestamp__lt=cutoff,
+    ).order_by('timestamp').values_list('id', 'timestamp', 'value')
+
+    with transaction.atomic():
+        rows = list(rows)
+        if not rows:
+            return 0
+
+        existing = {
+            chunk.bucket: chunk
+            for chunk in MetricChunk.objects.select_for_update().filter(
+                device_id=device_id, metric_type=metric_type, unit=unit,
+                bucket__gte=day_bucket(rows[0][1]), bucket__lte=day_bucket(rows[-1][1]),
+            )
+        }
+
+        new_chunks = []
+        for bucket, group in groupby(rows, key=lambda row: day_bucket(row[1])):
+            points = [(ts, value) for _, ts, value in group]
+            chunk = existing.get(bucket)
+            if chunk:
+                points = sorted(decode_points(chunk) + points, key=lambda point: point[0])
+            else:
+                chunk = MetricChunk(device_id=device_id, metric_type=metric_type, unit=unit, bucket=bucket)
+            chunk.start_time = points[0][0]
+            chunk.end_time = points[-1][0]
+            chunk.count = len(points)
+            chunk.data = encode_points(points)
+            if chunk.pk:
+                chunk.save()
+            else:
+                new_chunks.append(chunk)
+        MetricChunk.objects.bulk_create(new_chunks)
+
+        ids = [row[0] for row in rows]
+        for offset in range(0, len(ids), DELETE_BATCH_SIZE):
+            NetworkMetric.objects.filter(id__in=ids[offset:offset + DELETE_BATCH_SIZE]).delete()
+
+    return len(rows)
+
+
+def compact_metrics(older_than_days):
+    """Move samples older than ``older_than_days`` (rounded down to a UTC day) into compressed chunks."""
+    cutoff = day_bucket(timezone.now() - timedelta(days=older_than_days))
+    series = (
+        NetworkMetric.objects.filter(timestamp__lt=cutoff)
+        .order_by()
+        .values_list('device_id', 'metric_type', 'unit')
+        .distinct()
+    )
+    return sum(compact_series(device_id, metric_type, unit, cutoff) for device_id, metric_type, unit in series)
+
+
+class MergedMetricSequence:
+    """Sliceable sequence of hot rows followed (newest first) or preceded (oldest first) by archived points.
+
+    Hot rows at or before the newest archived point arrived late, after their day was compacted,
+    so they are merged into the archived day buckets instead of the hot run. Chunks are grouped by
+    day bucket so only the buckets overlapping a requested page are decoded.
+    """
+
+    def __init__(self, queryset, chunks, descending=True):
+        self.queryset = queryset
+        self.chunks = chunks
+        self.descending = descending
+        self._boundary = False
+        self._hot_count = None
+        self._buckets = None
+
+    @property
+    def boundary(self):
+        if self._boundary is False:
+            self._boundary = self.chunks.aggregate(latest=Max('end_time'))['latest']
+        return self._boundary
+
+    @property
+    def hot(self):
+        return self.queryset.filter(timestamp__gt=self.boundary) if self.boundary else self.queryset
+
+    @property
+    def late(self):
+        return self.queryset.filter(timestamp__lte=self.boundary) if self.boundary else self.queryset.none()
+
+    @property
+    def hot_count(self):
+        if self._hot_count is None:
+            self._hot_count = self.hot.count()
+        return self._hot_count
+
+    @property
+    def buckets(self):
+        if self._buckets is None:
+            totals = Counter(dict(self.chunks.order_by().values_list('bucket').annotate(total=Sum('count'))))
+            totals.update(day_bucket(ts) for ts in self.late.order_by().values_list('timestamp', flat=True))
+            self._buckets = sorted(totals.items(), reverse=self.descending)
+        return self._buckets
+
+    def count(self):
+        return self.hot_count + sum(total for _, total in self.buckets)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        start, stop = key.start or 0, key.stop if key.stop is not None else self.count()
+
+        if self.descending:
+            return self._hot(start, stop) + self._cold(start - self.hot_count, stop - self.hot_count)
+        cold_count = self.count() - self.hot_count
+        return self._cold(start, stop) + self._hot(start - cold_count, stop - cold_count)
+
+    def _hot(self, start, stop):
+        start, stop = max(start, 0), min(stop, self.hot_count)
+        if start >= stop:
+            return []
+        return list(self.hot.select_related('device')[start:stop])
+
+    def _cold(self, start, stop):
+        start = max(start, 0)
+        if start >= stop:
+            return []
+
+        wanted, skipped, offset = [], 0, 0
+        for bucket, total in self.buckets:
+            if offset + total > start and offset < stop:
+                if not wanted:
+                    skipped = offset
+                wanted.append(bucket)
+            offset += total
+            if offset >= stop:
+                break
+        if not wanted:
+            return []
+
+        metrics = []
+        for chunk in self.chunks.filter(bucket__in=wanted).select_related('device'):
+            metrics.extend(decode_metrics(chunk))
+        # Wanted buckets are consecutive among the buckets holding points, so a range covers their late rows.
+        metrics.extend(self.late.filter(
+            timestamp__gte=min(wanted), timestamp__lt=max(wanted) + timedelta(days=1),
+        ).select_related('device'))
+        metrics.sort(key=lambda metric: metric.timestamp, reverse=self.descending)
+        return metrics[start - skipped:stop - skipped]
@@ -0,0 +1,159 @@
+
+import math
+import struct
+
+# Delta-of-delta buckets for timestamps (microseconds): (prefix, prefix bits, value bits)
+DOD_BUCKETS = [
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+    (0b11110, 5, 32),
+]
+DOD_FALLBACK = (0b11111, 5, 64)
+
+
+class BitWriter:
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value, nbits):
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._nbits += nbits
+        while self._nbits >= 8:
+            self._nbits -= 8
+            self.buffer.append((self._acc >> self._nbits) & 0xFF)
+        self._acc &= (1 << self._nbits) - 1
+
+    def getvalue(self):
+        if self._nbits:
+            return bytes(self.buffer) + bytes([(self._acc << (8 - self._nbits)) & 0xFF])
+        return bytes(self.buffer)
+
+
+class BitReader:
+    def __init__(self, data):
+        self._data = data
+        self._pos = 0
+
+    def read(self, nbits):
+        result = 0
+        while nbits:
+            byte = self._data[self._pos >> 3]
+            offset = self._pos & 7
+            take = min(8 - offset, nbits)
+            result = (result << take) | ((byte >> (8 - offset - take)) & ((1 << take) - 1))
+            self._pos += take
+            nbits -= take
+        return result
+
+    def read_bit(self):
+        byte = self._data[self._pos >> 3]
+        bit = (byte >> (7 - (self._pos & 7))) & 1
+        self._pos += 1
+        return bit
+
+
+def _float_to_bits(value):
+    if value is None:
+        value = math.nan
+    return struct.unpack('>Q', struct.pack('>d', float(value)))[0]
+
+
+def _bits_to_float(bits):
+    value = struct.unpack('>d', struct.pack('>Q', bits))[0]
+    return None if math.isnan(value) else value
+
+
+def _signed(value, nbits):
+    if value >= 1 << (nbits - 1):
+        value -= 1 << nbits
+    return value
+
+
+def encode(points):
+    """Encode (timestamp_us, value) pairs sorted by time into a Gorilla-style blob."""
+    writer = BitWriter()
+    prev_ts = prev_delta = prev_bits = 0
+    prev_leading = prev_trailing = -1
+
+    for index, (ts, value) in enumerate(points):
+        bits = _float_to_bits(value)
+
+        if index == 0:
+            writer.write(ts, 64)
+            writer.write(bits, 64)
+        else:
+            delta = ts - prev_ts
+            if index == 1:
+                writer.write(delta, 64)
+            else:
+                dod = delta - prev_delta
+                if dod == 0:
+                    writer.write(0, 1)
+                else:
+                    for prefix, prefix_bits, value_bits in DOD_BUCKETS + [DOD_FALLBACK]:
+                        limit = 1 << (value_bits - 1)
+                        if -limit <= dod < limit or value_bits == 64:
+                            writer.write(prefix, prefix_bits)
+                            writer.write(dod, value_bits)
+                            break
+            prev_delta = delta
+
+            xor = bits ^ prev_bits
+            if xor == 0:
+                writer.write(0, 1)
+            else:
+                leading = min(64 - xor.bit_length(), 31)
+                trailing = (xor & -xor).bit_length() - 1
+                writer.write(1, 1)
+                if prev_leading >= 0 and leading >= prev_leading and trailing >= prev_trailing:
+                    writer.write(0, 1)
+                    writer.write(xor >> prev_trailing, 64 - prev_leading - prev_trailing)
+                else:
+                    significant = 64 - leading - trailing
+                    writer.write(1, 1)
+                    writer.write(leading, 5)
+                    writer.write(significant - 1, 6)
+                    writer.write(xor >> trailing, significant)
+                    prev_leading, prev_trailing = leading, trailing
+
+        prev_ts, prev_bits = ts, bits
+
+    return writer.getvalue()
+
+
+def decode(data, count):
+    """Decode ``count`` (timestamp_us, value) pairs from a blob produced by ``encode``."""
+    if not count:
+        return []
+
+    reader = BitReader(bytes(data))
+    ts = reader.read(64)
+    bits = reader.read(64)
+    points = [(ts, _bits_to_float(bits))]
+    delta = 0
+    leading = trailing = 0
+
+    for index in range(1, count):
+        if index == 1:
+            delta = _signed(reader.read(64), 64)
+        elif reader.read_bit():
+            for _, _, value_bits in DOD_BUCKETS:
+                if not reader.read_bit():
+                    break
+            else:
+                value_bits = DOD_FALLBACK[2]
+            delta += _signed(reader.read(value_bits), value_bits)
+        ts += delta
+
+        if reader.read_bit():
+            if reader.read_bit():
+                leading = reader.read(5)
+                significant = reader.read(6) + 1
+                trailing = 64 - leading - significant
+            bits ^= reader.read(64 - leading - trailing) << trailing
+        points.append((ts, _bits_to_float(bits)))
+
+    return points
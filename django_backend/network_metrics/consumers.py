@@ -0,0 +1,97 @@
+
+import asyncio
+import json
+import time
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from django.conf import settings
+from network_automation.routers import replica_reads
+from .streaming import AGGREGATES, Downsampler, recent_points, series_group
+
+class MetricConsumer(AsyncWebsocketConsumer):
+    """Streams live samples for subscribed (device, metric_type) series.
+    
+    Client messages:
+        {"action": "subscribe", "series": [{"device": 1, "metric_type": "cpu_usage"}],
+         "resolution": 10, "aggregate": "avg", "backfill": 900}
+        {"action": "unsubscribe", "series": [{"device": 1, "metric_type": "cpu_usage"}]}
+    
+    Points are [epoch ms, value] pairs, sent as one "backfill" frame per subscribe and then
+    batched across all series into "samples" frames every METRIC_STREAM_FLUSH_SECONDS.
+    """
+    
+    async def connect(self):
+        self.subscriptions = {}
+        await self.accept()
+        self.flusher = asyncio.create_task(self.flush_periodically())
+    
+    async def disconnect(self, close_code):
+        self.flusher.cancel()
+        for device, metric_type in self.subscriptions:
+            await self.channel_layer.group_discard(series_group(device, metric_type), self.channel_name)
+    
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            message = json.loads(text_data or '')
+            series = [(int(item['device']), str(item['metric_type'])) for item in message.get('series', [])]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            await self.send_error('Messages must be JSON with a series list of {device, metric_type}')
+            return
+        
+        if message.get('action') == 'subscribe':
+            await self.subscribe(series, message)
+        elif message.get('action') == 'unsubscribe':
+            for key in series:
+                if self.subscriptions.pop(key, None):
+                    await self.channel_layer.group_discard(series_group(*key), self.channel_name)
+        else:
+            await self.send_error('action must be subscribe or unsubscribe')
+    
+    async def subscribe(self, series, message):
+        resolution = message.get('resolution', 0)
+        aggregate = message.get('aggregate', 'avg')
+        backfill = message.get('backfill', settings.METRIC_STREAM_BACKFILL_SECONDS)
+        if not isinstance(resolution, (int, float)) or not 0 <= resolution <= 86400 or aggregate not in AGGREGATES:
+            await self.send_error(f"resolution must be 0-86400 seconds and aggregate one of {', '.join(AGGREGATES)}")
+            return
+        if not isinstance(backfill, int) or not 0 <= backfill <= settings.METRIC_STREAM_MAX_BACKFILL_SECONDS:
+            await self.send_error(f'backfill must be 0-{settings.METRIC_STREAM_MAX_BACKFILL_SECONDS} seconds')
+            return
+        if len(set(self.subscriptions) | set(series)) > settings.METRIC_STREAM_MAX_SUBSCRIPTIONS:
+            await self.send_error(f'At most {settings.METRIC_STREAM_MAX_SUBSCRIPTIONS} series per connection')
+            return
+        
+        backfilled = []
+        for key in series:
+            # Join the group first so nothing published during the backfill query is missed;
+            # the downsampler drops whatever the backfill already covered.
+            if key not in self.subscriptions:
+                await self.channel_layer.group_add(series_group(*key), self.channel_name)
+            downsampler = self.subscriptions[key] = Downsampler(resolution, aggregate)
+            if backfill:
+                downsampler.add(await database_sync_to_async(replica_reads()(recent_points))(*key, backfill))
+                backfilled.append({'device': key[0], 'metric_type': key[1], 'points': downsampler.drain(time.time() * 1000)})
+        await self.send(text_data=json.dumps({'type': 'backfill', 'series': backfilled}))
+    
+    async def metric_samples(self, event):
+        downsampler = self.subscriptions.get((event['device'], event['metric_type']))
+        if downsampler:
+            downsampler.add(event['points'])
+    
+    async def flush_periodically(self):
+        while True:
+            await asyncio.sleep(settings.METRIC_STREAM_FLUSH_SECONDS)
+            await self.flush()
+    
+    async def flush(self):
+        now = time.time() * 1000
+        series = []
+        for (device, metric_type), downsampler in self.subscriptions.items():
+            points = downsampler.drain(now)
+            if points:
+                series.append({'device': device, 'metric_type': metric_type, 'points': points})
+        if series:
+            await self.send(text_data=json.dumps({'type': 'samples', 'series': series}))
+    
+    async def send_error(self, error):
+        await self.send(text_data=json.dumps({'type': 'error', 'error': error}))
@@ -0,0 +1,14 @@
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from network_metrics.archive import compact_metrics
+
+class Command(BaseCommand):
+    help = 'Rewrite NetworkMetric samples older than N days into compressed per-series chunks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=settings.METRIC_ARCHIVE_AFTER_DAYS)
+    
+    def handle(self, *args, **options):
+        compacted = compact_metrics(options['older_than_days'])
+        self.stdout.write(self.style.SUCCESS(f'Compacted {compacted} metric samples'))
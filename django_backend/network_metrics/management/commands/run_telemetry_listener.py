@@ -0,0 +1,50 @@
+
+import asyncio
+import signal
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from network_metrics.telemetry import TelemetryIngestor
+
+def parse_bind(value):
+    host, _, port = value.rpartition(':')
+    if not port.isdigit():
+        raise CommandError(f'Bind address {value} must be host:port')
+    return host.strip('[]') or '0.0.0.0', int(port)
+
+class Command(BaseCommand):
+    help = 'Receive syslog and JSON telemetry datagrams and ingest them as metrics and alerts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', action='append', help='host:port to listen on (repeatable)')
+        parser.add_argument('--capture', help='Append every received datagram to this file for later replay')
+        parser.add_argument('--replay', help='Ingest datagrams from a capture file instead of listening')
+        parser.add_argument('--rate', type=int, default=0, help='Replay at most this many datagrams per second')
+    
+    def handle(self, *args, **options):
+        ingestor = TelemetryIngestor()
+        
+        if options['replay']:
+            with open(options['replay']) as lines:
+                elapsed = asyncio.run(ingestor.replay(lines, options['rate']))
+            received = ingestor.stats['received']
+            self.stdout.write(self.style.SUCCESS(
+                f'Replayed {received} datagrams in {elapsed:.2f}s ({received / max(elapsed, 1e-9):.0f}/s): {ingestor.stats_line()}'
+            ))
+            return
+        
+        binds = [parse_bind(value) for value in options['bind'] or settings.TELEMETRY_BIND]
+        capture = open(options['capture'], 'a', buffering=1024 * 1024) if options['capture'] else None
+        
+        async def main():
+            loop = asyncio.get_running_loop()
+            await ingestor.start()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, ingestor.stop)
+            await ingestor.serve(binds, capture)
+        
+        self.stdout.write(f"Telemetry listener started on {', '.join(f'{host}:{port}' for host, port in binds)}")
+        try:
+            asyncio.run(main())
+        finally:
+            if capture:
+                capture.close()
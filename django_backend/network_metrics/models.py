@@ -1,12 +1,13 @@
 
 from django.db import models
+from django.utils import timezone
 
 class NetworkMetric(models.Model):
     device = models.ForeignKey('network_devices.NetworkDevice', on_delete=models.CASCADE, null=True, blank=True)
     metric_type = models.CharField(max_length=100)
     value = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
     unit = models.CharField(max_length=50, null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-timestamp']
@@ -16,3 +17,26 @@ class NetworkMetric(models.Model):
     
     def __str__(self):
         return f"{self.device.name if self.device else 'Unknown'} - {self.metric_type}: {self.value}"
+
+class MetricChunk(models.Model):
+    """Compressed samples of one series (device, metric_type, unit) for one day."""
+    device = models.ForeignKey('network_devices.NetworkDevice', on_delete=models.CASCADE, null=True, blank=True)
+    metric_type = models.CharField(max_length=100)
+    unit = models.CharField(max_length=50, null=True, blank=True)
+    bucket = models.DateTimeField()
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    count = models.PositiveIntegerField()
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-bucket']
+        unique_together = ['device', 'metric_type', 'unit', 'bucket']
+        indexes = [
+            models.Index(fields=['device', 'metric_type', '-bucket']),
+            models.Index(fields=['-bucket']),
+        ]
+    
+    def __str__(self):
+        return f"{self.device_id} - {self.metric_type} @ {self.bucket:%Y-%m-%d} ({self.count} points)"
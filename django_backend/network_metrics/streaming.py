@@ -0,0 +1,120 @@
+
+import hashlib
+import logging
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.utils import timezone
+
+from .models import NetworkMetric
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES = {
+    'avg': lambda values: sum(values) / len(values),
+    'min': min,
+    'max': max,
+    'last': lambda values: values[-1],
+}
+
+
+def series_group(device_id, metric_type):
+    # Group names are limited to a small ASCII alphabet, so the metric type is hashed.
+    return f'metrics.{device_id}.{hashlib.sha1(metric_type.encode()).hexdigest()[:16]}'
+
+
+def epoch_ms(timestamp):
+    """Milliseconds since the epoch for an epoch-seconds number or a (naive local or aware) datetime."""
+    if isinstance(timestamp, datetime):
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+        return int(timestamp.timestamp() * 1000)
+    return int(timestamp * 1000)
+
+
+async def publish_samples(samples):
+    """Fan (device_id, metric_type, value, timestamp) samples out to their series groups, one message per series."""
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    series = defaultdict(list)
+    for device_id, metric_type, value, timestamp in samples:
+        series[device_id, metric_type].append([epoch_ms(timestamp), None if value is None else float(value)])
+    for (device_id, metric_type), points in series.items():
+        await channel_layer.group_send(series_group(device_id, metric_type), {
+            'type': 'metric_samples',
+            'device': device_id,
+            'metric_type': metric_type,
+            'points': points,
+        })
+
+
+def publish_metrics(metrics):
+    try:
+        async_to_sync(publish_samples)([
+            (metric.device_id, metric.metric_type, metric.value, metric.timestamp)
+            for metric in metrics if metric.device_id
+        ])
+    except Exception:
+        logger.exception('Publishing metric samples to websocket subscribers failed')
+
+
+class Downsampler:
+    """Folds a series' points into fixed ``resolution`` buckets for one subscription.
+
+    A bucket is emitted once a later bucket starts or wall-clock time passes its end, so a
+    chart lags live data by at most one bucket plus the flush tick. Points no newer than the
+    last one taken, or inside a bucket already emitted, are dropped; that also discards live
+    points the backfill already covered. A resolution of 0 passes points through unchanged.
+    """
+
+    def __init__(self, resolution=0, aggregate='avg'):
+        self.resolution = int(resolution * 1000)
+        self.aggregate = AGGREGATES[aggregate]
+        self.bucket = None
+        self.values = []
+        self.latest = None
+        self.pending = deque(maxlen=settings.METRIC_STREAM_MAX_PENDING)
+
+    def add(self, points):
+        for timestamp, value in points:
+            if self.latest is not None and timestamp <= self.latest:
+                continue
+            self.latest = timestamp
+            if not self.resolution:
+                self.pending.append([timestamp, value])
+                continue
+            start = timestamp - timestamp % self.resolution
+            if self.bucket is not None and start != self.bucket:
+                self.close()
+            self.bucket = start
+            self.values.append(value)
+
+    def close(self):
+        values = [value for value in self.values if value is not None]
+        self.pending.append([self.bucket, round(self.aggregate(values), 4) if values else None])
+        # Anything before the end of an emitted bucket would rewrite history on the client.
+        self.latest = max(self.latest, self.bucket + self.resolution - 1)
+        self.bucket = None
+        self.values = []
+
+    def drain(self, now_ms):
+        if self.bucket is not None and self.bucket + self.resolution <= now_ms:
+            self.close()
+        points = list(self.pending)
+        self.pending.clear()
+        return points
+
+
+def recent_points(device_id, metric_type, seconds):
+    """The newest raw points of a series within ``seconds``, oldest first, as [epoch ms, value] pairs."""
+    since = timezone.now() - timedelta(seconds=seconds)
+    rows = list(
+        NetworkMetric.objects.filter(device_id=device_id, metric_type=metric_type, timestamp__gte=since)
+        .order_by('-timestamp')
+        .values_list('timestamp', 'value')[:settings.METRIC_STREAM_BACKFILL_MAX_POINTS]
+    )
+    return [[epoch_ms(timestamp), None if value is None else float(value)] for timestamp, value in reversed(rows)]
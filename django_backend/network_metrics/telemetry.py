@@ -0,0 +1,444 @@
+
+import asyncio
+import base64
+import io
+import logging
+import re
+import socket
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from network_alerts.models import NetworkAlert
+from network_devices.models import NetworkDevice
+from .models import NetworkMetric
+from .streaming import publish_samples
+
+logger = logging.getLogger(__name__)
+
+# RFC 5424 severities 0-7 mapped onto alert severities
+SYSLOG_SEVERITIES = ['critical', 'critical', 'critical', 'high', 'medium', 'low', 'low', 'low']
+RFC3164_HEADER = re.compile(r'[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d \S+ ')
+ALERT_SEVERITIES = {choice for choice, _ in NetworkAlert.SEVERITY_CHOICES}
+
+METRIC_COLUMNS = ['device', 'metric_type', 'value', 'unit', 'timestamp']
+VALUE_FIELD = NetworkMetric._meta.get_field('value')
+METRIC_TYPE_LENGTH = NetworkMetric._meta.get_field('metric_type').max_length
+UNIT_LENGTH = NetworkMetric._meta.get_field('unit').max_length
+TITLE_LENGTH = NetworkAlert._meta.get_field('title').max_length
+ALERT_FIELDS = {name: NetworkAlert._meta.get_field(name) for name in ('metric_value', 'threshold_value')}
+MAX_EPOCH = 253402300799  # 9999-12-31T23:59:59Z
+
+
+class MalformedDatagram(ValueError):
+    pass
+
+
+def normalize_datetime(dt):
+    if settings.USE_TZ:
+        return dt if timezone.is_aware(dt) else timezone.make_aware(dt)
+    return timezone.make_naive(dt) if timezone.is_aware(dt) else dt
+
+
+def from_epoch(seconds):
+    return normalize_datetime(datetime.fromtimestamp(seconds, tz=dt_timezone.utc))
+
+
+def check_value(value, field):
+    """A JSON number that fits ``field``'s decimal column once rounded to its scale, or None."""
+    if value is None:
+        return None
+    limit = 10 ** (field.max_digits - field.decimal_places)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not abs(round(value, field.decimal_places)) < limit:
+        raise MalformedDatagram(f'Bad {field.name}')
+    return value
+
+
+def parse_timestamp(value, received_at):
+    if value is None:
+        return received_at
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if not 0 < value < MAX_EPOCH:
+            raise MalformedDatagram(f'Bad timestamp {value!r}')
+        return value
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise MalformedDatagram(f'Bad timestamp {value!r}')
+    return parsed
+
+
+def parse_syslog(data):
+    """Split an RFC 3164 or RFC 5424 datagram into (severity, message)."""
+    end = data.find(b'>', 1, 5)
+    if end == -1:
+        raise MalformedDatagram('Missing syslog priority')
+    severity = int(data[1:end]) & 7
+    text = data[end + 1:].decode('utf-8', 'replace').strip()
+    if text.startswith('1 '):
+        # VERSION TIMESTAMP HOSTNAME APP-NAME PROCID MSGID STRUCTURED-DATA MSG
+        parts = text.split(' ', 6)
+        rest = parts[6] if len(parts) == 7 else ''
+        if rest.startswith('-'):
+            text = rest[2:]
+        else:
+            end = rest.rfind('] ')
+            text = rest[end + 2:] if end != -1 else ''
+    else:
+        header = RFC3164_HEADER.match(text)
+        if header:
+            text = text[header.end():]
+    return severity, text.lstrip('\ufeff')
+
+
+class DeviceIndex:
+    """Source IP -> device id, reloaded periodically so new devices start reporting without a restart."""
+
+    def __init__(self):
+        self.by_ip = {}
+        self.loaded_at = 0
+
+    def load(self):
+        self.by_ip = dict(NetworkDevice.objects.exclude(ip_address=None).values_list('ip_address', 'pk'))
+        self.loaded_at = time.monotonic()
+
+    def lookup(self, ip):
+        if ip.startswith('::ffff:'):
+            ip = ip[7:]
+        return self.by_ip.get(ip)
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def insert_metrics(rows):
+    """Insert (device_id, metric_type, value, unit, timestamp) rows; COPY on Postgres, executemany elsewhere."""
+    if not rows:
+        return
+    meta = NetworkMetric._meta
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(meta.get_field(name).column) for name in METRIC_COLUMNS)
+    adapt = connection.ops.adapt_datetimefield_value
+    prepared = [
+        (
+            device_id,
+            metric_type,
+            None if value is None else f'{value:.{VALUE_FIELD.decimal_places}f}',
+            unit,
+            adapt(from_epoch(ts) if isinstance(ts, (int, float)) else normalize_datetime(ts)),
+        )
+        for device_id, metric_type, value, unit, ts in rows
+    ]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            buffer = io.StringIO()
+            for row in prepared:
+                buffer.write('\t'.join(copy_value(value) for value in row))
+                buffer.write('\n')
+            buffer.seek(0)
+            cursor.copy_expert(f'COPY {quote(meta.db_table)} ({columns}) FROM STDIN', buffer)
+        else:
+            placeholders = ', '.join(['%s'] * len(METRIC_COLUMNS))
+            cursor.executemany(f'INSERT INTO {quote(meta.db_table)} ({columns}) VALUES ({placeholders})', prepared)
+
+
+def create_alerts(candidates):
+    """Create alert candidates one by one (so correlation and webhook signals fire), skipping duplicates
+    of the batch itself and of alerts that are still active.
+
+    Each alert gets its own savepoint so one bad row does not roll back the rest; returns the
+    number created and the number that failed.
+    """
+    unique = {}
+    for candidate in candidates:
+        unique.setdefault((candidate['device_id'], candidate['alert_type'], candidate['title']), candidate)
+    if not unique:
+        return 0, 0
+
+    active = set(
+        NetworkAlert.objects.filter(
+            status='active',
+            device_id__in={device_id for device_id, _, _ in unique},
+            alert_type__in={alert_type for _, alert_type, _ in unique},
+        ).values_list('device_id', 'alert_type', 'title')
+    )
+    created = failed = 0
+    for key, candidate in unique.items():
+        if key in active:
+            continue
+        try:
+            with transaction.atomic():
+                NetworkAlert.objects.create(**candidate)
+        except Exception:
+            logger.exception('Creating telemetry alert %r failed', candidate['title'])
+            failed += 1
+        else:
+            created += 1
+    return created, failed
+
+
+class TelemetryIngestor:
+    """Parses telemetry datagrams into bounded buffers that a single writer flushes in batches.
+
+    Parsing runs on the event loop and only builds tuples; model work happens in the writer
+    thread. UDP has no flow control, so when the writer falls behind and a buffer reaches
+    ``queue_size`` new samples are dropped and counted rather than growing memory.
+    """
+
+    def __init__(self, devices=None, queue_size=None, batch_size=None, flush_seconds=None, alert_severity=None):
+        self.devices = devices or DeviceIndex()
+        self.queue_size = queue_size or settings.TELEMETRY_QUEUE_SIZE
+        self.batch_size = batch_size or settings.TELEMETRY_BATCH_SIZE
+        self.flush_seconds = flush_seconds or settings.TELEMETRY_FLUSH_SECONDS
+        self.alert_severity = settings.TELEMETRY_SYSLOG_ALERT_SEVERITY if alert_severity is None else alert_severity
+        self.metrics = []
+        self.alerts = []
+        self.stats = Counter()
+        self.last_flush_seconds = 0.0
+        self.ready = None
+        self.stopped = None
+
+    # Parsing (event loop)
+
+    def ingest(self, data, source, received_at=None):
+        self.stats['received'] += 1
+        device_id = self.devices.lookup(source)
+        if device_id is None:
+            self.stats['unknown_source'] += 1
+            return
+        received_at = received_at or time.time()
+        try:
+            first = data[:1]
+            if first == b'<':
+                self.ingest_syslog(data, device_id, received_at)
+            elif first == b'{' or first == b'[':
+                self.ingest_json(data, device_id, received_at)
+            else:
+                raise MalformedDatagram('Unknown datagram format')
+        except (ValueError, TypeError, KeyError, AttributeError):
+            self.stats['malformed'] += 1
+
+    def ingest_syslog(self, data, device_id, received_at):
+        end = data.find(b'>', 1, 5)
+        # Cheap priority check first: most syslog traffic is below the alerting threshold.
+        if end != -1 and int(data[1:end]) & 7 > self.alert_severity:
+            self.stats['ignored'] += 1
+            return
+        severity, message = parse_syslog(data)
+        self.push_alert({
+            'device_id': device_id,
+            'alert_type': 'syslog',
+            'severity': SYSLOG_SEVERITIES[severity],
+            'title': message[:TITLE_LENGTH] or 'Syslog message',
+            'description': message,
+        })
+
+    def ingest_json(self, data, device_id, received_at):
+        records = orjson.loads(data)
+        for record in records if isinstance(records, list) else [records]:
+            if 'alert_type' in record:
+                self.push_alert(self.parse_alert(record, device_id))
+            else:
+                self.push_metric(self.parse_metric(record, device_id, received_at))
+
+    def parse_metric(self, record, device_id, received_at):
+        metric_type, value, unit = record['metric_type'], record['value'], record.get('unit')
+        if not isinstance(metric_type, str) or not 0 < len(metric_type) <= METRIC_TYPE_LENGTH:
+            raise MalformedDatagram('Bad metric_type')
+        if unit is not None and (not isinstance(unit, str) or len(unit) > UNIT_LENGTH):
+            raise MalformedDatagram('Bad unit')
+        check_value(value, VALUE_FIELD)
+        return device_id, metric_type, value, unit, parse_timestamp(record.get('timestamp'), received_at)
+
+    def parse_alert(self, record, device_id):
+        alert_type, title = str(record['alert_type'])[:100], str(record.get('title') or record['alert_type'])
+        severity = record.get('severity')
+        return {
+            'device_id': device_id,
+            'alert_type': alert_type,
+            'severity': severity if severity in ALERT_SEVERITIES else 'medium',
+            'title': title[:TITLE_LENGTH],
+            'description': str(record.get('description', '')),
+            'metric_value': check_value(record.get('metric_value'), ALERT_FIELDS['metric_value']),
+            'threshold_value': check_value(record.get('threshold_value'), ALERT_FIELDS['threshold_value']),
+        }
+
+    def push_metric(self, metric):
+        if len(self.metrics) >= self.queue_size:
+            self.stats['dropped'] += 1
+            return
+        self.metrics.append(metric)
+        self.stats['metrics'] += 1
+        if len(self.metrics) == self.batch_size and self.ready is not None:
+            self.ready.set()
+
+    def push_alert(self, alert):
+        if len(self.alerts) >= self.queue_size:
+            self.stats['dropped'] += 1
+            return
+        self.alerts.append(alert)
+        self.stats['alert_candidates'] += 1
+
+    # Writing (writer thread)
+
+    def write_metrics(self, metrics):
+        """Commit metrics one ``batch_size`` slice at a time; returns the committed rows and the failed slice count."""
+        close_old_connections()
+        written, failed = [], 0
+        for offset in range(0, len(metrics), self.batch_size):
+            batch = metrics[offset:offset + self.batch_size]
+            try:
+                with transaction.atomic():
+                    insert_metrics(batch)
+            except Exception:
+                logger.exception('Telemetry insert of %s metrics failed', len(batch))
+                failed += 1
+            else:
+                written.extend(batch)
+        return written, failed
+
+    def write_alerts(self, alerts):
+        close_old_connections()
+        with transaction.atomic():
+            return create_alerts(alerts)
+
+    async def flush(self):
+        metrics, self.metrics = self.metrics, []
+        alerts, self.alerts = self.alerts, []
+        if not metrics and not alerts:
+            return
+        started = time.monotonic()
+        # Metrics and alerts commit separately, so a failure only drops the items that were lost.
+        if metrics:
+            try:
+                written, failed = await sync_to_async(self.write_metrics)(metrics)
+            except Exception:
+                logger.exception('Telemetry flush of %s metrics failed', len(metrics))
+                written, failed = [], 1
+            self.stats['flush_errors'] += failed
+            self.stats['dropped'] += len(metrics) - len(written)
+            self.stats['flushed'] += len(written)
+            metrics = written
+        if alerts:
+            try:
+                created, failed = await sync_to_async(self.write_alerts)(alerts)
+            except Exception:
+                logger.exception('Telemetry flush of %s alerts failed', len(alerts))
+                self.stats['flush_errors'] += 1
+                self.stats['dropped'] += len(alerts)
+            else:
+                self.stats['alerts'] += created
+                self.stats['dropped'] += failed
+        self.last_flush_seconds = time.monotonic() - started
+        if not metrics:
+            return
+        try:
+            await publish_samples((device_id, metric_type, value, ts) for device_id, metric_type, value, _, ts in metrics)
+        except Exception:
+            logger.exception('Publishing telemetry samples to websocket subscribers failed')
+            self.stats['publish_errors'] += 1
+
+    async def run_writer(self):
+        while not self.stopped.is_set():
+            try:
+                await asyncio.wait_for(self.ready.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self.ready.clear()
+            await self.flush()
+            if time.monotonic() - self.devices.loaded_at > settings.TELEMETRY_DEVICE_REFRESH_SECONDS:
+                await sync_to_async(self.devices.load)()
+        await self.flush()
+
+    def stats_line(self):
+        stats = ', '.join(f'{name}={count}' for name, count in sorted(self.stats.items()))
+        return f'{stats}, queued={len(self.metrics) + len(self.alerts)}, last_flush={self.last_flush_seconds:.3f}s'
+
+    async def report_stats(self):
+        while not self.stopped.is_set():
+            try:
+                await asyncio.wait_for(self.stopped.wait(), settings.TELEMETRY_STATS_SECONDS)
+            except asyncio.TimeoutError:
+                logger.info('Telemetry: %s', self.stats_line())
+
+    def stop(self):
+        self.stopped.set()
+        self.ready.set()
+
+    async def start(self):
+        if self.ready is None:
+            self.ready = asyncio.Event()
+            self.stopped = asyncio.Event()
+        if not self.devices.loaded_at:
+            await sync_to_async(self.devices.load)()
+
+    # Entry points
+
+    async def serve(self, binds, capture=None):
+        await self.start()
+        loop = asyncio.get_running_loop()
+        transports = []
+        for host, port in binds:
+            sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, 'SO_REUSEPORT'):
+                # Lets several listener processes share a port; the kernel spreads datagrams across them.
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, settings.TELEMETRY_RECEIVE_BUFFER)
+            sock.bind((host, port))
+            transport, _ = await loop.create_datagram_endpoint(lambda: TelemetryProtocol(self, capture), sock=sock)
+            transports.append(transport)
+        try:
+            await asyncio.gather(self.run_writer(), self.report_stats())
+        finally:
+            for transport in transports:
+                transport.close()
+
+    async def replay(self, lines, rate=0):
+        """Feed captured ``<source ip>\\t<epoch>\\t<base64 datagram>`` lines through the live pipeline.
+
+        Unlike a socket, a file can wait, so replay pauses while a buffer is full instead of
+        dropping; ``rate`` caps datagrams per second to mimic live traffic.
+        """
+        await self.start()
+        writer = asyncio.create_task(self.run_writer())
+        started = time.monotonic()
+        for count, line in enumerate(lines, 1):
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) == 3:
+                self.ingest(base64.b64decode(fields[2]), fields[0], float(fields[1]))
+            while len(self.metrics) >= self.queue_size or len(self.alerts) >= self.queue_size:
+                self.ready.set()
+                await asyncio.sleep(0.01)
+            if rate and count % 100 == 0:
+                delay = started + count / rate - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % self.batch_size == 0:
+                await asyncio.sleep(0)
+        self.stop()
+        await writer
+        return time.monotonic() - started
+
+
+class TelemetryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, ingestor, capture=None):
+        self.ingestor = ingestor
+        self.capture = capture
+
+    def datagram_received(self, data, addr):
+        self.ingestor.ingest(data, addr[0])
+        if self.capture is not None:
+            self.capture.write(f'{addr[0]}\t{time.time():.6f}\t{base64.b64encode(data).decode()}\n')
+
+    def error_received(self, exc):
+        logger.warning('Telemetry socket error: %s', exc)
@@ -0,0 +1,176 @@
+
+import asyncio
+from unittest import mock
+from datetime import datetime, timedelta
+import orjson
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+from network_alerts.models import NetworkAlert
+from network_devices.models import NetworkDevice
+from .archive import compact_series
+from .models import NetworkMetric, MetricChunk
+from .streaming import Downsampler
+from . import telemetry
+from .telemetry import DeviceIndex, TelemetryIngestor
+
+class TelemetryAlertTests(TransactionTestCase):
+    def setUp(self):
+        NetworkDevice.objects.create(name='edge1', type='router', ip_address='192.0.2.10')
+        devices = DeviceIndex()
+        devices.load()
+        self.ingestor = TelemetryIngestor(devices=devices)
+    
+    def ingest(self, record):
+        self.ingestor.ingest(orjson.dumps(record), '192.0.2.10')
+    
+    def test_rejects_non_numeric_and_out_of_range_alert_values(self):
+        self.ingest({'alert_type': 'x', 'metric_value': 'abc'})
+        self.ingest({'alert_type': 'x', 'threshold_value': 10 ** 13})
+        self.ingest({'alert_type': 'x', 'metric_value': True})
+        self.assertEqual(self.ingestor.stats['malformed'], 3)
+        self.assertEqual(self.ingestor.alerts, [])
+    
+    def test_failed_alert_does_not_drop_the_rest_of_the_batch(self):
+        self.ingest({'metric_type': 'cpu', 'value': 42})
+        self.ingest({'alert_type': 'cpu', 'title': 'CPU high', 'metric_value': 95.5, 'threshold_value': 90})
+        self.ingest({'alert_type': 'cpu', 'title': 'Broken'})
+        save = NetworkAlert.save
+        
+        def failing_save(alert, *args, **kwargs):
+            if alert.title == 'Broken':
+                raise ValueError('bad row')
+            save(alert, *args, **kwargs)
+        
+        with mock.patch.object(NetworkAlert, 'save', failing_save):
+            asyncio.run(self.ingestor.flush())
+        
+        self.assertEqual(NetworkMetric.objects.count(), 1)
+        self.assertEqual(list(NetworkAlert.objects.values_list('title', flat=True)), ['CPU high'])
+        self.assertEqual(self.ingestor.stats['flushed'], 1)
+        self.assertEqual(self.ingestor.stats['alerts'], 1)
+        self.assertEqual(self.ingestor.stats['dropped'], 1)
+        self.assertEqual(self.ingestor.stats['flush_errors'], 0)
+    
+    def test_rejects_metric_values_that_overflow_once_rounded(self):
+        self.ingest({'metric_type': 'cpu', 'value': 9999999999999.999})
+        self.ingest({'metric_type': 'cpu', 'value': 'abc'})
+        self.ingest({'metric_type': 'cpu', 'value': 9999999999999.99})
+        self.assertEqual(self.ingestor.stats['malformed'], 2)
+        self.assertEqual(len(self.ingestor.metrics), 1)
+    
+    def test_failed_metric_slice_does_not_drop_the_rest_of_the_flush(self):
+        insert_metrics = telemetry.insert_metrics
+        
+        def failing_insert(rows):
+            if any(value == 13 for _, _, value, _, _ in rows):
+                raise ValueError('bad row')
+            insert_metrics(rows)
+        
+        self.ingestor.batch_size = 2
+        for value in (1, 2, 13, 3, 4):
+            self.ingest({'metric_type': 'cpu', 'value': value})
+        with mock.patch.object(telemetry, 'insert_metrics', failing_insert):
+            asyncio.run(self.ingestor.flush())
+        
+        self.assertEqual(sorted(NetworkMetric.objects.values_list('value', flat=True)), [1, 2, 4])
+        self.assertEqual(self.ingestor.stats['flushed'], 3)
+        self.assertEqual(self.ingestor.stats['dropped'], 2)
+        self.assertEqual(self.ingestor.stats['flush_errors'], 1)
+
+# Reads stay on the primary even when a replica alias is configured; routing has its own tests.
+@override_settings(DATABASE_ROUTERS=[])
+class MetricSeriesTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='ops', email='ops@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.device = NetworkDevice.objects.create(name='edge1', type='router')
+        start = datetime(2024, 1, 1)
+        for hour in range(6):
+            NetworkMetric.objects.create(device=self.device, metric_type='cpu', value=hour, timestamp=start + timedelta(hours=hour))
+        compact_series(self.device.pk, 'cpu', None, start + timedelta(hours=3))
+        self.params = {'device': self.device.pk, 'metric_type': 'cpu'}
+    
+    def test_series_merges_archived_and_hot_points(self):
+        response = self.client.get('/api/metrics/series/', {**self.params, 'start': '2024-01-01T01:00:00'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([point['value'] for point in response.json()['points']], [1.0, 2.0, 3.0, 4.0, 5.0])
+    
+    def test_series_rejects_invalid_bounds(self):
+        for bound in ('2024-13-01T00:00:00', 'yesterday'):
+            response = self.client.get('/api/metrics/series/', {**self.params, 'start': bound})
+            self.assertEqual(response.status_code, 400, bound)
+    
+    def test_list_merges_archive_for_timestamp_orderings(self):
+        self.assertEqual(MetricChunk.objects.count(), 1)
+        for ordering in ('timestamp', '-timestamp'):
+            response = self.client.get('/api/metrics/', {'device': self.device.pk, 'ordering': ordering})
+            self.assertEqual(response.json()['count'], 6)
+    
+    def test_late_hot_rows_are_merged_with_archived_points(self):
+        NetworkMetric.objects.create(device=self.device, metric_type='cpu', value=10, timestamp=datetime(2024, 1, 1, 1, 30))
+        response = self.client.get('/api/metrics/series/', self.params)
+        self.assertEqual([point['value'] for point in response.json()['points']], [0.0, 1.0, 10.0, 2.0, 3.0, 4.0, 5.0])
+        
+        for ordering, page_size in (('timestamp', 7), ('-timestamp', 7), ('timestamp', 2), ('-timestamp', 3)):
+            values, url, params = [], '/api/metrics/', {'device': self.device.pk, 'ordering': ordering}
+            with mock.patch.object(PageNumberPagination, 'page_size', page_size):
+                while url:
+                    body = self.client.get(url, params).json()
+                    values.extend(float(row['value']) for row in body['results'])
+                    url, params = body['next'], None
+            expected = [0.0, 1.0, 10.0, 2.0, 3.0, 4.0, 5.0]
+            self.assertEqual(values, expected if ordering == 'timestamp' else expected[::-1], (ordering, page_size))
+    
+    def test_list_rejects_orderings_that_would_drop_archived_rows(self):
+        response = self.client.get('/api/metrics/', {'ordering': 'value'})
+        self.assertEqual(response.status_code, 400)
+
+class DownsamplerTests(SimpleTestCase):
+    def test_points_are_aggregated_per_bucket(self):
+        downsampler = Downsampler(resolution=10, aggregate='avg')
+        downsampler.add([[0, 1.0], [4000, None], [9999, 3.0], [10000, 5.0], [25000, 7.0]])
+        self.assertEqual(downsampler.drain(now_ms=26000), [[0, 2.0], [10000, 5.0]])
+        self.assertEqual(downsampler.drain(now_ms=30000), [[20000, 7.0]])
+        self.assertEqual(downsampler.drain(now_ms=40000), [])
+    
+    def test_aggregates_and_empty_buckets(self):
+        points = [[1000, 4.0], [2000, 1.0], [3000, 2.0]]
+        for aggregate, expected in (('min', 1.0), ('max', 4.0), ('last', 2.0), ('avg', 2.3333)):
+            downsampler = Downsampler(resolution=10, aggregate=aggregate)
+            downsampler.add(points)
+            self.assertEqual(downsampler.drain(now_ms=10000), [[0, expected]], aggregate)
+        downsampler = Downsampler(resolution=10)
+        downsampler.add([[1000, None]])
+        self.assertEqual(downsampler.drain(now_ms=10000), [[0, None]])
+    
+    def test_late_points_for_emitted_buckets_are_dropped(self):
+        downsampler = Downsampler(resolution=10)
+        downsampler.add([[1000, 1.0], [12000, 2.0]])
+        downsampler.add([[5000, 100.0], [11000, 3.0], [13000, 4.0]])
+        self.assertEqual(downsampler.drain(now_ms=20000), [[0, 1.0], [10000, 3.0]])
+        downsampler.add([[19999, 100.0], [21000, 5.0]])
+        self.assertEqual(downsampler.drain(now_ms=30000), [[20000, 5.0]])
+    
+    def test_live_points_already_backfilled_are_dropped(self):
+        # Live messages published while the backfill query ran repeat its newest points.
+        raw = Downsampler()
+        raw.add([[1000, 1.0], [2000, 2.0]])
+        self.assertEqual(raw.drain(now_ms=5000), [[1000, 1.0], [2000, 2.0]])
+        raw.add([[2000, 2.0], [3000, 6.0]])
+        self.assertEqual(raw.drain(now_ms=5000), [[3000, 6.0]])
+        
+        bucketed = Downsampler(resolution=10)
+        bucketed.add([[1000, 1.0], [2000, 2.0]])
+        self.assertEqual(bucketed.drain(now_ms=5000), [])
+        bucketed.add([[2000, 2.0], [3000, 6.0]])
+        self.assertEqual(bucketed.drain(now_ms=10000), [[0, 3.0]])
+    
+    @override_settings(METRIC_STREAM_MAX_PENDING=3)
+    def test_drain_returns_pending_points_once_and_caps_the_backlog(self):
+        downsampler = Downsampler()
+        downsampler.add([[timestamp, float(timestamp)] for timestamp in range(1, 6)])
+        self.assertEqual(downsampler.drain(now_ms=0), [[3, 3.0], [4, 4.0], [5, 5.0]])
+        self.assertEqual(downsampler.drain(now_ms=0), [])
@@ -5,4 +5,5 @@ from . import views
 urlpatterns = [
     path('', views.NetworkMetricListCreateView.as_view(), name='metric-list'),
     path('<int:pk>/', views.NetworkMetricDetailView.as_view(), name='metric-detail'),
+    path('series/', views.metric_series, name='metric-series'),
 ]
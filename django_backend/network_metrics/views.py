@@ -1,18 +1,109 @@
 
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from .models import NetworkMetric
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from network_automation.fieldsets import SparseFieldsetMixin
+from .archive import MergedMetricSequence, day_bucket, decode_points
+from .models import NetworkMetric, MetricChunk
 from .serializers import NetworkMetricSerializer
+from .streaming import publish_metrics
 
-class NetworkMetricListCreateView(generics.ListCreateAPIView):
+class NetworkMetricListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
     queryset = NetworkMetric.objects.all()
     serializer_class = NetworkMetricSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['device', 'metric_type']
     ordering_fields = ['timestamp']
     ordering = ['-timestamp']
+    
+    def perform_create(self, serializer):
+        metric = serializer.save()
+        transaction.on_commit(lambda: publish_metrics([metric]))
+    
+    def get_archived_chunks(self):
+        chunks = MetricChunk.objects.all()
+        for field in self.filterset_fields:
+            if field in self.request.query_params:
+                chunks = chunks.filter(**{field: self.request.query_params[field]})
+        return chunks
+    
+    def list(self, request, *args, **kwargs):
+        # Archived chunks can only be merged in by time, so no other ordering is offered.
+        ordering = request.query_params.get('ordering') or '-timestamp'
+        if ordering not in ('timestamp', '-timestamp'):
+            return Response({'error': 'ordering must be timestamp or -timestamp'}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = MergedMetricSequence(
+            self.filter_queryset(self.get_queryset()), self.get_archived_chunks(), descending=ordering == '-timestamp',
+        )
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.get_serializer(list(queryset), many=True)
+        return Response(serializer.data)
 
-class NetworkMetricDetailView(generics.RetrieveAPIView):
+class NetworkMetricDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
     queryset = NetworkMetric.objects.all()
     serializer_class = NetworkMetricSerializer
+
+def parse_bound(value):
+    """A naive or aware ISO 8601 datetime matching the stored timestamps; raises ValueError if invalid."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    if not settings.USE_TZ and timezone.is_aware(parsed):
+        return timezone.make_naive(parsed)
+    if settings.USE_TZ and timezone.is_naive(parsed):
+        return timezone.make_aware(parsed)
+    return parsed
+
+@api_view(['GET'])
+def metric_series(request):
+    device = request.query_params.get('device')
+    metric_type = request.query_params.get('metric_type')
+    if not device or not device.isdigit() or not metric_type:
+        return Response({'error': 'device and metric_type are required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        start, end = (
+            parse_bound(request.query_params[name]) if request.query_params.get(name) else None
+            for name in ('start', 'end')
+        )
+    except ValueError:
+        return Response({'error': 'start and end must be valid ISO 8601 datetimes'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    hot = NetworkMetric.objects.filter(device=device, metric_type=metric_type).order_by('timestamp')
+    chunks = MetricChunk.objects.filter(device=device, metric_type=metric_type).order_by('bucket')
+    if start:
+        hot = hot.filter(timestamp__gte=start)
+        chunks = chunks.filter(end_time__gte=start)
+    if end:
+        hot = hot.filter(timestamp__lte=end)
+        chunks = chunks.filter(bucket__lte=day_bucket(end))
+    
+    points = []
+    for chunk in chunks:
+        points.extend(
+            (ts, value) for ts, value in decode_points(chunk)
+            if (not start or ts >= start) and (not end or ts <= end)
+        )
+    # Late samples can land in the hot table after their day was compacted, so sort the union.
+    points.extend(hot.values_list('timestamp', 'value'))
+    points.sort(key=lambda point: point[0])
+    
+    return Response({
+        'device': device,
+        'metric_type': metric_type,
+        'points': [
+            {'timestamp': ts, 'value': None if value is None else float(value)}
+            for ts, value in points
+        ],
+    })
@@ -0,0 +1,169 @@
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import WebhookSubscription, WebhookEvent, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Webhook-Signature'
+TIMESTAMP_HEADER = 'X-Webhook-Timestamp'
+
+
+def sign(secret, timestamp, body):
+    message = f'{timestamp}.'.encode() + body
+    return 'sha256=' + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify(secret, timestamp, body, signature):
+    return hmac.compare_digest(sign(secret, timestamp, body), signature)
+
+
+def retry_delay(attempts):
+    return min(settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.WEBHOOK_RETRY_MAX_SECONDS)
+
+
+def fan_out(limit=1000):
+    """Turn undispatched outbox events into one pending delivery per matching subscription."""
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True)
+            .order_by('id')[:limit]
+        )
+        if not events:
+            return 0
+
+        subscriptions = list(WebhookSubscription.objects.filter(is_active=True))
+        WebhookDelivery.objects.bulk_create(
+            [
+                WebhookDelivery(subscription=subscription, event=event)
+                for event in events
+                for subscription in subscriptions
+                if subscription.matches(event)
+            ],
+            ignore_conflicts=True,
+        )
+        WebhookEvent.objects.filter(id__in=[event.id for event in events]).update(dispatched_at=timezone.now())
+        return len(events)
+
+
+def claim_batches(limit):
+    """Lease due deliveries grouped per subscription; the lease is the pushed-back next_attempt_at."""
+    now = timezone.now()
+    with transaction.atomic():
+        deliveries = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(status='pending', next_attempt_at__lte=now, subscription__is_active=True)
+            .select_related('subscription', 'event')
+            .order_by('next_attempt_at', 'id')[:limit]
+        )
+        batches = defaultdict(list)
+        for delivery in deliveries:
+            if len(batches[delivery.subscription]) < delivery.subscription.batch_size:
+                batches[delivery.subscription].append(delivery)
+
+        claimed = [delivery.id for batch in batches.values() for delivery in batch]
+        WebhookDelivery.objects.filter(id__in=claimed).update(
+            next_attempt_at=now + timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS),
+        )
+        return list(batches.items())
+
+
+def record_result(deliveries, response_status=None, error=''):
+    now = timezone.now()
+    if not error:
+        WebhookDelivery.objects.filter(id__in=[delivery.id for delivery in deliveries]).update(
+            status='delivered', delivered_at=now, response_status=response_status, last_error='',
+        )
+        return
+
+    by_attempts = defaultdict(list)
+    for delivery in deliveries:
+        by_attempts[delivery.attempts + 1].append(delivery.id)
+    for attempts, ids in by_attempts.items():
+        WebhookDelivery.objects.filter(id__in=ids).update(
+            status='dead' if attempts >= settings.WEBHOOK_MAX_ATTEMPTS else 'pending',
+            attempts=attempts,
+            response_status=response_status,
+            last_error=error,
+            next_attempt_at=now + timedelta(seconds=retry_delay(attempts)),
+        )
+
+
+def build_body(deliveries):
+    return json.dumps({
+        'events': [
+            {'id': delivery.event_id, 'created_at': delivery.event.created_at.isoformat(), **delivery.event.payload}
+            for delivery in deliveries
+        ],
+    }, separators=(',', ':')).encode()
+
+
+class WebhookWorker:
+    """Asyncio delivery loop sharing one pooled HTTP client across all endpoints."""
+
+    def __init__(self, concurrency=None):
+        self.concurrency = concurrency or settings.WEBHOOK_CONCURRENCY
+        self.stopped = asyncio.Event()
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=settings.WEBHOOK_MAX_CONNECTIONS, max_keepalive_connections=settings.WEBHOOK_MAX_CONNECTIONS)
+        async with httpx.AsyncClient(limits=limits, timeout=settings.WEBHOOK_TIMEOUT_SECONDS) as client:
+            while not self.stopped.is_set():
+                if not await self.run_once(client):
+                    try:
+                        await asyncio.wait_for(self.stopped.wait(), settings.WEBHOOK_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+
+    def stop(self):
+        self.stopped.set()
+
+    async def run_once(self, client):
+        fanned_out = await sync_to_async(fan_out)()
+        batches = await sync_to_async(claim_batches)(self.concurrency * settings.WEBHOOK_BATCH_SIZE)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(subscription, deliveries):
+            async with semaphore:
+                await self.deliver(client, subscription, deliveries)
+
+        await asyncio.gather(*(send(subscription, deliveries) for subscription, deliveries in batches))
+        return bool(fanned_out or batches)
+
+    async def deliver(self, client, subscription, deliveries):
+        body = build_body(deliveries)
+        timestamp = str(int(time.time()))
+        headers = {
+            'Content-Type': 'application/json',
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: sign(subscription.secret, timestamp, body),
+        }
+        response_status, error = None, ''
+        try:
+            response = await client.post(subscription.url, content=body, headers=headers)
+            response_status = response.status_code
+            if response.status_code >= 300:
+                error = f'HTTP {response.status_code}'
+        except httpx.HTTPError as exc:
+            error = str(exc) or exc.__class__.__name__
+        if error:
+            logger.warning('Webhook delivery to %s failed: %s', subscription.url, error)
+        await sync_to_async(record_result)(deliveries, response_status, error)
+
+
+def requeue_dead(queryset):
+    return queryset.filter(status='dead').update(status='pending', attempts=0, next_attempt_at=timezone.now(), last_error='')
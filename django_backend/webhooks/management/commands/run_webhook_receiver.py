@@ -0,0 +1,33 @@
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+from webhooks.delivery import SIGNATURE_HEADER, TIMESTAMP_HEADER, verify
+
+class Command(BaseCommand):
+    help = 'Run a local HTTP receiver that verifies and prints webhook deliveries (for testing)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8099)
+        parser.add_argument('--secret', required=True)
+        parser.add_argument('--fail', action='store_true', help='Answer every delivery with HTTP 500 to exercise retries')
+    
+    def handle(self, *args, **options):
+        command = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                valid = verify(options['secret'], self.headers.get(TIMESTAMP_HEADER, ''), body, self.headers.get(SIGNATURE_HEADER, ''))
+                events = json.loads(body).get('events', []) if valid else []
+                command.stdout.write(f"{'valid' if valid else 'INVALID'} signature, {len(events)} events")
+                for event in events:
+                    command.stdout.write(f"  #{event['id']} {event['event']}")
+                self.send_response(500 if options['fail'] else 200 if valid else 401)
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        self.stdout.write(f"Listening for webhooks on port {options['port']}")
+        ThreadingHTTPServer(('', options['port']), Handler).serve_forever()
@@ -0,0 +1,24 @@
+
+import asyncio
+import signal
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from webhooks.delivery import WebhookWorker
+
+class Command(BaseCommand):
+    help = 'Deliver queued webhook events to subscribed endpoints'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.WEBHOOK_CONCURRENCY)
+    
+    def handle(self, *args, **options):
+        worker = WebhookWorker(concurrency=options['concurrency'])
+        
+        async def main():
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, worker.stop)
+            await worker.run()
+        
+        self.stdout.write(f"Webhook worker started with concurrency {worker.concurrency}")
+        asyncio.run(main())
@@ -0,0 +1,71 @@
+
+from fnmatch import fnmatchcase
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+User = get_user_model()
+
+class WebhookSubscription(models.Model):
+    name = models.CharField(max_length=255)
+    url = models.URLField(max_length=500)
+    secret = models.CharField(max_length=255)
+    event_types = models.JSONField(default=list, blank=True, help_text='Event type patterns such as "alert.*"; empty matches every event.')
+    filters = models.JSONField(default=dict, blank=True, help_text='Payload field to allowed values, e.g. {"severity": ["critical"]}.')
+    batch_size = models.PositiveIntegerField(default=50)
+    is_active = models.BooleanField(default=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='webhook_subscriptions')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.name
+    
+    def matches(self, event):
+        if self.event_types and not any(fnmatchcase(event.event_type, pattern) for pattern in self.event_types):
+            return False
+        data = event.payload.get('data', {})
+        return all(data.get(field) in allowed for field, allowed in self.filters.items())
+
+class WebhookEvent(models.Model):
+    """Outbox row written in the same transaction as the change it describes."""
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['dispatched_at', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} #{self.pk}"
+
+class WebhookDelivery(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('delivered', 'Delivered'),
+        ('dead', 'Dead'),
+    ]
+    
+    subscription = models.ForeignKey(WebhookSubscription, on_delete=models.CASCADE, related_name='deliveries')
+    event = models.ForeignKey(WebhookEvent, on_delete=models.CASCADE, related_name='deliveries')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    response_status = models.IntegerField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['subscription', 'event']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
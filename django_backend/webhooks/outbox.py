@@ -0,0 +1,18 @@
+
+from .models import WebhookEvent
+
+def record_event(event_type, data, previous_status=None):
+    return WebhookEvent.objects.create(event_type=event_type, payload=build_payload(event_type, data, previous_status))
+
+def record_events(event_type, items):
+    """Bulk variant of ``record_event`` for set-based updates; ``items`` yields (data, previous_status)."""
+    return WebhookEvent.objects.bulk_create([
+        WebhookEvent(event_type=event_type, payload=build_payload(event_type, data, previous_status))
+        for data, previous_status in items
+    ])
+
+def build_payload(event_type, data, previous_status=None):
+    payload = {'event': event_type, 'data': data}
+    if previous_status is not None:
+        payload['previous_status'] = previous_status
+    return payload
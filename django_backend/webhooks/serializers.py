@@ -0,0 +1,34 @@
+
+from rest_framework import serializers
+from .models import WebhookSubscription, WebhookEvent, WebhookDelivery
+
+class WebhookSubscriptionSerializer(serializers.ModelSerializer):
+    secret = serializers.CharField(write_only=True, max_length=255)
+    
+    class Meta:
+        model = WebhookSubscription
+        fields = '__all__'
+        read_only_fields = ['created_by']
+    
+    def validate_event_types(self, value):
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise serializers.ValidationError('event_types must be a list of strings')
+        return value
+    
+    def validate_filters(self, value):
+        if not isinstance(value, dict) or not all(isinstance(item, list) for item in value.values()):
+            raise serializers.ValidationError('filters must map field names to lists of allowed values')
+        return value
+
+class WebhookEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WebhookEvent
+        fields = '__all__'
+
+class WebhookDeliverySerializer(serializers.ModelSerializer):
+    event_type = serializers.CharField(source='event.event_type', read_only=True)
+    subscription_name = serializers.CharField(source='subscription.name', read_only=True)
+    
+    class Meta:
+        model = WebhookDelivery
+        fields = '__all__'
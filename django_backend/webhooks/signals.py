@@ -0,0 +1,38 @@
+
+from django.db.models import DEFERRED
+from django.db.models.signals import post_init, post_save
+from merge_requests.models import MergeRequest
+from merge_requests.serializers import MergeRequestSerializer
+from network_alerts.models import NetworkAlert
+from network_alerts.serializers import NetworkAlertSerializer
+from network_intents.models import NetworkIntent
+from network_intents.serializers import NetworkIntentSerializer
+from .outbox import record_event
+
+TRACKED_MODELS = {
+    NetworkAlert: ('alert', NetworkAlertSerializer),
+    NetworkIntent: ('intent', NetworkIntentSerializer),
+    MergeRequest: ('merge_request', MergeRequestSerializer),
+}
+
+def remember_status(sender, instance, **kwargs):
+    # Reading a deferred status here would cost a query per row on ?fields= list pages.
+    instance._webhook_status = instance.__dict__.get('status', DEFERRED)
+
+def record_status_change(sender, instance, created, **kwargs):
+    prefix, serializer_class = TRACKED_MODELS[sender]
+    previous_status = None if created else instance._webhook_status
+    if created:
+        record_event(f'{prefix}.created', serializer_class(instance).data)
+    elif previous_status is DEFERRED:
+        # Saving an instance loaded without its status only writes the status if it was assigned.
+        if 'status' in instance.__dict__:
+            record_event(f'{prefix}.status_changed', serializer_class(instance).data)
+    elif instance.status != previous_status:
+        record_event(f'{prefix}.status_changed', serializer_class(instance).data, previous_status)
+    instance._webhook_status = instance.__dict__.get('status', DEFERRED)
+
+def connect():
+    for model in TRACKED_MODELS:
+        post_init.connect(remember_status, sender=model, dispatch_uid=f'webhooks_init_{model.__name__}')
+        post_save.connect(record_status_change, sender=model, dispatch_uid=f'webhooks_save_{model.__name__}')
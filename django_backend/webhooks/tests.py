@@ -0,0 +1,155 @@
+
+import asyncio
+from unittest import mock
+import httpx
+import orjson
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from network_alerts.models import NetworkAlert
+from .delivery import SIGNATURE_HEADER, TIMESTAMP_HEADER, WebhookWorker, claim_batches, fan_out, record_result, sign, verify
+from .models import WebhookSubscription, WebhookEvent, WebhookDelivery
+from .outbox import record_event
+
+# Query counts are taken on the primary connection, so reads must not be routed to a replica.
+@override_settings(DATABASE_ROUTERS=[])
+class StatusTrackingTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='ops', email='ops@example.com', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        for index in range(15):
+            NetworkAlert.objects.create(alert_type='cpu', severity='high', title=f'CPU high {index}')
+    
+    def test_sparse_list_runs_no_more_queries_than_full_list(self):
+        with CaptureQueriesContext(connection) as full:
+            self.client.get('/api/alerts/')
+        with self.assertNumQueries(len(full)):
+            response = self.client.get('/api/alerts/', {'fields': 'id,title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'title'})
+        self.assertLess(len(full), 15)
+    
+    def test_saving_deferred_instance_keeps_status_events_accurate(self):
+        alert = NetworkAlert.objects.defer('status').first()
+        alert.title = 'renamed'
+        alert.save()
+        self.assertFalse(WebhookEvent.objects.filter(event_type='alert.status_changed').exists())
+        
+        alert = NetworkAlert.objects.defer('status').first()
+        alert.status = 'resolved'
+        alert.save()
+        self.assertTrue(WebhookEvent.objects.filter(event_type='alert.status_changed').exists())
+    
+    def test_status_update_and_outbox_row_commit_together(self):
+        alert = NetworkAlert.objects.first()
+        with mock.patch('webhooks.signals.record_event', side_effect=RuntimeError('outbox unavailable')):
+            with self.assertRaises(RuntimeError):
+                self.client.patch(f'/api/alerts/{alert.pk}/', {'status': 'resolved'}, format='json')
+        alert.refresh_from_db()
+        self.assertEqual(alert.status, 'active')
+        
+        self.client.patch(f'/api/alerts/{alert.pk}/', {'status': 'resolved'}, format='json')
+        self.assertTrue(WebhookEvent.objects.filter(event_type='alert.status_changed').exists())
+
+class SignatureTests(SimpleTestCase):
+    def test_verify_accepts_own_signature(self):
+        signature = sign('secret', '1700000000', b'{"events":[]}')
+        self.assertTrue(signature.startswith('sha256='))
+        self.assertTrue(verify('secret', '1700000000', b'{"events":[]}', signature))
+    
+    def test_verify_rejects_tampering(self):
+        signature = sign('secret', '1700000000', b'{"events":[]}')
+        self.assertFalse(verify('other', '1700000000', b'{"events":[]}', signature))
+        self.assertFalse(verify('secret', '1700000001', b'{"events":[]}', signature))
+        self.assertFalse(verify('secret', '1700000000', b'{"events":[1]}', signature))
+
+@override_settings(WEBHOOK_MAX_ATTEMPTS=3, WEBHOOK_RETRY_BASE_SECONDS=10, WEBHOOK_RETRY_MAX_SECONDS=3600)
+class DeliveryTests(TransactionTestCase):
+    def subscribe(self, name, **kwargs):
+        return WebhookSubscription.objects.create(name=name, url=f'http://receiver.test/{name}', secret=f'{name}-secret', **kwargs)
+    
+    def deliveries(self, subscription):
+        return WebhookDelivery.objects.filter(subscription=subscription)
+    
+    def test_fan_out_matches_event_types_and_filters(self):
+        everything = self.subscribe('everything')
+        critical = self.subscribe('critical', event_types=['alert.*'], filters={'severity': ['critical']})
+        intents = self.subscribe('intents', event_types=['intent.created'])
+        inactive = self.subscribe('inactive', is_active=False)
+        critical_alert = record_event('alert.created', {'severity': 'critical'})
+        low_alert = record_event('alert.created', {'severity': 'low'})
+        intent = record_event('intent.status_changed', {'status': 'approved'}, 'draft')
+        
+        self.assertEqual(fan_out(), 3)
+        self.assertEqual(fan_out(), 0)
+        self.assertEqual(set(self.deliveries(everything).values_list('event', flat=True)), {critical_alert.pk, low_alert.pk, intent.pk})
+        self.assertEqual(list(self.deliveries(critical).values_list('event', flat=True)), [critical_alert.pk])
+        self.assertFalse(self.deliveries(intents).exists())
+        self.assertFalse(self.deliveries(inactive).exists())
+        self.assertFalse(WebhookEvent.objects.filter(dispatched_at=None).exists())
+    
+    def test_claim_batches_per_subscription_and_leases_them(self):
+        small = self.subscribe('small', batch_size=2)
+        large = self.subscribe('large')
+        for index in range(5):
+            record_event('alert.created', {'index': index})
+        fan_out()
+        
+        batches = dict(claim_batches(100))
+        self.assertEqual(len(batches[small]), 2)
+        self.assertEqual(len(batches[large]), 5)
+        leased = self.deliveries(small).filter(next_attempt_at__gt=timezone.now()).count()
+        self.assertEqual(leased, 2)
+        
+        self.assertEqual([len(batch) for _, batch in claim_batches(100)], [2])
+    
+    def test_record_result_backs_off_then_dead_letters(self):
+        subscription = self.subscribe('flaky')
+        record_event('alert.created', {})
+        fan_out()
+        
+        for attempts, delay in ((1, 10), (2, 20)):
+            delivery = self.deliveries(subscription).get()
+            started = timezone.now()
+            record_result([delivery], 503, 'HTTP 503')
+            delivery.refresh_from_db()
+            self.assertEqual((delivery.status, delivery.attempts, delivery.last_error), ('pending', attempts, 'HTTP 503'))
+            self.assertAlmostEqual((delivery.next_attempt_at - started).total_seconds(), delay, delta=2)
+        
+        record_result([delivery], None, 'connection refused')
+        delivery.refresh_from_db()
+        self.assertEqual((delivery.status, delivery.attempts), ('dead', 3))
+    
+    def test_record_result_marks_success(self):
+        subscription = self.subscribe('ok')
+        record_event('alert.created', {})
+        fan_out()
+        record_result(list(self.deliveries(subscription)), 200)
+        self.assertEqual(list(self.deliveries(subscription).values_list('status', 'response_status')), [('delivered', 200)])
+    
+    def test_run_once_posts_signed_batches_to_receiver(self):
+        good = self.subscribe('good')
+        broken = self.subscribe('broken')
+        record_event('alert.created', {'title': 'CPU high'})
+        record_event('alert.status_changed', {'title': 'CPU high', 'status': 'resolved'}, 'active')
+        received = {}
+        
+        def receiver(request):
+            name = request.url.path.strip('/')
+            timestamp = request.headers[TIMESTAMP_HEADER]
+            self.assertTrue(verify(f'{name}-secret', timestamp, request.content, request.headers[SIGNATURE_HEADER]))
+            received[name] = [event['event'] for event in orjson.loads(request.content)['events']]
+            return httpx.Response(500 if name == 'broken' else 204)
+        
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(receiver)) as client:
+                return await WebhookWorker(concurrency=2).run_once(client)
+        
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(sorted(received['good']), ['alert.created', 'alert.status_changed'])
+        self.assertEqual(set(self.deliveries(good).values_list('status', flat=True)), {'delivered'})
+        self.assertEqual(set(self.deliveries(broken).values_list('status', 'attempts', 'last_error')), {('pending', 1, 'HTTP 500')})
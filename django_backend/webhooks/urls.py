@@ -0,0 +1,10 @@
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.WebhookSubscriptionListCreateView.as_view(), name='webhook-list'),
+    path('<int:pk>/', views.WebhookSubscriptionDetailView.as_view(), name='webhook-detail'),
+    path('<int:pk>/retry-dead/', views.retry_dead_deliveries, name='webhook-retry-dead'),
+    path('deliveries/', views.WebhookDeliveryListView.as_view(), name='webhook-delivery-list'),
+]
@@ -0,0 +1,37 @@
+
+from rest_framework import generics
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters
+from network_automation.fieldsets import SparseFieldsetMixin
+from .delivery import requeue_dead
+from .models import WebhookSubscription, WebhookDelivery
+from .serializers import WebhookSubscriptionSerializer, WebhookDeliverySerializer
+
+class WebhookSubscriptionListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = WebhookSubscription.objects.all()
+    serializer_class = WebhookSubscriptionSerializer
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filterset_fields = ['is_active']
+    search_fields = ['name', 'url']
+    
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+class WebhookSubscriptionDetailView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = WebhookSubscription.objects.all()
+    serializer_class = WebhookSubscriptionSerializer
+
+class WebhookDeliveryListView(SparseFieldsetMixin, generics.ListAPIView):
+    queryset = WebhookDelivery.objects.select_related('event', 'subscription')
+    serializer_class = WebhookDeliverySerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['subscription', 'status']
+    ordering_fields = ['created_at', 'next_attempt_at']
+    ordering = ['-created_at']
+
+@api_view(['POST'])
+def retry_dead_deliveries(request, pk):
+    requeued = requeue_dead(WebhookDelivery.objects.filter(subscription_id=pk))
+    return Response({'requeued': requeued})